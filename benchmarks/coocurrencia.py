@@ -0,0 +1,70 @@
+"""
+coocurrencia.py
+Compara los cruces de 04 hechos con bucles y Counter (versión anterior) contra
+las matrices dispersas de comun/coocurrencia.py, sobre listas de entidades
+sintéticas. Verifica que región × tema salga idéntico.
+
+Uso (desde la raíz del repo):
+    python benchmarks/coocurrencia.py [n_articulos]
+"""
+
+import sys
+import time
+import numpy as np
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from comun.coocurrencia import indicadora, coocurrencia
+from comun.diccionarios import regiones_peru, cultivos, temas
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+
+def listas_sinteticas(n, etiquetas, rng, maximo):
+    etiquetas = np.array(list(etiquetas), dtype=object)
+    return [list(rng.choice(etiquetas, rng.integers(0, maximo + 1), replace=False)) for _ in range(n)]
+
+
+def cruce_counter(regiones, temas_art):
+    conteo = Counter()
+    for regs, ts in zip(regiones, temas_art):
+        for tema in ts:
+            conteo.update((reg, tema) for reg in regs)
+    return conteo
+
+
+def main():
+    rng = np.random.default_rng(7)
+    regiones = listas_sinteticas(N, regiones_peru, rng, 3)
+    temas_art = listas_sinteticas(N, temas, rng, 2)
+    cultivos_art = listas_sinteticas(N, cultivos, rng, 3)
+    print(f"Artículos sintéticos: {N:,}")
+
+    t0 = time.perf_counter()
+    esperado = cruce_counter(regiones, temas_art)
+    t_counter = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    dims = {'region': indicadora(regiones), 'tema': indicadora(temas_art), 'cultivo': indicadora(cultivos_art)}
+    t_matrices = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    tabla = coocurrencia({'region': dims['region'], 'tema': dims['tema']})
+    t_par = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    trio = coocurrencia(dims)
+    t_trio = time.perf_counter() - t0
+
+    obtenido = Counter({(r, t): n for r, t, n in tabla.itertuples(index=False)})
+    print(f"  Counter región × tema:            {t_counter:7.2f}s")
+    print(f"  matrices indicadoras (una vez):   {t_matrices:7.2f}s")
+    print(f"  disperso región × tema:           {t_par:7.3f}s")
+    print(f"  disperso región × tema × cultivo: {t_trio:7.3f}s  ({len(trio):,} combinaciones)")
+    print(f"  Salida idéntica: {obtenido == esperado}")
+
+
+if __name__ == "__main__":
+    main()
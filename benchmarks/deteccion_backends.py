@@ -0,0 +1,63 @@
+"""
+deteccion_backends.py
+Compara los backends de detección de 02 (pandas vs arrow) sobre títulos
+sintéticos: tiempo y salida idéntica (conteos y bitsets).
+
+Uso (desde la raíz del repo):
+    python benchmarks/deteccion_backends.py [n_titulos]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from sintetico import titulos_sinteticos
+from comun.deteccion import detectar, BACKENDS
+from comun.diccionarios import temas, regiones
+from comun.normalizar import normalizar_serie, plegar_temas, plegar_patron, quitar_tildes_serie
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+REPETICIONES = 3
+
+
+def main():
+    rng = np.random.default_rng(7)
+    originales = pd.Series(titulos_sinteticos(N, rng))
+    titulos = normalizar_serie(originales)
+    # Como en 02: regiones sin tildes pero con mayúsculas, sobre el título original
+    titulos_regiones = quitar_tildes_serie(originales)
+    temas_plegados = plegar_temas(temas)
+    regiones_plegadas = {r: plegar_patron(p, minusculas=False) for r, p in regiones.items()}
+
+    print(f"Títulos sintéticos: {N:,} | temas: {len(temas)} | regiones: {len(regiones)}")
+    resultados = {}
+    for backend in BACKENDS:
+        tiempos = []
+        for _ in range(REPETICIONES):
+            t0 = time.perf_counter()
+            resultados[backend] = detectar(titulos, temas_plegados, regiones_plegadas, backend=backend,
+                                           titulos_regiones=titulos_regiones)
+            tiempos.append(time.perf_counter() - t0)
+        print(f"  {backend:8s} {min(tiempos):7.2f}s (mejor de {REPETICIONES})")
+
+    (c_pd, t_pd, r_pd), (c_ar, t_ar, r_ar) = resultados["pandas"], resultados["arrow"]
+    iguales = (
+        all(np.array_equal(c_pd[t], c_ar[t]) for t in c_pd)
+        and np.array_equal(t_pd, t_ar)
+        and np.array_equal(r_pd, r_ar)
+    )
+    print(f"  salida idéntica: {'sí' if iguales else 'NO'}")
+    if not iguales:
+        for t in c_pd:
+            n = int((c_pd[t] != c_ar[t]).sum())
+            if n:
+                print(f"    {t:30s} {n:,} títulos con conteo distinto")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+memoria_corpus.py
+Benchmark de memoria del corpus en pandas: representación original
+(strings object + title_lower + 12 tema_* / 24 reg_* bool + n_* int64)
+frente a la compacta (categóricas + bitsets + n_* uint8).
+Reporta MB por millón de artículos.
+
+Uso (desde la raíz del repo):
+    python benchmarks/memoria_corpus.py [n_articulos]
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from sintetico import corpus_sintetico
+from comun.compacto import compactar, empaquetar
+from comun.diccionarios import temas, regiones
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+def mb_por_millon(df):
+    return df.memory_usage(deep=True).sum() / len(df) * 1e6 / 2**20
+
+
+def main():
+    rng = np.random.default_rng(42)
+    base = corpus_sintetico(N, rng)
+    flags_tema = rng.random((len(temas), N)) < 0.05
+    flags_reg = rng.random((len(regiones), N)) < 0.03
+    conteos = rng.integers(0, 3, (len(temas), N))
+
+    # Representación original (como 02 antes de compactar)
+    original = base.copy()
+    original["title_lower"] = original["title"].str.lower()
+    for i, t in enumerate(temas):
+        original[f"tema_{t}"] = flags_tema[i]
+        original[f"n_{t}"] = conteos[i].astype("int64")
+    for i, r in enumerate(regiones):
+        original[f"reg_{r}"] = flags_reg[i]
+
+    # Representación compacta
+    compacto = compactar(base.copy())
+    for i, t in enumerate(temas):
+        compacto[f"n_{t}"] = conteos[i].astype("uint8")
+    compacto["temas_bits"] = empaquetar(flags_tema, len(temas))
+    compacto["regiones_bits"] = empaquetar(flags_reg, len(regiones))
+
+    print(f"Artículos sintéticos: {N:,}")
+    print(f"  original : {mb_por_millon(original):8.1f} MB / millón de artículos")
+    print(f"  compacto : {mb_por_millon(compacto):8.1f} MB / millón de artículos")
+    print(f"  ahorro   : {1 - mb_por_millon(compacto) / mb_por_millon(original):8.1%}")
+
+
+if __name__ == "__main__":
+    main()
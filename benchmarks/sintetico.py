@@ -0,0 +1,131 @@
+"""
+sintetico.py
+Generador de corpus sintético con la forma de la cosecha GDELT, para
+benchmarks sin depender de data/ ni de la API: títulos, cuerpos de
+noticias en español (con lugares, cultivos y cifras de afectación a una
+densidad controlada) y páginas HTML con distintas plantillas de medio.
+"""
+
+import numpy as np
+import pandas as pd
+
+DOMINIOS = [f"medio{i}.pe" for i in range(800)]
+IDIOMAS = ["Spanish", "English", "Portuguese", "French"]
+PAISES = ["Peru", "United States", "Spain", "Chile", "Argentina"]
+QUERIES = [f"query {i} peru" for i in range(36)]
+TRIMESTRES = [f"{y}Q{q}" for y in range(2017, 2027) for q in range(1, 5)]
+
+# Vocabulario: términos que disparan temas/regiones + relleno neutro
+TERMINOS = ["heladas", "friaje", "inundación", "huaico", "desborde", "lluvias intensas",
+            "sequía", "granizada", "El Niño costero", "cambio climático", "pérdida de cosecha",
+            "SENAMHI", "INDECI", "damnificados", "estado de emergencia", "Puno", "Cusco",
+            "Áncash", "Junín", "Piura", "Lima", "Ica", "alpacas muertas"]
+RELLENO = ["el", "la", "de", "en", "gobierno", "anuncia", "región", "según", "por",
+           "mercado", "precio", "vecinos", "obras", "alcalde", "distrito", "reporta"]
+
+
+def titulos_sinteticos(n, rng, palabras=10, densidad=0.15):
+    """Títulos de `palabras` tokens; cada token es un término con prob. `densidad`."""
+    terminos = np.array(TERMINOS)
+    relleno = np.array(RELLENO)
+    es_termino = rng.random((n, palabras)) < densidad
+    elegidos = np.where(es_termino,
+                        rng.choice(terminos, (n, palabras)),
+                        rng.choice(relleno, (n, palabras)))
+    # Solo la inicial: capitalize() bajaría "Puno" a "puno" y las regiones
+    # de 02 distinguen mayúsculas
+    return [(t := " ".join(fila))[:1].upper() + t[1:] for fila in elegidos]
+
+
+def corpus_sintetico(n, rng, densidad=0.15):
+    """Corpus con la misma forma que la cosecha GDELT (strings object)."""
+    return pd.DataFrame({
+        "url": [f"https://medio.pe/noticia/{i:08d}" for i in range(n)],
+        "title": pd.Series(titulos_sinteticos(n, rng, densidad=densidad), dtype=object),
+        "domain": pd.Series(rng.choice(DOMINIOS, n), dtype=object),
+        "language": pd.Series(rng.choice(IDIOMAS, n), dtype=object),
+        "sourcecountry": pd.Series(rng.choice(PAISES, n), dtype=object),
+        "_query": pd.Series(rng.choice(QUERIES, n), dtype=object),
+        "_trimestre": pd.Series(rng.choice(TRIMESTRES, n), dtype=object),
+        "fecha": pd.to_datetime("2017-01-01") + pd.to_timedelta(rng.integers(0, 3300, n), unit="D"),
+    })
+
+
+# ── Cuerpos ───────────────────────────────────────────────────
+LUGARES = ["Puno", "Azángaro", "Juliaca", "Cusco", "Espinar", "Piura", "Sullana",
+           "Áncash", "Huaraz", "Junín", "Huancayo", "Arequipa", "Caylloma", "Ica"]
+CULTIVOS = ["papa", "maíz", "quinua", "arroz", "café", "cacao", "mango", "palta", "alpacas"]
+FRASES = [
+    "las heladas afectaron {n} hectáreas de {cultivo} en {lugar}",
+    "el huaico dejó {n} fallecidos en {lugar}",
+    "se reportan {n} mil damnificados por las lluvias intensas en {lugar}",
+    "{n} viviendas afectadas y {m} familias damnificadas en {lugar}",
+    "el SENAMHI alertó sobre friaje en {lugar} y pérdida de cosecha de {cultivo}",
+    "el INDECI declaró estado de emergencia en {lugar} por el desborde del río",
+]
+
+
+def cuerpos_sinteticos(n, rng, parrafos=6, palabras=60, densidad=0.3):
+    """Cuerpos de `parrafos` párrafos de ~`palabras` palabras de relleno.
+
+    Cada párrafo incluye una frase con entidades y cifras con prob. `densidad`.
+    """
+    relleno = np.array(RELLENO)
+    cuerpos = []
+    for _ in range(n):
+        bloques = []
+        for _ in range(parrafos):
+            texto = " ".join(rng.choice(relleno, palabras))
+            if rng.random() < densidad:
+                frase = rng.choice(FRASES).format(
+                    n=int(rng.integers(2, 2_000)), m=int(rng.integers(2, 300)),
+                    lugar=rng.choice(LUGARES), cultivo=rng.choice(CULTIVOS))
+                corte = int(rng.integers(0, len(texto)))
+                corte = texto.rfind(" ", 0, corte) + 1
+                texto = f"{texto[:corte]}{frase}. {texto[corte:]}"
+            bloques.append(texto.capitalize() + ".")
+        cuerpos.append("\n".join(bloques))
+    return cuerpos
+
+
+# ── Páginas HTML ──────────────────────────────────────────────
+# Plantillas con las estructuras que 03 (comun/cuerpos.py) sabe recorrer:
+# <article>, un div con clase conocida, y una página sin contenedor (fallback)
+PLANTILLAS = {
+    "article": "<article><h1>{titulo}</h1>{parrafos}</article>",
+    "story_contents": '<div class="story-contents__content"><h1>{titulo}</h1>{parrafos}</div>',
+    "sin_contenedor": '<div class="wrap"><h1>{titulo}</h1><div class="col">{parrafos}</div></div>',
+}
+RUIDO = (
+    '<script>window.dataLayer=window.dataLayer||[];{js}</script>'
+    '<style>.nav{{display:flex}} .ad{{height:250px}}</style>'
+    '<nav><ul>{menu}</ul></nav>'
+    '<aside class="ad">Publicidad</aside>'
+)
+
+
+def html_noticia(titulo, cuerpo, plantilla, rng):
+    """Página completa (cabecera, menú, scripts, publicidad, pie) con el cuerpo dado."""
+    parrafos = "".join(f"<p>{p}</p><p class='relacionadas'>Lee también</p>" for p in cuerpo.split("\n"))
+    menu = "".join(f"<li><a href='/seccion/{i}'>Sección {i}</a></li>" for i in range(40))
+    js = "var x=" + ",".join(str(v) for v in rng.integers(0, 1000, 300)) + ";"
+    return (
+        f"<html><head><title>{titulo}</title></head><body>"
+        + RUIDO.format(js=js, menu=menu)
+        + PLANTILLAS[plantilla].format(titulo=titulo, parrafos=parrafos)
+        + "<footer>© Medio 2024 — Todos los derechos reservados</footer></body></html>"
+    )
+
+
+def guardar_fixtures(directorio, rng, por_plantilla=3):
+    """Escribe páginas HTML de prueba (una tanda por plantilla) en `directorio`."""
+    directorio.mkdir(parents=True, exist_ok=True)
+    titulos = titulos_sinteticos(len(PLANTILLAS) * por_plantilla, rng)
+    cuerpos = cuerpos_sinteticos(len(titulos), rng)
+    rutas = []
+    for k, (titulo, cuerpo) in enumerate(zip(titulos, cuerpos)):
+        plantilla = list(PLANTILLAS)[k % len(PLANTILLAS)]
+        ruta = directorio / f"{plantilla}_{k // len(PLANTILLAS)}.html"
+        ruta.write_text(html_noticia(titulo, cuerpo, plantilla, rng), encoding="utf-8")
+        rutas.append(ruta)
+    return rutas
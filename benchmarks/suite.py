@@ -0,0 +1,193 @@
+"""
+suite.py
+Suite de benchmarks por etapa sobre un corpus sintético (ver sintetico.py):
+- deteccion_titulos     detección de temas/regiones en títulos (02)
+- extraccion_html       extracción del cuerpo desde HTML guardado (03)
+- normalizacion         normalización con mapa de offsets (03a)
+- clasificacion_cuerpos conteo de temas en cuerpos (03b)
+- gazetteer             lugares con el trie de tokens (04)
+- cifras                cifras de afectación como spans (04)
+
+Cada corrida se guarda como JSON en benchmarks/resultados/ y se compara con
+la anterior: las etapas que se vuelven más lentas que TOLERANCIA se marcan
+como regresión (y el proceso termina con código 1).
+
+Uso (desde la raíz del repo):
+    python benchmarks/suite.py [--titulos N] [--cuerpos N] [--etapas a,b]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "scripts"))
+
+from sintetico import titulos_sinteticos, cuerpos_sinteticos, guardar_fixtures
+from comun.cifras import compilar_cifras, extraer_cifras
+from comun.cuerpos import extraer_cuerpo
+from comun.deteccion import detectar
+from comun.detector import compilar_temas, contar_temas
+from comun.diccionarios import temas, regiones, regiones_peru, cifras_patrones, cifras_unidades
+from comun.gazetteer import construir_gazetteer, buscar
+from comun.normalizar import normalizar, normalizar_serie, plegar_temas, plegar_patron, quitar_tildes_serie
+
+FIXTURES_DIR = RAIZ / "benchmarks" / "fixtures" / "html"
+RESULTADOS_DIR = RAIZ / "benchmarks" / "resultados"
+REPETICIONES = 5
+TOLERANCIA = 1.25   # más lento que 1.25× la corrida anterior = regresión
+SEMILLA = 7
+
+
+def medir(funcion, repeticiones=REPETICIONES):
+    """Mejor tiempo (segundos) de `funcion()` en varias repeticiones: el mínimo
+    es el estimador menos sensible a la carga de la máquina."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t0)
+    return min(tiempos)
+
+
+# ── Etapas ────────────────────────────────────────────────────
+# Cada etapa recibe los datos sintéticos y devuelve (función a medir, n ítems)
+
+def etapa_deteccion_titulos(datos):
+    originales = pd.Series(datos['titulos'])
+    titulos = normalizar_serie(originales)
+    titulos_regiones = quitar_tildes_serie(originales)   # regiones como en 02
+    temas_plegados = plegar_temas(temas)
+    regiones_plegadas = {r: plegar_patron(p, minusculas=False) for r, p in regiones.items()}
+    return (lambda: detectar(titulos, temas_plegados, regiones_plegadas,
+                             titulos_regiones=titulos_regiones)), len(titulos)
+
+
+def etapa_extraccion_html(datos):
+    paginas = [p.read_text(encoding="utf-8") for p in datos['fixtures']] * datos['repetir_html']
+    return (lambda: [extraer_cuerpo(html, "medio.pe") for html in paginas]), len(paginas)
+
+
+def etapa_normalizacion(datos):
+    return (lambda: [normalizar(c) for c in datos['cuerpos']]), len(datos['cuerpos'])
+
+
+def etapa_clasificacion_cuerpos(datos):
+    patron = compilar_temas(plegar_temas(temas))
+    return (lambda: [contar_temas(patron, t) for t in datos['normalizados']]), len(datos['normalizados'])
+
+
+def etapa_gazetteer(datos):
+    trie = construir_gazetteer(regiones_peru)
+    return (lambda: [buscar(trie, t) for t in datos['normalizados']]), len(datos['normalizados'])
+
+
+def etapa_cifras(datos):
+    regexes, tipos = compilar_cifras(cifras_patrones)
+    return (lambda: [extraer_cifras(regexes, tipos, cifras_unidades, t) for t in datos['normalizados']]), \
+        len(datos['normalizados'])
+
+
+ETAPAS = {
+    "deteccion_titulos": etapa_deteccion_titulos,
+    "extraccion_html": etapa_extraccion_html,
+    "normalizacion": etapa_normalizacion,
+    "clasificacion_cuerpos": etapa_clasificacion_cuerpos,
+    "gazetteer": etapa_gazetteer,
+    "cifras": etapa_cifras,
+}
+
+
+def commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ultima_corrida(parametros):
+    """Resultados de la corrida anterior con los mismos parámetros, si hay."""
+    for ruta in sorted(RESULTADOS_DIR.glob("*.json"), reverse=True):
+        previa = json.loads(ruta.read_text(encoding="utf-8"))
+        if previa.get("parametros") == parametros:
+            return ruta, previa
+    return None, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks por etapa sobre corpus sintético")
+    parser.add_argument("--titulos", type=int, default=100_000)
+    parser.add_argument("--cuerpos", type=int, default=2_000)
+    parser.add_argument("--parrafos", type=int, default=6)
+    parser.add_argument("--densidad", type=float, default=0.3, help="prob. de frase con entidades por párrafo")
+    parser.add_argument("--repetir-html", type=int, default=20, help="veces que se recorre cada fixture HTML")
+    parser.add_argument("--etapas", default=",".join(ETAPAS))
+    args = parser.parse_args()
+    etapas = args.etapas.split(",")
+
+    parametros = {k: v for k, v in vars(args).items() if k != "etapas"}
+    rng = np.random.default_rng(SEMILLA)
+    if not any(FIXTURES_DIR.glob("*.html")):
+        guardar_fixtures(FIXTURES_DIR, np.random.default_rng(SEMILLA))
+    cuerpos = cuerpos_sinteticos(args.cuerpos, rng, parrafos=args.parrafos, densidad=args.densidad)
+    datos = {
+        'titulos': titulos_sinteticos(args.titulos, rng),
+        'cuerpos': cuerpos,
+        'normalizados': [normalizar(c)[0] for c in cuerpos],
+        'fixtures': sorted(FIXTURES_DIR.glob("*.html")),
+        'repetir_html': args.repetir_html,
+    }
+
+    ruta_previa, previa = ultima_corrida(parametros)
+    print("=" * 70)
+    print(f"  BENCHMARKS POR ETAPA — {args.titulos:,} títulos, {args.cuerpos:,} cuerpos")
+    if ruta_previa:
+        print(f"  Comparando con {ruta_previa.name} ({previa.get('commit')})")
+    print("=" * 70)
+
+    resultados = {}
+    regresiones = []
+    for nombre in etapas:
+        funcion, n = ETAPAS[nombre](datos)
+        segundos = medir(funcion)
+        resultados[nombre] = {"segundos": segundos, "items": n, "us_por_item": segundos / n * 1e6}
+
+        linea = f"  {nombre:24s} {segundos:8.3f}s  {segundos / n * 1e6:10.1f} µs/ítem"
+        anterior = (previa or {}).get("etapas", {}).get(nombre)
+        if anterior:
+            razon = segundos / anterior["segundos"]
+            linea += f"  ×{razon:.2f}"
+            if razon > TOLERANCIA:
+                linea += "  ← REGRESIÓN"
+                regresiones.append(nombre)
+        print(linea)
+
+    RESULTADOS_DIR.mkdir(parents=True, exist_ok=True)
+    ahora = datetime.now()
+    salida = {
+        "fecha": ahora.isoformat(timespec="seconds"),
+        "commit": commit_actual(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": parametros,
+        "etapas": resultados,
+    }
+    ruta = RESULTADOS_DIR / f"{ahora:%Y%m%d_%H%M%S}.json"
+    ruta.write_text(json.dumps(salida, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nGuardado: {ruta}")
+
+    if regresiones:
+        print(f"Regresiones (> ×{TOLERANCIA}): {', '.join(regresiones)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,28 @@
 """
 00_explorar_gdelt.py
 Exploración directa de GDELT API v2 para noticias climáticas en Perú.
-Usa requests directamente (más confiable que gdeltdoc).
+Usa requests directamente (más confiable que gdeltdoc), con la caché y las
+pausas compartidas de comun/gdelt.py. Los rangos se piden por trimestre
+(artículos) y por año (timelines), como la cosecha de 01: comparten caché.
 """
 
-import requests
-import time
 import pandas as pd
 from datetime import datetime, timedelta
 
-BASE_URL = "https://api.gdeltproject.org/api/v2/doc/doc"
+from comun import gdelt
 
 def buscar_gdelt(query, start_date, end_date, max_records=250):
     """Consulta GDELT Doc API directamente."""
-    params = {
-        "query": query,
-        "mode": "artlist",
-        "format": "json",
-        "maxrecords": max_records,
-        "startdatetime": start_date.strftime("%Y%m%d%H%M%S"),
-        "enddatetime": end_date.strftime("%Y%m%d%H%M%S"),
-    }
-    try:
-        r = requests.get(BASE_URL, params=params, timeout=30)
-        r.raise_for_status()
-        data = r.json()
-        articles = data.get("articles", [])
-        return pd.DataFrame(articles) if articles else pd.DataFrame()
-    except Exception as e:
-        print(f"  Error: {e}")
-        return pd.DataFrame()
+    articles = gdelt.articulos_alineados(query, start_date, end_date, max_records)
+    return pd.DataFrame(articles) if articles else pd.DataFrame()
 
 def buscar_timeline(query, start_date, end_date):
     """Consulta GDELT timeline."""
-    params = {
-        "query": query,
-        "mode": "timelinevol",
-        "format": "json",
-        "startdatetime": start_date.strftime("%Y%m%d%H%M%S"),
-        "enddatetime": end_date.strftime("%Y%m%d%H%M%S"),
-    }
-    try:
-        r = requests.get(BASE_URL, params=params, timeout=30)
-        r.raise_for_status()
-        data = r.json()
-        if "timeline" in data and len(data["timeline"]) > 0:
-            series = data["timeline"][0].get("data", [])
-            return pd.DataFrame(series)
-        return pd.DataFrame()
-    except Exception as e:
-        print(f"  Error: {e}")
-        return pd.DataFrame()
+    series = gdelt.timeline_alineado(query, start_date, end_date, "timelinevol")
+    return pd.DataFrame(series) if series else pd.DataFrame()
 
 # ── Fechas ─────────────────────────────────────────────────────
-end = datetime.today()
+end = gdelt.ahora()
 start_1m = end - timedelta(days=30)
 start_3m = end - timedelta(days=90)
 
@@ -78,14 +47,13 @@ terminos = {
 }
 
 resultados = []
+respuestas = gdelt.en_paralelo(buscar_gdelt, [(q, start_1m, end) for q in terminos.values()])
 
-for nombre, query in terminos.items():
-    df = buscar_gdelt(query, start_1m, end)
+for nombre, df in zip(terminos, respuestas):
     n = len(df)
     fuentes = df['domain'].nunique() if n > 0 else 0
     resultados.append({"termino": nombre, "n_articulos": n, "n_fuentes": fuentes})
     print(f"  {nombre:35s} -> {n:4d} articulos, {fuentes:3d} fuentes")
-    time.sleep(2)
 
 # ── PRUEBA 2: ver artículos de un término con resultados ──────
 print("\n" + "=" * 60)
@@ -118,8 +86,6 @@ if len(df_mejor) > 0:
     if 'language' in df_mejor.columns:
         print(df_mejor['language'].value_counts().to_string())
 
-time.sleep(3)
-
 # ── PRUEBA 3: timeline 3 meses ───────────────────────────────
 print("\n" + "=" * 60)
 print("PRUEBA 3: timeline 'lluvias peru' (3 meses)")
@@ -134,8 +100,6 @@ if len(tl) > 0:
 else:
     print("Sin datos de timeline.")
 
-time.sleep(3)
-
 # ── PRUEBA 4: profundidad histórica ──────────────────────────
 print("\n" + "=" * 60)
 print("PRUEBA 4: profundidad histórica")
@@ -150,10 +114,9 @@ periodos = [
     ("2017", datetime(2017, 6, 1), datetime(2017, 7, 31)),
 ]
 
-for año, s, e in periodos:
-    df = buscar_gdelt("helada peru", s, e, max_records=50)
+respuestas = gdelt.en_paralelo(buscar_gdelt, [("helada peru", s, e, 50) for _, s, e in periodos])
+for (año, _, _), df in zip(periodos, respuestas):
     print(f"  {año} (jun-jul): {len(df):4d} artículos")
-    time.sleep(2)
 
 # ── RESUMEN ───────────────────────────────────────────────────
 print("\n" + "=" * 60)
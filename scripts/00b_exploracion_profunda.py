@@ -3,71 +3,31 @@
 Exploración profunda de GDELT fuera de red CGIAR.
 Objetivo: mapear qué términos devuelven más resultados,
 qué fuentes cubren Perú, qué idiomas, y qué profundidad histórica hay.
+
+Las consultas pasan por la caché de comun/gdelt.py (compartida con la
+cosecha) y cada bloque las lanza en paralelo: lo que ya está en caché
+responde al instante y solo lo que falta espera su turno. Los rangos se
+piden por trimestre (artículos) y por año (timelines), con las mismas
+claves que 01; cada trimestre aporta hasta 250 artículos.
 """
 
-import requests
-import time
 import json
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
 
-BASE_URL = "https://api.gdeltproject.org/api/v2/doc/doc"
-PAUSE = 8  # segundos entre requests
+from comun import gdelt
+
 LOG_DIR = Path("data/logs")
 RAW_DIR = Path("data/raw")
 
 def gdelt_search(query, start, end, max_records=250):
     """Búsqueda de artículos en GDELT."""
-    params = {
-        "query": query,
-        "mode": "artlist",
-        "format": "json",
-        "maxrecords": max_records,
-        "startdatetime": start.strftime("%Y%m%d%H%M%S"),
-        "enddatetime": end.strftime("%Y%m%d%H%M%S"),
-    }
-    for attempt in range(3):
-        try:
-            r = requests.get(BASE_URL, params=params, timeout=30)
-            if r.status_code == 429:
-                wait = 30 * (attempt + 1)
-                print(f"    429 — esperando {wait}s...")
-                time.sleep(wait)
-                continue
-            r.raise_for_status()
-            data = r.json()
-            return data.get("articles", [])
-        except Exception as e:
-            if attempt < 2:
-                time.sleep(15)
-            else:
-                print(f"    Error: {str(e)[:80]}")
-    return []
+    return gdelt.articulos_alineados(query, start, end, max_records)
 
 def gdelt_timeline(query, start, end):
     """Timeline de volumen de cobertura."""
-    params = {
-        "query": query,
-        "mode": "timelinevol",
-        "format": "json",
-        "startdatetime": start.strftime("%Y%m%d%H%M%S"),
-        "enddatetime": end.strftime("%Y%m%d%H%M%S"),
-    }
-    for attempt in range(3):
-        try:
-            r = requests.get(BASE_URL, params=params, timeout=30)
-            if r.status_code == 429:
-                time.sleep(30 * (attempt + 1))
-                continue
-            r.raise_for_status()
-            data = r.json()
-            if "timeline" in data and data["timeline"]:
-                return data["timeline"][0].get("data", [])
-            return []
-        except:
-            time.sleep(15)
-    return []
+    return gdelt.timeline_alineado(query, start, end, "timelinevol") or []
 
 # ════════════════════════════════════════════════════════════════
 print("=" * 70)
@@ -75,7 +35,7 @@ print("  EXPLORACIÓN PROFUNDA — GDELT + CLIMA PERÚ")
 print("  Fecha:", datetime.now().strftime("%Y-%m-%d %H:%M"))
 print("=" * 70)
 
-end = datetime.today()
+end = gdelt.ahora()
 
 # ── BLOQUE 1: MAPEO DE TÉRMINOS ──────────────────────────────
 # Probamos TODOS los términos relevantes para encontrar
@@ -151,11 +111,13 @@ categorias = {
 }
 
 todos_resultados = []
+consultas = [(q, start_1y, end) for terminos in categorias.values() for q in terminos]
+respuestas = iter(gdelt.en_paralelo(gdelt_search, consultas))
 
 for cat, terminos in categorias.items():
     print(f"\n── {cat} ──")
     for q in terminos:
-        arts = gdelt_search(q, start_1y, end, max_records=250)
+        arts = next(respuestas)
         n = len(arts)
 
         # Analizar idiomas y fuentes si hay resultados
@@ -183,7 +145,6 @@ for cat, terminos in categorias.items():
 
         lang_str = f"(esp: {n_spanish})" if n_spanish > 0 else ""
         print(f"  {q:35s} -> {n:4d} arts {lang_str:12s} top: {top_domain}")
-        time.sleep(PAUSE)
 
 # Guardar resultados del mapeo
 df_mapeo = pd.DataFrame(todos_resultados)
@@ -202,18 +163,19 @@ top_queries = df_mapeo_sorted.head(5)["query"].tolist()
 print(f"Top 5 términos: {top_queries}")
 
 historico = []
+anios = range(2017, 2027)
+consultas = [(q, datetime(year, 1, 1), min(datetime(year, 12, 31), end))
+             for q in top_queries for year in anios]
+respuestas = iter(gdelt.en_paralelo(gdelt_search, consultas))
 
 for q in top_queries:
     print(f"\n  Término: '{q}'")
-    for year in range(2017, 2027):
-        s = datetime(year, 1, 1)
-        e = min(datetime(year, 12, 31), end)
-        arts = gdelt_search(q, s, e, max_records=250)
+    for year in anios:
+        arts = next(respuestas)
         n = len(arts)
         n_esp = sum(1 for a in arts if a.get("language") == "Spanish")
         historico.append({"query": q, "year": year, "n_total": n, "n_spanish": n_esp})
         print(f"    {year}: {n:4d} total, {n_esp:4d} español")
-        time.sleep(PAUSE)
 
 df_hist = pd.DataFrame(historico)
 df_hist.to_csv(RAW_DIR / "gdelt_profundidad_historica.csv", index=False)
@@ -225,9 +187,10 @@ print("BLOQUE 3: FUENTES PERUANAS — ¿qué medios cubre GDELT?")
 print("=" * 70)
 
 # Búsqueda amplia de noticias de Perú sobre desastres
-arts_peru = gdelt_search("peru disaster OR flood OR drought OR emergency", start_1y, end, max_records=250)
-time.sleep(PAUSE)
-arts_peru2 = gdelt_search("peru inundacion OR sequia OR helada OR huaico", start_1y, end, max_records=250)
+arts_peru, arts_peru2 = gdelt.en_paralelo(gdelt_search, [
+    ("peru disaster OR flood OR drought OR emergency", start_1y, end),
+    ("peru inundacion OR sequia OR helada OR huaico", start_1y, end),
+])
 
 all_arts = arts_peru + arts_peru2
 
@@ -272,14 +235,13 @@ timeline_queries = ["flood peru", "drought peru", "El Nino peru",
 
 all_timelines = {}
 
-for q in timeline_queries:
-    tl = gdelt_timeline(q, start_3m, end)
+for q, tl in zip(timeline_queries,
+                 gdelt.en_paralelo(gdelt_timeline, [(q, start_3m, end) for q in timeline_queries])):
     if tl:
         all_timelines[q] = tl
         print(f"  {q:25s} -> {len(tl)} puntos temporales")
     else:
         print(f"  {q:25s} -> sin datos")
-    time.sleep(PAUSE)
 
 if all_timelines:
     with open(RAW_DIR / "gdelt_timelines.json", "w") as f:
@@ -1,28 +1,57 @@
 """
 01_cosechar_gdelt.py
 Cosecha sistemática de GDELT: todos los queries × todos los trimestres × 2017-2026.
-Guarda cada página en data/raw/ y consolida en data/staging/.
-Diseñado para dejarlo corriendo ~2 horas.
+Consolida en data/staging/. Diseñado para dejarlo corriendo ~2 horas.
+
+La única caché es la de comun/gdelt.py (SQLite, por parámetros): reanudar
+una cosecha cortada, o una exploración de 00/00b sobre los mismos
+trimestres, responde desde ahí. Las páginas JSON de cosechas anteriores
+(data/raw/gdelt_cosecha/, data/raw/gdelt_timeline/) se importan a esa caché
+al empezar, solo las de ventanas cerradas y no vacías; ya no se escriben.
+
+Cada query se envía con los filtros de GDELT de cada plan de PLANES
+(sourcelang, sourcecountry, domain), así el tope de 250 registros por ventana
+se gasta en artículos que 02 no va a descartar. Cada plan tiene su propio
+tope, así que una ventana cuesta len(PLANES_ACTIVOS) llamadas en lugar de
+una. Las ventanas que ya tienen en caché el plan "todo" (cosechas anteriores,
+sin filtros) se reusan tal cual si REUSAR_TODO: no se piden de nuevo por
+plan. Cada artículo lleva su plan en `_plan`; 02 deja fuera de la cobertura
+peruana lo del plan es_ext. outputs/tables/cosecha_supervivencia.csv registra qué fracción de los
+registros de cada ventana sobrevive a los filtros de 02 (español, URL nueva,
+cobertura peruana); lo útil de es_ext va aparte, en n_extranjeros.
+
+Modo timeline (`python scripts/01_cosechar_gdelt.py timeline`): en vez de
+artículos, pide a GDELT la curva diaria de volumen (timelinevolraw) de cada
+query y de una consulta base de todo Perú, una llamada por query y año.
+Son los denominadores de la cobertura (ver comun/series.py): unos cientos de
+llamadas en lugar de la cosecha completa.
 """
 
-import requests
-import time
+import sys
 import json
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
+from comun.artefactos import DATASETS, ruta
+from comun import gdelt
+from comun.compacto import compactar
+from comun.normalizar import normalizar_serie
+from comun.perfilado import etapa
+from comun.series import PLANES_FUERA_PERU
+from comun.staging import escribir_particionado
+
 # ── Configuración ──────────────────────────────────────────────
-BASE_URL = "https://api.gdeltproject.org/api/v2/doc/doc"
-PAUSE = 10          # pausa normal entre requests
-RETRY_WAIT = 35     # espera base ante 429
-MAX_RETRIES = 4
-MAX_RECORDS = 250
+# Pausas, reintentos ante 429 y caché de respuestas: ver comun/gdelt.py
+MAX_RECORDS = gdelt.MAX_RECORDS
+TIMELINE_MODO = "timelinevolraw"   # value = artículos de la query, norm = total monitoreado
+LINEA_BASE = "peru"                # consulta base: todo lo que menciona Perú
 
 RAW_DIR = Path("data/raw/gdelt_cosecha")
 STAGING_DIR = Path("data/staging")
 LOG_DIR = Path("data/logs")
-RAW_DIR.mkdir(parents=True, exist_ok=True)
+TIMELINE_DIR = ruta("timeline_crudo")
+SUPERVIVENCIA_PATH = ruta("cosecha_supervivencia")
 
 TODAY = datetime.today().strftime("%Y%m%d")
 LOG_PATH = LOG_DIR / f"cosecha_gdelt_{TODAY}.log"
@@ -72,25 +101,30 @@ QUERIES = [
     "Ica peru drought",
 ]
 
-# ── Trimestres: 2017-Q1 hasta 2026-Q1 ────────────────────────
-def generar_trimestres(year_start, year_end):
-    trimestres = []
-    for year in range(year_start, year_end + 1):
-        for q in range(1, 5):
-            month_start = (q - 1) * 3 + 1
-            start = datetime(year, month_start, 1)
-            if q < 4:
-                end = datetime(year, month_start + 3, 1) - timedelta(days=1)
-            else:
-                end = datetime(year, 12, 31)
-            # No ir más allá de hoy
-            if start > datetime.today():
-                break
-            end = min(end, datetime.today())
-            trimestres.append((f"{year}Q{q}", start, end))
-    return trimestres
-
-TRIMESTRES = generar_trimestres(2017, 2026)
+# ── Planes de consulta (filtros del lado del servidor) ──────
+# Operadores que se agregan a cada query; cada plan es un presupuesto propio
+# de MAX_RECORDS por query y trimestre, según para qué se usa lo cosechado:
+PLANES = {
+    # cosechas anteriores, sin filtros (su caché no lleva sufijo de plan)
+    "todo": "",
+    # cobertura peruana en español: corpus de 02, regiones, cuerpos de 03
+    "pe": "sourcelang:spanish sourcecountry:peru",
+    # prensa en español de fuera de Perú; disjunto de "pe", así no comparten tope
+    "es_ext": "sourcelang:spanish -sourcecountry:peru",
+    # medios prioritarios (ver README), con tope propio aunque "pe" se sature
+    "medios": "sourcelang:spanish (domain:andina.gob.pe OR domain:rpp.pe "
+              "OR domain:elcomercio.pe OR domain:larepublica.pe)",
+}
+PLANES_ACTIVOS = ["pe", "es_ext", "medios"]
+# Ventanas con "todo" en caché: se reusa (0 llamadas) en vez de pedir los
+# PLANES_ACTIVOS (3 llamadas). False para recosechar por plan.
+REUSAR_TODO = True
+
+# ── Ventanas: trimestres 2017-Q1 hasta hoy (ver gdelt.trimestres) ──
+TRIMESTRES = gdelt.trimestres(datetime(2017, 1, 1), datetime(2026, 12, 31))
+
+# Timelines: una ventana por año (resolución diaria)
+ANIOS = gdelt.anios(TRIMESTRES[0][1], TRIMESTRES[-1][2])
 
 # ── Logging ────────────────────────────────────────────────────
 def log(msg):
@@ -100,51 +134,81 @@ def log(msg):
     with open(LOG_PATH, "a", encoding="utf-8") as f:
         f.write(line + "\n")
 
-# ── Búsqueda con reintentos ───────────────────────────────────
-def gdelt_search(query, start, end):
-    params = {
-        "query": query,
-        "mode": "artlist",
-        "format": "json",
-        "maxrecords": MAX_RECORDS,
-        "startdatetime": start.strftime("%Y%m%d%H%M%S"),
-        "enddatetime": end.strftime("%Y%m%d%H%M%S"),
-    }
-    for attempt in range(MAX_RETRIES):
-        try:
-            r = requests.get(BASE_URL, params=params, timeout=30)
-            if r.status_code == 429:
-                wait = RETRY_WAIT * (attempt + 1)
-                log(f"    429 — esperando {wait}s (intento {attempt+1})")
-                time.sleep(wait)
-                continue
-            if r.status_code != 200:
-                log(f"    HTTP {r.status_code}")
-                return []
-            data = r.json()
-            return data.get("articles", [])
-        except json.JSONDecodeError:
-            log(f"    JSON inválido (intento {attempt+1})")
-            time.sleep(15)
-        except Exception as e:
-            log(f"    Error: {str(e)[:60]} (intento {attempt+1})")
-            time.sleep(15)
-    return []
+# ── Búsqueda (comun/gdelt.py: caché, pausas y reintentos) ──
+def query_plan(query, plan):
+    """Query con los operadores del plan."""
+    return f"{query} {PLANES[plan]}".strip()
+
+def params_articulos(query, plan, start, end):
+    return gdelt.parametros(query_plan(query, plan), "artlist", start, end, maxrecords=MAX_RECORDS)
+
+def params_timeline(query, start, end):
+    return gdelt.parametros(query, TIMELINE_MODO, start, end)
+
+def gdelt_timeline(query, start, end):
+    """Puntos de la curva de volumen: [{"date", "value", "norm"}, ...] (None si falló)."""
+    return gdelt.timeline(query, start, end, TIMELINE_MODO, log=log)
+
+def planes_ventana(query, start, end):
+    """Planes a consultar en una ventana: "todo" si ya está en caché y se reusa."""
+    if REUSAR_TODO and gdelt.leer_cache(params_articulos(query, "todo", start, end)) is not None:
+        return ["todo"]
+    return PLANES_ACTIVOS
+
+# ── Importación de cosechas anteriores a la caché ─────────────
+def archivo_raw(query, plan, qname):
+    safe_query = query.replace(" ", "_").replace("/", "_")
+    sufijo = "" if plan == "todo" else f"_{plan}"
+    return RAW_DIR / f"{safe_query}{sufijo}_{qname}.json"
+
+def archivo_timeline(query, anio):
+    return TIMELINE_DIR / f"{query.replace(' ', '_').replace('/', '_')}_{anio}.json"
+
+def importar_crudos():
+    """Pasa a la caché de gdelt las páginas JSON de cosechas anteriores que
+    falten en ella. Solo ventanas cerradas (las abiertas se vuelven a pedir) y
+    no vacías (una lista vacía pudo ser una consulta fallida)."""
+    candidatos = [(archivo_raw(q, plan, qname), params_articulos(q, plan, start, end),
+                   lambda arts: {"articles": arts})
+                  for q in QUERIES for plan in PLANES for qname, start, end in TRIMESTRES]
+    candidatos += [(archivo_timeline(q, anio), params_timeline(q, start, end),
+                    lambda puntos: {"timeline": [{"data": puntos}]})
+                   for q in [LINEA_BASE] + QUERIES for anio, start, end in ANIOS]
+    n = 0
+    for archivo, params, envolver in candidatos:
+        if (not archivo.exists() or gdelt.ttl(params) != gdelt.TTL_CERRADA
+                or gdelt.leer_cache(params) is not None):
+            continue
+        with open(archivo, "r", encoding="utf-8") as f:
+            contenido = json.load(f)
+        if contenido:
+            gdelt.guardar_cache(params, envolver(contenido))
+            n += 1
+    if n:
+        log(f"Importadas a la caché de GDELT: {n} respuestas de cosechas anteriores")
 
 # ── Cosecha principal ──────────────────────────────────────────
 def cosechar():
+    importar_crudos()
     total_queries = len(QUERIES)
     total_trimestres = len(TRIMESTRES)
-    total_combinaciones = total_queries * total_trimestres
+    plan_ventanas = [(query, qname, start, end, planes_ventana(query, start, end))
+                     for query in QUERIES for qname, start, end in TRIMESTRES]
+    total_combinaciones = sum(len(planes) for *_, planes in plan_ventanas)
+    n_reusadas = sum(planes == ["todo"] for *_, planes in plan_ventanas)
 
     log("=" * 70)
-    log(f"COSECHA GDELT — {total_queries} queries × {total_trimestres} trimestres = {total_combinaciones} consultas")
-    log(f"Pausa entre requests: {PAUSE}s")
-    log(f"Tiempo estimado: {total_combinaciones * (PAUSE + 2) // 60} minutos")
+    log(f"COSECHA GDELT — {total_queries} queries × {total_trimestres} trimestres: "
+        f"{total_combinaciones} consultas ({n_reusadas} ventanas desde la caché de \"todo\")")
+    for plan in ["todo"] * (n_reusadas > 0) + PLANES_ACTIVOS:
+        log(f"  plan {plan:8s} {PLANES[plan] or '(sin filtros)'}")
+    log(f"Pausa entre requests: {gdelt.PAUSA}s")
+    log(f"Tiempo estimado (sin caché): {(total_combinaciones - n_reusadas) * (gdelt.PAUSA + 2) // 60} minutos")
     log("=" * 70)
 
     all_articles = []
     seen_urls = set()  # para deduplicar
+    supervivencia = []  # registros por ventana que sobreviven a los filtros de 02
     consulta_num = 0
     errores = 0
 
@@ -153,66 +217,72 @@ def cosechar():
         query_spanish = 0
         query_new = 0
 
-        for qname, start, end in TRIMESTRES:
-            consulta_num += 1
+        for _, qname, start, end, planes in (v for v in plan_ventanas if v[0] == query):
+            for plan in planes:
+                consulta_num += 1
 
-            # Nombre de archivo para caché
-            safe_query = query.replace(" ", "_").replace("/", "_")
-            cache_file = RAW_DIR / f"{safe_query}_{qname}.json"
+                # Lo que ya está en la caché de gdelt no se consulta (permite reanudar);
+                # las consultas fallidas no se guardan y se reintentan en la próxima corrida
+                params = params_articulos(query, plan, start, end)
+                consultado = gdelt.leer_cache(params) is None
+                data = gdelt.consultar(params, log)
+                errores += data is None
+                arts = (data or {}).get("articles", [])
 
-            # Si ya existe el archivo, saltar (permite reanudar)
-            if cache_file.exists():
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    arts = json.load(f)
+                # Deduplicar y agregar
                 new_arts = [a for a in arts if a.get("url") not in seen_urls]
                 for a in new_arts:
                     seen_urls.add(a.get("url"))
                     a["_query"] = query
+                    a["_plan"] = plan
                     a["_trimestre"] = qname
                     all_articles.append(a)
-                query_total += len(arts)
-                query_new += len(new_arts)
-                continue
 
-            # Consultar GDELT
-            arts = gdelt_search(query, start, end)
-
-            # Guardar raw
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(arts, f, ensure_ascii=False)
-
-            # Deduplicar y agregar
-            new_arts = [a for a in arts if a.get("url") not in seen_urls]
-            for a in new_arts:
-                seen_urls.add(a.get("url"))
-                a["_query"] = query
-                a["_trimestre"] = qname
-                all_articles.append(a)
-
-            n = len(arts)
-            n_new = len(new_arts)
-            n_esp = sum(1 for a in arts if a.get("language") == "Spanish")
-            query_total += n
-            query_spanish += n_esp
-            query_new += n_new
-
-            if n > 0:
-                log(f"  [{consulta_num}/{total_combinaciones}] {query:30s} {qname}: {n:3d} arts ({n_new} nuevos, {n_esp} esp)")
-            
-            time.sleep(PAUSE)
-
-        log(f"  >>> {query}: {query_total} total, {query_new} nuevos únicos")
+                n = len(arts)
+                n_new = len(new_arts)
+                n_esp = sum(1 for a in arts if a.get("language") == "Spanish")
+                n_nuevos_esp = sum(1 for a in new_arts if a.get("language") == "Spanish")
+                # es_ext no llega a las series de cobertura (series.cobertura_peruana)
+                fuera = plan in PLANES_FUERA_PERU
+                n_utiles = 0 if fuera else n_nuevos_esp
+                query_total += n
+                query_spanish += n_esp
+                query_new += n_new
+                supervivencia.append({"query": query, "plan": plan, "trimestre": qname, "n": n,
+                                      "n_espanol": n_esp, "n_utiles": n_utiles,
+                                      "n_extranjeros": n_nuevos_esp if fuera else 0,
+                                      "saturada": n >= MAX_RECORDS})
+
+                if consultado and n > 0:
+                    log(f"  [{consulta_num}/{total_combinaciones}] {query:30s} {plan:7s} {qname}: "
+                        f"{n:3d} arts ({n_new} nuevos, {n_esp} esp)")
+
+        log(f"  >>> {query}: {query_total} total, {query_spanish} esp, {query_new} nuevos únicos")
         log("")
 
+    # ── Supervivencia por ventana ──────────────────────────────
+    df_sup = pd.DataFrame(supervivencia)
+    df_sup["supervivencia"] = df_sup["n_utiles"] / df_sup["n"].where(df_sup["n"] > 0)
+    SUPERVIVENCIA_PATH.parent.mkdir(parents=True, exist_ok=True)
+    df_sup.to_csv(SUPERVIVENCIA_PATH, index=False)
+    resumen = df_sup.groupby("plan", sort=False).agg(
+        registros=("n", "sum"), utiles=("n_utiles", "sum"), extranjeros=("n_extranjeros", "sum"),
+        saturadas=("saturada", "mean"))
+    resumen["supervivencia"] = resumen["utiles"] / resumen["registros"].where(resumen["registros"] > 0)
+    log("Registros que sobreviven a los filtros de 02 (español, URL nueva, cobertura peruana), por plan:")
+    log(resumen.to_string(formatters={"saturadas": "{:.0%}".format, "supervivencia": "{:.0%}".format}))
+    log(f"Guardado: {SUPERVIVENCIA_PATH}")
+
     # ── Consolidar y guardar ──────────────────────────────────
     log("=" * 70)
     log(f"COSECHA COMPLETADA")
     log(f"  Artículos únicos totales: {len(all_articles)}")
     log(f"  URLs deduplicadas: {len(seen_urls)}")
+    log(f"  Consultas fallidas (se reintentan en la próxima corrida): {errores}")
     log("=" * 70)
 
     if all_articles:
-        df = pd.DataFrame(all_articles)
+        df = compactar(pd.DataFrame(all_articles))
 
         # Limpiar y enriquecer
         if 'seendate' in df.columns:
@@ -221,11 +291,14 @@ def cosechar():
             df['month'] = df['fecha'].dt.month
             df['quarter'] = df['fecha'].dt.quarter
 
-        # Guardar
-        out_parquet = STAGING_DIR / f"gdelt_clima_peru_{TODAY}.parquet"
+        # Título normalizado (minúsculas, sin tildes), calculado una sola vez
+        if 'title' in df.columns:
+            df['title_norm'] = normalizar_serie(df['title'])
+
+        # Guardar: Parquet particionado por idioma/año + CSV fechado para revisión
         out_csv = STAGING_DIR / f"gdelt_clima_peru_{TODAY}.csv"
 
-        df.to_parquet(out_parquet, index=False)
+        out_parquet = escribir_particionado(df, DATASETS["corpus"])
         df.to_csv(out_csv, index=False, encoding="utf-8-sig")
 
         log(f"Guardado: {out_parquet}")
@@ -264,5 +337,49 @@ def cosechar():
 
     log("\nProceso terminado.")
 
+# ── Cosecha de timelines (denominadores) ──────────────────────
+def cosechar_timeline():
+    queries = [LINEA_BASE] + QUERIES
+    total = len(queries) * len(ANIOS)
+    log("=" * 70)
+    log(f"COSECHA TIMELINES ({TIMELINE_MODO}) — {len(queries)} queries × {len(ANIOS)} años = {total} consultas")
+    log("=" * 70)
+    importar_crudos()
+
+    filas = []
+    consulta_num = 0
+    for query in queries:
+        for anio, start, end in ANIOS:
+            consulta_num += 1
+            # El año en curso sigue abierto: su caché vence a las TTL_ABIERTA (ver gdelt.ttl)
+            consultado = gdelt.leer_cache(params_timeline(query, start, end)) is None
+            puntos = gdelt_timeline(query, start, end)
+            if puntos is None:
+                log(f"  [{consulta_num}/{total}] {query:30s} {anio}: falló, se reintentará")
+                continue
+            if consultado:
+                log(f"  [{consulta_num}/{total}] {query:30s} {anio}: "
+                    f"{sum(p.get('value', 0) for p in puntos):,.0f} arts en {len(puntos)} días")
+            filas += [{"query": query, "date": p.get("date"), "n": p.get("value"), "n_monitoreado": p.get("norm")}
+                      for p in puntos]
+
+    if not filas:
+        log("Sin timelines para guardar.")
+        return
+    df = pd.DataFrame(filas)
+    df["fecha"] = pd.to_datetime(df.pop("date"), format="%Y%m%dT%H%M%SZ", errors="coerce").dt.floor("D")
+    df = (df.dropna(subset=["fecha"])
+            .groupby(["query", "fecha"], as_index=False)[["n", "n_monitoreado"]].sum())
+    df["query"] = df["query"].astype("category")
+    df["es_base"] = df["query"] == LINEA_BASE
+    df.to_parquet(ruta("timeline_volumen"), index=False)
+    log(f"\nGuardado: {ruta('timeline_volumen')} ({len(df):,} filas, "
+        f"{df['fecha'].min():%Y-%m-%d} → {df['fecha'].max():%Y-%m-%d})")
+
 if __name__ == "__main__":
-    cosechar()
+    if sys.argv[1:] == ["timeline"]:
+        with etapa("01_cosechar_timeline"):
+            cosechar_timeline()
+    else:
+        with etapa("01_cosechar_gdelt"):
+            cosechar()
@@ -0,0 +1,169 @@
+"""
+01b_ingerir_gkg.py
+Ingesta de los archivos masivos de GDELT 2.0 (GKG y mentions cada 15 minutos)
+desde un espejo local en data/raw/gdelt_gkg/ — la profundidad histórica que la
+DOC API de 01 no da (tope de 250 registros por consulta).
+
+Cada zip se lee en streaming (ver comun/gkg.py) y se filtra a Perú y a los
+temas del diccionario; los archivos se reparten entre procesos. El resultado
+de cada archivo se guarda en data/staging/gkg_filtrado/, así que una nueva
+corrida solo procesa los archivos nuevos o modificados del espejo. Al final
+se consolida en el dataset particionado corpus_gkg, con el mismo esquema que
+el corpus de 01; 02 lee ambos. Cada fila lleva en _plan el plan de 01 al que
+equivale, así la prensa en español de dominios no peruanos (es_ext) queda
+fuera de la cobertura peruana como en la cosecha de la API.
+
+Descarga del espejo: http://data.gdeltproject.org/gdeltv2/masterfilelist.txt
+(y masterfilelist-translation.txt); para mentions hace falta también el
+export del mismo intervalo.
+"""
+
+import os
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from comun.artefactos import DATASETS, ruta
+from comun.compacto import compactar
+from comun.detector import compilar_temas
+from comun.diccionarios import temas
+from comun.gkg import (tipo_archivo, filtrar_gkg, eventos_pais, filtrar_menciones,
+                       plan_equivalente, ORIGEN_PAGINA, ORIGEN_SLUG)
+from comun.normalizar import normalizar_serie, plegar_temas
+from comun.perfilado import etapa
+from comun.staging import escribir_particionado
+
+# ── Configuración ──────────────────────────────────────────────
+LOG_DIR = Path("data/logs")
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+ESPEJO_DIR = ruta("gkg_espejo")
+CACHE_DIR = ruta("gkg_filtrado")       # un Parquet por archivo del espejo
+N_PROCESOS = int(os.environ.get("N_PROCESOS", os.cpu_count() or 1))
+
+PAIS = "PE"          # código FIPS en lugares GKG y eventos
+TLD = "pe"           # dominios nacionales: cuentan aunque no se mencione un lugar
+# Temas GKG que bastan por sí solos (además del diccionario sobre título/URL)
+PREFIJOS_TEMAS_GKG = ("NATURAL_DISASTER", "ENV_CLIMATECHANGE", "FOOD_SECURITY", "AGRICULTURE")
+
+TODAY = datetime.today().strftime("%Y%m%d")
+LOG_PATH = LOG_DIR / f"ingesta_gkg_{TODAY}.log"
+
+SCHEMA = pa.schema([(c, pa.string()) for c in
+                    ["url", "url_mobile", "title", "title_origen", "seendate", "socialimage", "domain",
+                     "language", "sourcecountry", "_query", "_plan", "_trimestre"]])
+
+def log(msg):
+    ts = datetime.now().strftime("%H:%M:%S")
+    line = f"[{ts}] {msg}"
+    print(line)
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+# ── Trabajo por archivo (en los procesos del pool) ────────────
+_patron = None
+
+def preparar():
+    global _patron
+    _patron = compilar_temas(plegar_temas(temas))
+
+def procesar(path):
+    """Filtra un archivo del espejo y guarda su resultado en CACHE_DIR.
+    Devuelve (nombre, filas, segundos) o (nombre, None, motivo) si se omite."""
+    t0 = time.perf_counter()
+    if tipo_archivo(path.name) == "gkg":
+        filas = filtrar_gkg(path, _patron, PREFIJOS_TEMAS_GKG, PAIS, TLD)
+    else:
+        export = path.with_name(path.name.replace(".mentions.", ".export."))
+        if not export.exists():
+            return path.name, None, f"falta {export.name}"
+        filas = filtrar_menciones(path, eventos_pais(export, PAIS), _patron)
+    pq.write_table(pa.Table.from_pylist(filas, schema=SCHEMA), cache_de(path))
+    return path.name, len(filas), time.perf_counter() - t0
+
+def cache_de(path):
+    return CACHE_DIR / f"{path.name}.parquet"
+
+def pendientes():
+    """Archivos GKG/mentions del espejo sin resultado en caché o modificados después."""
+    archivos = sorted(p for p in ESPEJO_DIR.rglob("*.zip")
+                      if tipo_archivo(p.name) in ("gkg", "mentions"))
+    return archivos, [p for p in archivos
+                      if not cache_de(p).exists()
+                      or cache_de(p).stat().st_mtime < p.stat().st_mtime]
+
+# ── Principal ─────────────────────────────────────────────────
+def main():
+    log("=" * 70)
+    log("INGESTA GDELT 2.0 (GKG / MENTIONS) DESDE ESPEJO LOCAL")
+    log("=" * 70)
+
+    if not ESPEJO_DIR.is_dir():
+        log(f"No existe {ESPEJO_DIR}: nada que ingerir.")
+        return
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    archivos, nuevos = pendientes()
+    log(f"Archivos en el espejo: {len(archivos):,} — por procesar: {len(nuevos):,} "
+        f"({N_PROCESOS} procesos)")
+
+    t0 = time.perf_counter()
+    filas_nuevas = 0
+    omitidos = 0
+    bytes_nuevos = sum(p.stat().st_size for p in nuevos)
+    with etapa("filtrado"), ProcessPoolExecutor(max_workers=N_PROCESOS, initializer=preparar) as pool:
+        for i, (nombre, n, detalle) in enumerate(pool.map(procesar, nuevos, chunksize=4), 1):
+            if n is None:
+                omitidos += 1
+                log(f"  Omitido {nombre}: {detalle}")
+                continue
+            filas_nuevas += n
+            if i % 500 == 0 or i == len(nuevos):
+                log(f"  [{i:,}/{len(nuevos):,}] {filas_nuevas:,} filas")
+    segundos = time.perf_counter() - t0
+    if nuevos:
+        log(f"Filtrado: {filas_nuevas:,} filas de {len(nuevos) - omitidos:,} archivos en {segundos:.1f}s "
+            f"({bytes_nuevos / 2**20 / max(segundos, 1e-9):.1f} MB comprimidos/s)")
+
+    # ── Consolidar ────────────────────────────────────────────
+    if not nuevos and ruta("corpus_gkg").is_dir():
+        log("Sin archivos nuevos: corpus_gkg al día.")
+        return
+    caches = [cache_de(p) for p in archivos if cache_de(p).exists()]
+    if not caches:
+        log("Sin resultados para consolidar.")
+        return
+    df = ds.dataset(caches, format="parquet", schema=SCHEMA).to_table().to_pandas()
+    df = df.sort_values("seendate").drop_duplicates("url")
+    if df.empty:
+        log("Ningún registro pasó el filtro.")
+        return
+
+    df['fecha'] = pd.to_datetime(df['seendate'].str[:8], format='%Y%m%d', errors='coerce')
+    df['year'] = df['fecha'].dt.year
+    df['month'] = df['fecha'].dt.month
+    df['quarter'] = df['fecha'].dt.quarter
+    # Cachés anteriores a title_origen: mentions siempre usó el slug
+    df['title_origen'] = df['title_origen'].fillna(
+        df['_query'].map({'mentions': ORIGEN_SLUG}).fillna(ORIGEN_PAGINA))
+    # Cachés anteriores a _plan: se deduce del país del dominio y el idioma
+    df['_plan'] = df['_plan'].fillna(pd.Series(
+        map(plan_equivalente, df['sourcecountry'], df['language']), index=df.index))
+    df['title_norm'] = normalizar_serie(df['title'])
+    df = compactar(df)
+
+    out = escribir_particionado(df, DATASETS["corpus_gkg"])
+    log(f"Guardado: {out} ({len(df):,} artículos únicos)")
+    log(f"Rango de fechas: {df['fecha'].min()} → {df['fecha'].max()}")
+    log(f"\nPor origen:\n{df['_query'].value_counts().to_string()}")
+    log(f"\nIdiomas:\n{df['language'].value_counts().head(10).to_string()}")
+    log(f"\nTop 20 fuentes:\n{df['domain'].value_counts().head(20).to_string()}")
+
+if __name__ == "__main__":
+    with etapa("01b_ingerir_gkg"):
+        main()
@@ -5,16 +5,21 @@ Usa las URLs ya existentes en el corpus GDELT.
 Reanudable: guarda progreso en JSON incremental.
 """
 
-import pandas as pd
+import pyarrow.compute as pc
 import requests
-from bs4 import BeautifulSoup
 import json
 import time
 from pathlib import Path
 from datetime import datetime
 
+from comun.artefactos import DATASETS, ruta
+from comun.diccionarios import temas
+from comun.compacto import decodificar
+from comun.cuerpos import extraer_cuerpo
+from comun.perfilado import etapa
+from comun.staging import leer_staging, filtro_idioma
+
 # ── Configuración ──────────────────────────────────────────────
-STAGING_DIR = Path("data/staging")
 RAW_DIR = Path("data/raw/cuerpos")
 LOG_DIR = Path("data/logs")
 RAW_DIR.mkdir(parents=True, exist_ok=True)
@@ -42,7 +47,7 @@ DOMINIOS_OK = [
 TODAY = datetime.today().strftime("%Y%m%d")
 LOG_PATH = LOG_DIR / f"enriquecer_cuerpos_{TODAY}.log"
 PROGRESS_FILE = RAW_DIR / "progreso_cuerpos.json"
-OUTPUT_FILE = RAW_DIR / "cuerpos_descargados.jsonl"
+OUTPUT_FILE = ruta("cuerpos")
 
 def log(msg):
     ts = datetime.now().strftime("%H:%M:%S")
@@ -51,46 +56,6 @@ def log(msg):
     with open(LOG_PATH, "a", encoding="utf-8") as f:
         f.write(line + "\n")
 
-def extraer_cuerpo(html, domain):
-    """Extrae el texto principal de una página de noticias."""
-    soup = BeautifulSoup(html, 'lxml')
-    
-    # Eliminar scripts, styles, nav, footer, ads
-    for tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'iframe']):
-        tag.decompose()
-    
-    # Buscar contenedor principal por clases comunes
-    contenedores = [
-        ('article', None),
-        ('div', 'story-contents'),
-        ('div', 'article-body'),
-        ('div', 'nota-contenido'),
-        ('div', 'news-body'),
-        ('div', 'content-body'),
-        ('div', 'entry-content'),
-        ('div', 'post-content'),
-        ('div', 'article-content'),
-        ('div', 'cuerpo'),
-    ]
-    
-    for tag, cls in contenedores:
-        if cls:
-            found = soup.find(tag, class_=lambda c: c and cls in str(c).lower())
-        else:
-            found = soup.find(tag)
-        if found:
-            paragraphs = found.find_all('p')
-            text = '\n'.join(p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 30)
-            if len(text) > 200:
-                return text
-    
-    # Fallback: todos los párrafos largos de la página
-    paragraphs = soup.find_all('p')
-    long_p = [p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50]
-    text = '\n'.join(long_p)
-    
-    return text if len(text) > 100 else ""
-
 def cargar_progreso():
     """Carga URLs ya procesadas."""
     if PROGRESS_FILE.exists():
@@ -104,13 +69,17 @@ def guardar_progreso(urls_procesadas):
         json.dump(list(urls_procesadas), f)
 
 def main():
-    # Cargar datos
-    df = pd.read_parquet(STAGING_DIR / "gdelt_clima_peru_español_temas.parquet")
-    tema_cols = [c for c in df.columns if c.startswith('tema_')]
-    df_temas = df[df[tema_cols].any(axis=1)].copy()
-    
-    # Filtrar dominios accesibles
-    df_target = df_temas[df_temas['domain'].isin(DOMINIOS_OK)].copy()
+    # Cargar datos: español, con ≥1 tema y de dominios accesibles,
+    # filtrado durante el escaneo y solo con las columnas necesarias
+    nombres_temas = list(temas)
+    filtro = (
+        filtro_idioma('Spanish')
+        & (pc.field('temas_bits') != 0)
+        & pc.field('domain').isin(DOMINIOS_OK)
+    )
+    df_target = leer_staging(DATASETS["corpus_temas"],
+                             columnas=['url', 'domain', 'title', 'fecha', 'temas_bits'],
+                             filtro=filtro)
     df_target = df_target.sort_values('fecha', ascending=False)
     df_target = df_target.drop_duplicates(subset='url')
     
@@ -150,7 +119,7 @@ def main():
                         'fecha': str(row.get('fecha', ''))[:10],
                         'cuerpo': cuerpo,
                         'chars': len(cuerpo),
-                        'temas': [c.replace('tema_', '') for c in tema_cols if row.get(c, False)],
+                        'temas': decodificar(row['temas_bits'], nombres_temas),
                     }
                     with open(OUTPUT_FILE, "a", encoding="utf-8") as f:
                         f.write(json.dumps(registro, ensure_ascii=False) + "\n")
@@ -211,4 +180,5 @@ def main():
     log("\nProceso terminado.")
 
 if __name__ == "__main__":
-    main()
+    with etapa("03_enriquecer_cuerpos"):
+        main()
@@ -0,0 +1,100 @@
+"""
+03a_normalizar_cuerpos.py
+Normaliza una sola vez los cuerpos descargados por 03 (minúsculas, sin
+tildes, espacios colapsados) y los persiste junto con el mapa de offsets
+hacia el texto original (título + '\\n' + cuerpo del JSONL).
+03b y 04 trabajan sobre este texto con patrones plegados, sin volver a
+normalizar en cada corrida.
+"""
+
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from datetime import datetime
+
+from comun.artefactos import ruta
+from comun.normalizar import normalizar
+from comun.perfilado import etapa
+
+# ── Configuración ──────────────────────────────────────────────
+LOG_DIR = Path("data/logs")
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+INPUT_FILE = ruta("cuerpos")
+OUTPUT_FILE = ruta("cuerpos_normalizados")
+BATCH_SIZE = 2_000
+
+TODAY = datetime.today().strftime("%Y%m%d")
+LOG_PATH = LOG_DIR / f"normalizar_cuerpos_{TODAY}.log"
+
+SCHEMA = pa.schema([
+    ("url", pa.string()),
+    ("domain", pa.string()),
+    ("fecha", pa.string()),
+    ("title", pa.string()),
+    ("temas", pa.list_(pa.string())),
+    ("texto_norm", pa.large_string()),
+    ("seg_norm", pa.list_(pa.int32())),
+    ("seg_orig", pa.list_(pa.int32())),
+])
+
+def log(msg):
+    ts = datetime.now().strftime("%H:%M:%S")
+    line = f"[{ts}] {msg}"
+    print(line)
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+def texto_original(art):
+    """Texto al que apuntan los offsets: título + salto de línea + cuerpo."""
+    return (art.get('title', '') or '') + '\n' + (art.get('cuerpo', '') or '')
+
+def main():
+    log("=" * 70)
+    log("NORMALIZACIÓN DE CUERPOS")
+    log("=" * 70)
+
+    total = 0
+    chars_orig = 0
+    chars_norm = 0
+    lote = []
+
+    with open(INPUT_FILE, "r", encoding="utf-8") as f, \
+            pq.ParquetWriter(OUTPUT_FILE, SCHEMA, compression="zstd") as writer:
+        for line in f:
+            if not line.strip():
+                continue
+            art = json.loads(line)
+            original = texto_original(art)
+            norm, seg_norm, seg_orig = normalizar(original)
+            lote.append({
+                'url': art['url'],
+                'domain': art.get('domain'),
+                'fecha': art.get('fecha'),
+                'title': art.get('title', ''),
+                'temas': art.get('temas', []),
+                'texto_norm': norm,
+                'seg_norm': seg_norm,
+                'seg_orig': seg_orig,
+            })
+            total += 1
+            chars_orig += len(original)
+            chars_norm += len(norm)
+
+            if len(lote) >= BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(lote, schema=SCHEMA))
+                lote = []
+                log(f"  Normalizados: {total:,}")
+
+        if lote:
+            writer.write_table(pa.Table.from_pylist(lote, schema=SCHEMA))
+
+    log(f"\n  Artículos: {total:,}")
+    log(f"  Caracteres: {chars_orig:,} → {chars_norm:,}")
+    log(f"Guardado: {OUTPUT_FILE}")
+    log("\nProceso terminado.")
+
+if __name__ == "__main__":
+    with etapa("03a_normalizar_cuerpos"):
+        main()
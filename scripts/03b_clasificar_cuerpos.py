@@ -0,0 +1,142 @@
+"""
+03b_clasificar_cuerpos.py
+Clasificación temática sobre título + cuerpo completo (salida de 03).
+Aplica el umbral de la metodología: una noticia entra en un tema solo con
+≥ 3 coincidencias de patrones del grupo en título y/o cuerpo.
+Lee los cuerpos normalizados por 03a en streaming (por lotes de Parquet) y
+escribe Parquet por lotes, así la memoria queda acotada aunque el corpus crezca.
+"""
+
+import time
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from datetime import datetime
+
+from comun.artefactos import ruta
+from comun.diccionarios import temas
+from comun.detector import compilar_temas, contar_temas, clasificar
+from comun.normalizar import plegar_temas
+from comun.perfil_regex import exigir_patrones_seguros
+from comun.perfilado import etapa
+
+# ── Configuración ──────────────────────────────────────────────
+LOG_DIR = Path("data/logs")
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+INPUT_FILE = ruta("cuerpos_normalizados")  # salida de 03a
+OUTPUT_FILE = ruta("cuerpos_temas")
+
+UMBRAL_HITS = 3         # umbral general (README)
+UMBRALES_TEMA = {}      # ajustes por tema, ej. {"cambio_climatico": 2}
+MAX_CHARS = 60_000      # cuerpos más largos se recortan (páginas mal extraídas)
+LIMITE_S = 0.5          # presupuesto de tiempo por artículo
+BATCH_SIZE = 2_000      # filas por row group de Parquet
+
+TODAY = datetime.today().strftime("%Y%m%d")
+LOG_PATH = LOG_DIR / f"clasificar_cuerpos_{TODAY}.log"
+
+NOMBRES_TEMAS = list(temas)
+
+SCHEMA = pa.schema(
+    [
+        ("url", pa.string()),
+        ("domain", pa.string()),
+        ("fecha", pa.string()),
+        ("chars", pa.int32()),
+        ("truncado", pa.bool_()),
+        ("temas_titulo", pa.list_(pa.string())),
+        ("temas", pa.list_(pa.string())),
+    ]
+    + [(f"n_{t}", pa.int16()) for t in NOMBRES_TEMAS]
+    + [(f"tema_{t}", pa.bool_()) for t in NOMBRES_TEMAS]
+)
+
+def log(msg):
+    ts = datetime.now().strftime("%H:%M:%S")
+    line = f"[{ts}] {msg}"
+    print(line)
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+def leer_cuerpos(path):
+    """Itera los artículos normalizados lote a lote, sin cargar el archivo completo."""
+    columnas = ['url', 'domain', 'fecha', 'temas', 'texto_norm']
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE, columns=columnas):
+        yield from batch.to_pylist()
+
+def clasificar_articulo(art, patron):
+    """Fila de salida para un artículo: hits por tema y temas sobre umbral."""
+    # Texto ya normalizado por 03a (título + '\n' + cuerpo, minúsculas, sin tildes)
+    texto = art['texto_norm']
+    hits, truncado = contar_temas(patron, texto[:MAX_CHARS], limite_s=LIMITE_S)
+    clasificados = clasificar(hits, umbral=UMBRAL_HITS, umbrales=UMBRALES_TEMA)
+
+    fila = {
+        'url': art['url'],
+        'domain': art.get('domain'),
+        'fecha': art.get('fecha'),
+        'chars': len(texto),
+        'truncado': truncado or len(texto) > MAX_CHARS,
+        'temas_titulo': art.get('temas', []),
+        'temas': clasificados,
+    }
+    for t in NOMBRES_TEMAS:
+        fila[f'n_{t}'] = min(hits.get(t, 0), 32767)
+        fila[f'tema_{t}'] = t in clasificados
+    return fila
+
+def main():
+    temas_plegados = plegar_temas(temas)
+    patron = compilar_temas(temas_plegados)
+
+    log("=" * 70)
+    log(f"CLASIFICACIÓN DE CUERPOS — umbral ≥ {UMBRAL_HITS} hits")
+    log(f"Temas: {len(NOMBRES_TEMAS)} | Máx. chars: {MAX_CHARS:,} | Presupuesto: {LIMITE_S}s/artículo")
+    log("=" * 70)
+
+    # Guarda de backtracking: aborta si algún patrón es de riesgo alto
+    exigir_patrones_seguros(
+        [(f"tema:{t}", p) for t, ps in temas_plegados.items() for p in ps], log=log
+    )
+
+    total = 0
+    truncados = 0
+    por_tema = {t: 0 for t in NOMBRES_TEMAS}
+    lote = []
+    t0 = time.perf_counter()
+
+    with etapa("clasificacion"), pq.ParquetWriter(OUTPUT_FILE, SCHEMA) as writer:
+        for art in leer_cuerpos(INPUT_FILE):
+            fila = clasificar_articulo(art, patron)
+            lote.append(fila)
+            total += 1
+            truncados += fila['truncado']
+            for t in fila['temas']:
+                por_tema[t] += 1
+
+            if len(lote) >= BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(lote, schema=SCHEMA))
+                lote = []
+                log(f"  Procesados: {total:,} ({total / (time.perf_counter() - t0):.0f} arts/s)")
+
+        if lote:
+            writer.write_table(pa.Table.from_pylist(lote, schema=SCHEMA))
+
+    # ── Resumen ───────────────────────────────────────────────
+    log("\n" + "=" * 70)
+    log("RESUMEN")
+    log("=" * 70)
+    log(f"  Artículos clasificados: {total:,}")
+    log(f"  Truncados (largo o tiempo): {truncados:,}")
+    log(f"  Tiempo: {time.perf_counter() - t0:.1f}s")
+    log(f"\n  Artículos por tema (≥ {UMBRAL_HITS} hits):")
+    for t, n in sorted(por_tema.items(), key=lambda x: -x[1]):
+        pct = n / total * 100 if total else 0
+        log(f"    {t:30s} {n:6,} ({pct:5.2f}%)")
+    log(f"\nGuardado: {OUTPUT_FILE}")
+    log("\nProceso terminado.")
+
+if __name__ == "__main__":
+    with etapa("03b_clasificar_cuerpos"):
+        main()
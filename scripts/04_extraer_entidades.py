@@ -5,298 +5,295 @@ Extracción de entidades de los cuerpos completos:
 - Cultivos y productos agrícolas
 - Cifras de afectación (hectáreas, muertos, damnificados, viviendas)
 - Instituciones
+
+Pipeline en streaming: los cuerpos normalizados se leen por lotes, cada lote
+se reparte en un pool de procesos y los resultados se escriben de inmediato
+como row groups de Parquet (y filas del CSV). Las cifras se guardan además
+como spans (tipo, valor, unidad, offsets) en cifras_spans.parquet, para
+auditar cada valor contra el texto. Lugares y cultivos se escriben también
+como tabla larga de menciones (menciones.parquet: url_id, tipo, entidad_id,
+offsets, superficie_id; todo entero) con su catálogo de entidades y de
+superficies, y los rankings se calculan con group-bys sobre ella. Todo se carga por upsert en el almacén
+SQLite de data/db/ (ver comun/almacen_entidades.py). La memoria queda acotada por
+el tamaño del lote, no por el tamaño del corpus.
 """
 
 import json
-import re
+import os
 import pandas as pd
-from pathlib import Path
-from collections import Counter, defaultdict
-from datetime import datetime
-
-RAW_DIR = Path("data/raw/cuerpos")
-STAGING_DIR = Path("data/staging")
-OUTPUT_DIR = Path("outputs/tables")
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
-INPUT_FILE = RAW_DIR / "cuerpos_descargados.jsonl"
-
-print("=" * 70)
-print("  EXTRACCIÓN DE ENTIDADES DESDE CUERPOS COMPLETOS")
-print("=" * 70)
-
-# ── Cargar cuerpos ─────────────────────────────────────────────
-articles = []
-with open(INPUT_FILE, "r", encoding="utf-8") as f:
-    for line in f:
-        articles.append(json.loads(line))
-
-print(f"Artículos cargados: {len(articles)}")
-
-# ── DICCIONARIOS DE EXTRACCIÓN ────────────────────────────────
-
-# Regiones y capitales
-regiones_peru = {
-    "Amazonas": ["Chachapoyas", "Bagua", "Bongará", "Condorcanqui", "Luya", "Rodríguez de Mendoza", "Utcubamba"],
-    "Áncash": ["Huaraz", "Aija", "Antonio Raymondi", "Asunción", "Bolognesi", "Carhuaz", "Carlos Fermín Fitzcarrald", "Casma", "Corongo", "Huari", "Huarmey", "Huaylas", "Mariscal Luzuriaga", "Ocros", "Pallasca", "Pomabamba", "Recuay", "Santa", "Sihuas", "Yungay"],
-    "Apurímac": ["Abancay", "Andahuaylas", "Antabamba", "Aymaraes", "Chincheros", "Cotabambas", "Grau"],
-    "Arequipa": ["Arequipa", "Camaná", "Caravelí", "Castilla", "Caylloma", "Condesuyos", "Islay", "La Unión"],
-    "Ayacucho": ["Huamanga", "Cangallo", "Huanca Sancos", "Huanta", "La Mar", "Lucanas", "Parinacochas", "Páucar del Sara Sara", "Sucre", "Víctor Fajardo", "Vilcas Huamán"],
-    "Cajamarca": ["Cajamarca", "Cajabamba", "Celendín", "Chota", "Contumazá", "Cutervo", "Hualgayoc", "Jaén", "San Ignacio", "San Marcos", "San Miguel", "San Pablo", "Santa Cruz"],
-    "Cusco": ["Cusco", "Acomayo", "Anta", "Calca", "Canas", "Canchis", "Chumbivilcas", "Espinar", "La Convención", "Paruro", "Paucartambo", "Quispicanchi", "Urubamba", "Santa Teresa", "Quillabamba"],
-    "Huancavelica": ["Huancavelica", "Acobamba", "Angaraes", "Castrovirreyna", "Churcampa", "Huaytará", "Tayacaja"],
-    "Huánuco": ["Huánuco", "Ambo", "Dos de Mayo", "Huacaybamba", "Huamalíes", "Leoncio Prado", "Marañón", "Pachitea", "Puerto Inca", "Lauricocha", "Yarowilca"],
-    "Ica": ["Ica", "Chincha", "Nazca", "Palpa", "Pisco"],
-    "Junín": ["Huancayo", "Chanchamayo", "Chupaca", "Concepción", "Jauja", "Junín", "Satipo", "Tarma", "Yauli"],
-    "La Libertad": ["Trujillo", "Ascope", "Bolívar", "Chepén", "Julcán", "Otuzco", "Pacasmayo", "Pataz", "Sánchez Carrión", "Santiago de Chuco", "Gran Chimú", "Virú"],
-    "Lambayeque": ["Chiclayo", "Ferreñafe", "Lambayeque"],
-    "Lima": ["Lima", "Barranca", "Cajatambo", "Canta", "Cañete", "Huaral", "Huarochirí", "Huaura", "Oyón", "Yauyos"],
-    "Loreto": ["Iquitos", "Alto Amazonas", "Loreto", "Mariscal Ramón Castilla", "Maynas", "Requena", "Ucayali", "Datem del Marañón", "Putumayo"],
-    "Madre de Dios": ["Puerto Maldonado", "Manu", "Tahuamanu", "Tambopata"],
-    "Moquegua": ["Moquegua", "General Sánchez Cerro", "Ilo", "Mariscal Nieto"],
-    "Pasco": ["Cerro de Pasco", "Daniel Alcides Carrión", "Oxapampa", "Pasco"],
-    "Piura": ["Piura", "Ayabaca", "Huancabamba", "Morropón", "Paita", "Sechura", "Sullana", "Talara"],
-    "Puno": ["Puno", "Azángaro", "Carabaya", "Chucuito", "El Collao", "Huancané", "Lampa", "Melgar", "Moho", "San Antonio de Putina", "San Román", "Sandia", "Yunguyo", "Juliaca", "Ayaviri", "Ilave", "Juli"],
-    "San Martín": ["Moyobamba", "Bellavista", "El Dorado", "Huallaga", "Lamas", "Mariscal Cáceres", "Picota", "Rioja", "San Martín", "Tocache", "Tarapoto"],
-    "Tacna": ["Tacna", "Candarave", "Jorge Basadre", "Tarata"],
-    "Tumbes": ["Tumbes", "Contralmirante Villar", "Zarumilla"],
-    "Ucayali": ["Pucallpa", "Atalaya", "Coronel Portillo", "Padre Abad", "Purús"],
-}
-
-# Cultivos y productos agrícolas
-cultivos = {
-    "papa": r"\bpapa[s]?\b",
-    "maíz": r"\bma[ií]z\b",
-    "quinua": r"\bquinua\b|\bquinoa\b",
-    "arroz": r"\barroz\b",
-    "trigo": r"\btrigo\b",
-    "cebada": r"\bcebada\b",
-    "haba": r"\bhaba[s]?\b",
-    "oca": r"\boca[s]?\b(?!\s+de\s+lobo)",
-    "olluco": r"\bolluco[s]?\b",
-    "café": r"\bcaf[eé]\b",
-    "cacao": r"\bcacao\b",
-    "caña de azúcar": r"\bca[ñn]a\s+de\s+az[uú]car\b",
-    "algodón": r"\balgod[oó]n\b",
-    "espárrago": r"\besp[aá]rrago[s]?\b",
-    "uva": r"\buva[s]?\b",
-    "palta": r"\bpalta[s]?\b|\baguacate[s]?\b",
-    "mango": r"\bmango[s]?\b",
-    "arándano": r"\bar[aá]ndano[s]?\b",
-    "cebolla": r"\bcebolla[s]?\b",
-    "ajo": r"\bajo[s]?\b(?!\s+de)",
-    "alpaca": r"\balpaca[s]?\b",
-    "ovino": r"\bovino[s]?\b|\boveja[s]?\b",
-    "vacuno": r"\bvacuno[s]?\b|\bvaca[s]?\b|\bganado\s+vacuno\b",
-    "llama": r"\bllama[s]?\b(?!\s+(la|el|al|a\s+la|de))",
-    "vicuña": r"\bvicu[ñn]a[s]?\b",
-}
-
-# Patrones de cifras de afectación
-cifras_patrones = {
-    "hectareas_afectadas": [
-        r"([\d.,]+)\s*(?:mil\s+)?hect[aá]reas?\s+(?:afectad|da[ñn]ad|destruid|perdid|arrasad)",
-        r"afect[oóa]\s+(?:a\s+)?([\d.,]+)\s*(?:mil\s+)?hect[aá]reas?",
-        r"(?:pérdida|da[ñn]o)\s+(?:de\s+)?([\d.,]+)\s*(?:mil\s+)?hect[aá]reas?",
-    ],
-    "fallecidos": [
-        r"([\d.,]+)\s+(?:muerto|fallecid|v[ií]ctima|persona).{0,20}(?:muert|fallec)",
-        r"(?:muert|fallec).{0,20}([\d.,]+)\s+persona",
-        r"(?:cobr[oó]|dej[oó]|caus[oó]).{0,20}([\d.,]+)\s+(?:muerto|fallecid|v[ií]ctima)",
-        r"(\d+)\s+muerto[s]?",
-        r"(\d+)\s+fallecido[s]?",
-    ],
-    "damnificados": [
-        r"([\d.,]+)\s*(?:mil\s+)?(?:damnificad|afectad)",
-        r"(?:damnific|afect).{0,15}([\d.,]+)\s*(?:mil\s+)?(?:persona|familia|habitante)",
-    ],
-    "viviendas": [
-        r"([\d.,]+)\s*(?:mil\s+)?vivienda[s]?\s+(?:afectad|da[ñn]ad|destruid|colapsad|derrumbad|inundad)",
-        r"(?:afect|da[ñn]|destru|colaps).{0,15}([\d.,]+)\s*(?:mil\s+)?vivienda",
-    ],
-    "familias": [
-        r"([\d.,]+)\s*(?:mil\s+)?familia[s]?\s+(?:afectad|damnificad)",
-    ],
-}
-
-# ── EXTRACCIÓN ────────────────────────────────────────────────
-print("\nExtrayendo entidades...")
-
-resultados = []
-
-for i, art in enumerate(articles):
-    texto = (art.get('title', '') + ' ' + art.get('cuerpo', '')).lower()
-    texto_original = art.get('title', '') + ' ' + art.get('cuerpo', '')
-    
-    registro = {
-        'url': art['url'],
-        'domain': art['domain'],
-        'fecha': art['fecha'],
-        'title': art.get('title', ''),
-        'temas': art.get('temas', []),
+import pyarrow as pa
+import pyarrow.parquet as pq
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from comun import almacen_entidades
+from comun.artefactos import ruta
+from comun.coocurrencia import matrices_entidades, coocurrencia
+from comun.diccionarios import regiones_peru
+from comun.entidades import (preparar, extraer_lote, patrones_plegados,
+                             construir_catalogo, TIPOS_CIFRA, TIPOS_ENTIDAD)
+from comun.gazetteer import cargar_distritos
+from comun.perfil_regex import exigir_patrones_seguros
+from comun.perfilado import etapa
+
+
+INPUT_FILE = ruta("cuerpos_normalizados")  # salida de 03a
+DISTRITOS_FILE = ruta("distritos")          # INEI, opcional
+DB_PATH = ruta("entidades_db")             # almacén indexado (upsert por URL)
+ruta("entidades_csv").parent.mkdir(parents=True, exist_ok=True)
+
+BATCH_SIZE = 2_000                         # artículos por lote (= row group)
+CHUNK_SIZE = 100                           # artículos por tarea del pool
+N_PROCESOS = int(os.environ.get("N_PROCESOS", os.cpu_count() or 1))
+
+COLUMNAS_ENTRADA = ['url', 'domain', 'fecha', 'title', 'temas', 'texto_norm', 'seg_norm', 'seg_orig']
+COLUMNAS_LISTA = ['temas', 'regiones', 'provincias', 'distritos', 'cultivos']
+
+SCHEMA = pa.schema(
+    [
+        ("url_id", pa.int32()),
+        ("url", pa.string()),
+        ("domain", pa.string()),
+        ("fecha", pa.string()),
+        ("title", pa.string()),
+    ]
+    + [(c, pa.list_(pa.string())) for c in COLUMNAS_LISTA]
+    + [(t, pa.int64()) for t in TIPOS_CIFRA]
+)
+
+SCHEMA_CIFRAS = pa.schema([
+    ("url", pa.string()),
+    ("tipo", pa.string()),
+    ("valor", pa.float64()),
+    ("unidad", pa.string()),
+    ("numero", pa.string()),
+    ("mil", pa.bool_()),
+    ("evidencia", pa.string()),
+    ("inicio", pa.int32()),
+    ("fin", pa.int32()),
+    ("inicio_norm", pa.int32()),
+    ("fin_norm", pa.int32()),
+])
+
+SCHEMA_MENCIONES = pa.schema([
+    ("url_id", pa.int32()),        # fila en entidades_extraidas.parquet
+    ("tipo", pa.uint8()),          # posición en TIPOS_ENTIDAD
+    ("entidad_id", pa.int32()),    # fila en entidades_catalogo.parquet
+    ("inicio", pa.int32()),        # offsets en el texto original (título + '\n' + cuerpo)
+    ("fin", pa.int32()),
+    ("superficie_id", pa.int32()), # fila en menciones_superficies.parquet
+])
+
+def leer_lotes(path):
+    """Lotes de artículos normalizados, sin cargar el archivo completo."""
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE, columns=COLUMNAS_ENTRADA):
+        yield batch.to_pylist()
+
+def partir(lote, n):
+    return [lote[i:i + n] for i in range(0, len(lote), n)]
+
+def tabla_menciones(registros, superficies):
+    """Tabla larga de menciones de un lote; `superficies` {texto: id} se va ampliando."""
+    cols = {nombre: [] for nombre in SCHEMA_MENCIONES.names}
+    for r in registros:
+        for tipo, entidad_id, inicio, fin, superficie in r.pop('menciones'):
+            cols['url_id'].append(r['url_id'])
+            cols['tipo'].append(tipo)
+            cols['entidad_id'].append(entidad_id)
+            cols['inicio'].append(inicio)
+            cols['fin'].append(fin)
+            cols['superficie_id'].append(superficies.setdefault(superficie, len(superficies)))
+    return pa.table(cols, schema=SCHEMA_MENCIONES)
+
+def ranking(menciones, catalogo, tipo):
+    """Artículos por entidad de un tipo, de mayor a menor (group-by sobre enteros)."""
+    m = menciones[menciones['tipo'] == TIPOS_ENTIDAD.index(tipo)]
+    n = m.drop_duplicates(['url_id', 'entidad_id'])['entidad_id'].value_counts()
+    return n.set_axis(catalogo['etiqueta'].to_numpy()[n.index.to_numpy()])
+
+def acumular(stats, registros):
+    """Actualiza los conteos de cobertura con un lote de registros."""
+    for r in registros:
+        stats['total'] += 1
+        stats['con_region'] += bool(r['regiones'])
+        stats['con_provincia'] += bool(r['provincias'])
+        stats['con_cultivo'] += bool(r['cultivos'])
+        stats['con_cifra'] += any(r[t] is not None for t in TIPOS_CIFRA)
+
+def a_csv(registros):
+    """Listas a strings separados por '|' para el CSV de revisión."""
+    df = pd.DataFrame(registros, columns=SCHEMA.names)
+    for col in COLUMNAS_LISTA:
+        df[col] = df[col].apply(lambda x: '|'.join(x))
+    return df.astype({t: "Int64" for t in TIPOS_CIFRA})
+
+def main():
+    print("=" * 70)
+    print("  EXTRACCIÓN DE ENTIDADES DESDE CUERPOS COMPLETOS")
+    print("=" * 70)
+
+    n_articulos = pq.ParquetFile(INPUT_FILE).metadata.num_rows
+    print(f"Artículos a procesar: {n_articulos:,} | procesos: {N_PROCESOS} | lote: {BATCH_SIZE:,}")
+
+    # Diccionarios de extracción (regiones_peru, cultivos, cifras_patrones):
+    # ver scripts/comun/diccionarios.py
+
+    # Gazetteer de lugares: regiones + provincias + distritos INEI si existen
+    distritos = cargar_distritos(DISTRITOS_FILE, regiones_peru) if DISTRITOS_FILE.exists() else []
+    print(f"Gazetteer: {len(regiones_peru)} regiones, {sum(map(len, regiones_peru.values()))} provincias, {len(distritos)} distritos")
+
+    # Guarda de backtracking antes de recorrer los cuerpos
+    exigir_patrones_seguros(patrones_plegados())
+
+    # ── EXTRACCIÓN ────────────────────────────────────────────
+    print("\nExtrayendo entidades...")
+
+    csv_path = ruta("entidades_csv")
+    parquet_path = ruta("entidades")
+    spans_path = ruta("cifras_spans")
+    menciones_path = ruta("menciones")
+    n_spans = 0
+    n_menciones = 0
+    superficies = {}
+    n_db = [0, 0, 0]   # insertados, actualizados, sin cambios
+    con = almacen_entidades.abrir(DB_PATH, TIPOS_CIFRA)
+    stats = {
+        'total': 0, 'con_region': 0, 'con_provincia': 0, 'con_cultivo': 0, 'con_cifra': 0,
     }
-    
-    # 1. Detectar regiones y provincias
-    regiones_encontradas = []
-    provincias_encontradas = []
-    
-    for region, provincias in regiones_peru.items():
-        # Buscar región
-        patron_reg = re.compile(r'\b' + re.escape(region.lower()) + r'\b')
-        if patron_reg.search(texto):
-            regiones_encontradas.append(region)
-        
-        # Buscar provincias/distritos
-        for prov in provincias:
-            if len(prov) > 3:  # evitar matches cortos
-                patron_prov = re.compile(r'\b' + re.escape(prov.lower()) + r'\b')
-                if patron_prov.search(texto):
-                    provincias_encontradas.append(f"{prov} ({region})")
-    
-    registro['regiones'] = list(set(regiones_encontradas))
-    registro['provincias'] = list(set(provincias_encontradas))
-    
-    # 2. Detectar cultivos
-    cultivos_encontrados = []
-    for cultivo, patron in cultivos.items():
-        if re.search(patron, texto):
-            cultivos_encontrados.append(cultivo)
-    registro['cultivos'] = cultivos_encontrados
-    
-    # 3. Extraer cifras
-    for tipo_cifra, patrones in cifras_patrones.items():
-        valores = []
-        for patron in patrones:
-            matches = re.findall(patron, texto, re.IGNORECASE)
-            for m in matches:
-                try:
-                    num = m.replace(',', '').replace('.', '')
-                    val = int(num)
-                    if val > 0 and val < 10000000:
-                        valores.append(val)
-                except:
-                    pass
-        registro[tipo_cifra] = max(valores) if valores else None
-    
-    resultados.append(registro)
-    
-    if (i + 1) % 500 == 0:
-        print(f"  Procesados: {i+1}/{len(articles)}")
-
-df_ent = pd.DataFrame(resultados)
-print(f"\nExtracción completada: {len(df_ent)} artículos procesados")
-
-# ── ESTADÍSTICAS ──────────────────────────────────────────────
-print("\n" + "=" * 70)
-print("ESTADÍSTICAS DE EXTRACCIÓN")
-print("=" * 70)
-
-# Regiones
-print("\n── Regiones mencionadas ──")
-all_regiones = Counter()
-for regs in df_ent['regiones']:
-    for r in regs:
-        all_regiones[r] += 1
-for reg, n in all_regiones.most_common(25):
-    bar = "█" * (n // 20)
-    print(f"  {reg:20s} {n:5d} {bar}")
-
-# Provincias/distritos
-print("\n── Top 30 provincias/distritos mencionados ──")
-all_prov = Counter()
-for provs in df_ent['provincias']:
-    for p in provs:
-        all_prov[p] += 1
-for prov, n in all_prov.most_common(30):
-    print(f"  {prov:40s} {n:5d}")
-
-# Cultivos
-print("\n── Cultivos/productos mencionados ──")
-all_cultivos = Counter()
-for cults in df_ent['cultivos']:
-    for c in cults:
-        all_cultivos[c] += 1
-for cult, n in all_cultivos.most_common():
-    if n > 5:
-        bar = "█" * (n // 10)
-        print(f"  {cult:20s} {n:5d} {bar}")
-
-# Cifras de afectación
-print("\n── Artículos con cifras de afectación ──")
-for tipo in ['hectareas_afectadas', 'fallecidos', 'damnificados', 'viviendas', 'familias']:
-    n = df_ent[tipo].notna().sum()
-    if n > 0:
-        vals = df_ent[tipo].dropna()
-        print(f"  {tipo:25s} {n:5d} artículos | mediana: {vals.median():.0f} | máx: {vals.max():.0f}")
-
-# Artículos con al menos una entidad
-tiene_region = df_ent['regiones'].apply(len) > 0
-tiene_provincia = df_ent['provincias'].apply(len) > 0
-tiene_cultivo = df_ent['cultivos'].apply(len) > 0
-tiene_cifra = df_ent[['hectareas_afectadas', 'fallecidos', 'damnificados', 'viviendas', 'familias']].notna().any(axis=1)
-
-print(f"\n── Cobertura de extracción ──")
-print(f"  Con región:     {tiene_region.sum():,} ({tiene_region.mean()*100:.1f}%)")
-print(f"  Con provincia:  {tiene_provincia.sum():,} ({tiene_provincia.mean()*100:.1f}%)")
-print(f"  Con cultivo:    {tiene_cultivo.sum():,} ({tiene_cultivo.mean()*100:.1f}%)")
-print(f"  Con cifra:      {tiene_cifra.sum():,} ({tiene_cifra.mean()*100:.1f}%)")
-
-# ── Cruce: regiones × temas ──────────────────────────────────
-print("\n── Top combinaciones región × tema ──")
-combos = Counter()
-for _, row in df_ent.iterrows():
-    for reg in row['regiones']:
-        for tema in row['temas']:
-            combos[(reg, tema)] += 1
-for (reg, tema), n in combos.most_common(20):
-    print(f"  {reg:15s} × {tema:30s} {n:4d}")
-
-# ── Cruce: cultivos × temas ──────────────────────────────────
-print("\n── Top combinaciones cultivo × tema ──")
-combos_cult = Counter()
-for _, row in df_ent.iterrows():
-    for cult in row['cultivos']:
-        for tema in row['temas']:
-            combos_cult[(cult, tema)] += 1
-for (cult, tema), n in combos_cult.most_common(15):
-    print(f"  {cult:15s} × {tema:30s} {n:4d}")
-
-# ── GUARDAR ───────────────────────────────────────────────────
-print("\n" + "=" * 70)
-print("GUARDANDO RESULTADOS")
-print("=" * 70)
-
-# Convertir listas a strings para CSV
-df_export = df_ent.copy()
-df_export['regiones'] = df_export['regiones'].apply(lambda x: '|'.join(x))
-df_export['provincias'] = df_export['provincias'].apply(lambda x: '|'.join(x))
-df_export['cultivos'] = df_export['cultivos'].apply(lambda x: '|'.join(x))
-df_export['temas'] = df_export['temas'].apply(lambda x: '|'.join(x))
-
-# CSV para revisión
-csv_path = OUTPUT_DIR / "entidades_extraidas.csv"
-df_export.to_csv(csv_path, index=False, encoding="utf-8-sig")
-print(f"Guardado: {csv_path}")
-
-# Parquet para análisis
-parquet_path = STAGING_DIR / "entidades_extraidas.parquet"
-df_ent.to_parquet(parquet_path, index=False)
-print(f"Guardado: {parquet_path}")
-
-# JSON resumen
-resumen = {
-    "total_articulos": len(df_ent),
-    "con_region": int(tiene_region.sum()),
-    "con_provincia": int(tiene_provincia.sum()),
-    "con_cultivo": int(tiene_cultivo.sum()),
-    "con_cifra": int(tiene_cifra.sum()),
-    "top_regiones": dict(all_regiones.most_common(10)),
-    "top_provincias": dict(all_prov.most_common(10)),
-    "top_cultivos": dict(all_cultivos.most_common(10)),
-}
-resumen_path = OUTPUT_DIR / "resumen_entidades.json"
-with open(resumen_path, "w", encoding="utf-8") as f:
-    json.dump(resumen, f, ensure_ascii=False, indent=2)
-print(f"Guardado: {resumen_path}")
-
-print("\nScript completado.")
+
+    with etapa("extraccion"), \
+            ProcessPoolExecutor(max_workers=N_PROCESOS, initializer=preparar,
+                                initargs=(distritos,)) as pool, \
+            pq.ParquetWriter(parquet_path, SCHEMA) as writer, \
+            pq.ParquetWriter(spans_path, SCHEMA_CIFRAS) as writer_cifras, \
+            pq.ParquetWriter(menciones_path, SCHEMA_MENCIONES, compression="zstd") as writer_menciones:
+        for n_lote, lote in enumerate(leer_lotes(INPUT_FILE)):
+            registros = [r for parte in pool.map(extraer_lote, partir(lote, CHUNK_SIZE)) for r in parte]
+            for i, r in enumerate(registros):
+                r['url_id'] = stats['total'] + i
+            spans = [{'url': r['url'], **c} for r in registros for c in r.pop('cifras')]
+            n_spans += len(spans)
+            menciones = tabla_menciones(registros, superficies)
+            n_menciones += menciones.num_rows
+
+            writer.write_table(pa.Table.from_pylist(registros, schema=SCHEMA))
+            writer_cifras.write_table(pa.Table.from_pylist(spans, schema=SCHEMA_CIFRAS))
+            writer_menciones.write_table(menciones)
+            n_db = [a + b for a, b in zip(n_db, almacen_entidades.guardar_lote(con, registros, spans, TIPOS_CIFRA))]
+            a_csv(registros).to_csv(csv_path, index=False, mode="w" if n_lote == 0 else "a",
+                                    header=n_lote == 0, encoding="utf-8-sig" if n_lote == 0 else "utf-8")
+            acumular(stats, registros)
+            print(f"  Procesados: {stats['total']:,}/{n_articulos:,}")
+
+    print(f"\nExtracción completada: {stats['total']} artículos procesados")
+    print(f"Guardado: {parquet_path}")
+    print(f"Guardado: {csv_path}")
+    print(f"Guardado: {spans_path} ({n_spans:,} spans de cifras)")
+
+    # Catálogos de la tabla de menciones
+    catalogo = pd.DataFrame(construir_catalogo(distritos), columns=['tipo', 'nombre', 'region'])
+    catalogo.insert(0, 'entidad_id', np.arange(len(catalogo), dtype=np.int32))
+    catalogo['etiqueta'] = catalogo['nombre'].where(
+        catalogo['tipo'].isin(['region', 'cultivo']), catalogo['nombre'] + ' (' + catalogo['region'] + ')')
+    catalogo.to_parquet(ruta("entidades_catalogo"), index=False)
+    pd.DataFrame({'superficie_id': np.arange(len(superficies), dtype=np.int32),
+                  'superficie': list(superficies)}).to_parquet(ruta("menciones_superficies"), index=False)
+    print(f"Guardado: {menciones_path} ({n_menciones:,} menciones, {len(superficies):,} superficies distintas)")
+    con.close()
+    print(f"Almacén: {DB_PATH} ({n_db[0]:,} nuevos, {n_db[1]:,} actualizados, {n_db[2]:,} sin cambios)")
+
+    # ── ESTADÍSTICAS ──────────────────────────────────────────
+    print("\n" + "=" * 70)
+    print("ESTADÍSTICAS DE EXTRACCIÓN")
+    print("=" * 70)
+
+    menciones = pd.read_parquet(menciones_path, columns=['url_id', 'tipo', 'entidad_id'])
+    top_regiones = ranking(menciones, catalogo, 'region')
+    top_provincias = ranking(menciones, catalogo, 'provincia')
+    top_cultivos = ranking(menciones, catalogo, 'cultivo')
+
+    # Regiones
+    print("\n── Regiones mencionadas ──")
+    for reg, n in top_regiones.head(25).items():
+        bar = "█" * (n // 20)
+        print(f"  {reg:20s} {n:5d} {bar}")
+
+    # Provincias/distritos
+    print("\n── Top 30 provincias/distritos mencionados ──")
+    for prov, n in top_provincias.head(30).items():
+        print(f"  {prov:40s} {n:5d}")
+
+    # Cultivos
+    print("\n── Cultivos/productos mencionados ──")
+    for cult, n in top_cultivos.items():
+        if n > 5:
+            bar = "█" * (n // 10)
+            print(f"  {cult:20s} {n:5d} {bar}")
+
+    # Cifras de afectación (solo columnas numéricas, releídas del Parquet)
+    print("\n── Artículos con cifras de afectación ──")
+    df_cifras = pd.read_parquet(parquet_path, columns=TIPOS_CIFRA)
+    for tipo in TIPOS_CIFRA:
+        vals = df_cifras[tipo].dropna()
+        if len(vals) > 0:
+            print(f"  {tipo:25s} {len(vals):5d} artículos | mediana: {vals.median():.0f} | máx: {vals.max():.0f}")
+
+    total = max(stats['total'], 1)
+    print(f"\n── Cobertura de extracción ──")
+    print(f"  Con región:     {stats['con_region']:,} ({stats['con_region']/total*100:.1f}%)")
+    print(f"  Con provincia:  {stats['con_provincia']:,} ({stats['con_provincia']/total*100:.1f}%)")
+    print(f"  Con cultivo:    {stats['con_cultivo']:,} ({stats['con_cultivo']/total*100:.1f}%)")
+    print(f"  Con cifra:      {stats['con_cifra']:,} ({stats['con_cifra']/total*100:.1f}%)")
+
+    # ── Cruces (matrices dispersas, ver comun/coocurrencia.py) ─
+    df_listas = pd.read_parquet(parquet_path, columns=['fecha', 'regiones', 'provincias', 'cultivos', 'temas'])
+    dims = matrices_entidades(df_listas)
+
+    print("\n── Top combinaciones región × tema ──")
+    region_tema = coocurrencia({'region': dims['regiones'], 'tema': dims['temas']})
+    for reg, tema, n in region_tema.head(20).itertuples(index=False):
+        print(f"  {reg:15s} × {tema:30s} {n:4d}")
+
+    print("\n── Top combinaciones cultivo × tema ──")
+    cultivo_tema = coocurrencia({'cultivo': dims['cultivos'], 'tema': dims['temas']})
+    for cult, tema, n in cultivo_tema.head(15).itertuples(index=False):
+        print(f"  {cult:15s} × {tema:30s} {n:4d}")
+
+    print("\n── Top combinaciones región × tema × cultivo ──")
+    region_tema_cultivo = coocurrencia({'region': dims['regiones'], 'tema': dims['temas'], 'cultivo': dims['cultivos']})
+    for reg, tema, cult, n in region_tema_cultivo.head(15).itertuples(index=False):
+        print(f"  {reg:15s} × {tema:30s} × {cult:15s} {n:4d}")
+
+    # Tabla mensual para series por región/tema/cultivo
+    cruce_mensual = coocurrencia({'mes': dims['mes'], 'region': dims['regiones'],
+                                  'tema': dims['temas'], 'cultivo': dims['cultivos']})
+    cruce_path = ruta("coocurrencia_mensual")
+    cruce_mensual.sort_values(['mes', 'n'], ascending=[True, False]).to_csv(
+        cruce_path, index=False, encoding="utf-8-sig")
+    print(f"\nGuardado: {cruce_path}")
+
+    # ── GUARDAR RESUMEN ───────────────────────────────────────
+    print("\n" + "=" * 70)
+    print("GUARDANDO RESUMEN")
+    print("=" * 70)
+
+    resumen = {
+        "total_articulos": stats['total'],
+        "con_region": stats['con_region'],
+        "con_provincia": stats['con_provincia'],
+        "con_cultivo": stats['con_cultivo'],
+        "con_cifra": stats['con_cifra'],
+        "top_regiones": {k: int(v) for k, v in top_regiones.head(10).items()},
+        "top_provincias": {k: int(v) for k, v in top_provincias.head(10).items()},
+        "top_cultivos": {k: int(v) for k, v in top_cultivos.head(10).items()},
+    }
+    resumen_path = ruta("resumen_entidades")
+    with open(resumen_path, "w", encoding="utf-8") as f:
+        json.dump(resumen, f, ensure_ascii=False, indent=2)
+    print(f"Guardado: {resumen_path}")
+
+    print("\nScript completado.")
+
+if __name__ == "__main__":
+    with etapa("04_extraer_entidades"):
+        main()
@@ -0,0 +1,123 @@
+"""
+05_cargar_datos_duros.py
+Carga las exportaciones de datos duros dejadas en data/external/:
+    data/external/desinventar/   DesInventar Perú (CSV / Excel)
+    data/external/emdat/         EM-DAT (Excel / CSV; se filtra a Perú)
+    data/external/indeci/        INDECI — SINPAD, emergencias y daños
+y las normaliza a un esquema común de eventos (ver comun/datos_duros.py):
+ubigeo, región, fechas, amenaza → tema de 02 y cifras de daños.
+
+Carga incremental: cada archivo fuente se normaliza por separado a
+data/staging/datos_duros_fuentes/ y solo se vuelve a leer si cambió su
+contenido (huella blake2b; tamaño y mtime evitan releer los que no se
+tocaron). Al final se reescribe el dataset particionado eventos_duros.
+"""
+
+import json
+import shutil
+import time
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+from pathlib import Path
+
+from comun.artefactos import ruta, EXTERNAL_DIR
+from comun.datos_duros import (FUENTES, EXTENSIONES, leer_exportacion, normalizar_eventos,
+                               escribir_eventos)
+from comun.perfilado import etapa
+from comun.pipeline import huella_archivo
+
+# ── Configuración ──────────────────────────────────────────────
+LOG_DIR = Path("data/logs")
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+CACHE_DIR = ruta("eventos_fuentes")         # un Parquet normalizado por archivo fuente
+MANIFIESTO = CACHE_DIR / "_manifiesto.json"
+
+TODAY = datetime.today().strftime("%Y%m%d")
+LOG_PATH = LOG_DIR / f"datos_duros_{TODAY}.log"
+
+def log(msg):
+    ts = datetime.now().strftime("%H:%M:%S")
+    line = f"[{ts}] {msg}"
+    print(line)
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+def cargar_manifiesto():
+    if MANIFIESTO.exists():
+        return json.loads(MANIFIESTO.read_text(encoding="utf-8"))
+    return {"huellas": {}, "cargados": {}}
+
+def guardar_manifiesto(manifiesto):
+    MANIFIESTO.write_text(json.dumps(manifiesto, ensure_ascii=False, indent=1), encoding="utf-8")
+
+def cache_de(fuente, path):
+    return CACHE_DIR / f"{fuente}__{path.name}.parquet"
+
+def main():
+    log("=" * 70)
+    log("CARGA DE DATOS DUROS (DesInventar, EM-DAT, INDECI)")
+    log("=" * 70)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    manifiesto = cargar_manifiesto()
+    vigentes = set()
+    cambios = 0
+
+    for fuente, spec in FUENTES.items():
+        directorio = EXTERNAL_DIR / fuente
+        archivos = sorted(p for p in directorio.glob("*") if p.suffix.lower() in EXTENSIONES) \
+            if directorio.is_dir() else []
+        log(f"\n── {fuente}: {len(archivos)} archivo(s) en {directorio}")
+
+        for path in archivos:
+            destino = cache_de(fuente, path)
+            vigentes.add(destino.name)
+            huella = huella_archivo(path, manifiesto["huellas"])
+            if manifiesto["cargados"].get(destino.name) == huella and destino.exists():
+                log(f"  {path.name}: sin cambios")
+                continue
+
+            t0 = time.perf_counter()
+            tabla = normalizar_eventos(leer_exportacion(path, spec), fuente, path.name)
+            pq.write_table(tabla, destino)
+            manifiesto["cargados"][destino.name] = huella
+            cambios += 1
+            sin_tema = tabla.column("tema").null_count
+            log(f"  {path.name}: {tabla.num_rows:,} eventos ({sin_tema:,} sin tema) "
+                f"en {time.perf_counter() - t0:.1f}s")
+
+    # Archivos fuente que ya no están: se quitan sus eventos
+    for cache in CACHE_DIR.glob("*.parquet"):
+        if cache.name not in vigentes:
+            cache.unlink()
+            manifiesto["cargados"].pop(cache.name, None)
+            cambios += 1
+            log(f"  Quitado {cache.name} (el archivo fuente ya no está)")
+    manifiesto["huellas"] = {k: v for k, v in manifiesto["huellas"].items() if Path(k).exists()}
+    guardar_manifiesto(manifiesto)
+
+    salida = ruta("eventos_duros")
+    if not cambios and salida.is_dir():
+        log("\nSin cambios en las fuentes: eventos_duros al día.")
+        return
+    caches = sorted(CACHE_DIR.glob("*.parquet"))
+    if salida.is_dir():
+        shutil.rmtree(salida)
+    if not caches:
+        log("\nSin archivos fuente: no hay eventos que cargar.")
+        return
+
+    eventos = pa.concat_tables(pq.read_table(c) for c in caches)
+    escribir_eventos(eventos)
+    df = eventos.select(["fuente", "region", "tema", "fecha_inicio"]).to_pandas()
+    log(f"\nGuardado: {salida} ({len(df):,} eventos)")
+    log(f"Rango de fechas: {df['fecha_inicio'].min()} → {df['fecha_inicio'].max()}")
+    log(f"\nPor fuente:\n{df['fuente'].value_counts().to_string()}")
+    log(f"\nPor tema:\n{df['tema'].value_counts(dropna=False).to_string()}")
+    log(f"\nTop 15 regiones:\n{df['region'].value_counts(dropna=False).head(15).to_string()}")
+
+if __name__ == "__main__":
+    with etapa("05_cargar_datos_duros"):
+        main()
@@ -0,0 +1,181 @@
+"""
+06_cruce_analisis.py
+Cruce de la cobertura de prensa (02) con los eventos de datos duros (05).
+
+1. Correlación cruzada con rezagos: cada serie de cobertura tema × región
+   (cuota de artículos del periodo) contra cada serie de datos duros
+   tema × región (número de eventos y afectados por periodo de inicio), en
+   rezagos -MAX_REZAGO..MAX_REZAGO, con significancia por bootstrap de
+   bloques (ver comun/correlacion.py). Región "Nacional" = todo el país.
+2. Cobertura por evento: artículos de la región y tema de cada evento en su
+   ventana [inicio - 7 días, fin + 30 días] (ver comun/ventanas.py).
+
+Salidas:
+    outputs/tables/correlacion_rezagos.parquet   tabla tidy de pares × rezagos
+    outputs/tables/cobertura_eventos.parquet     eventos con métricas de cobertura
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+
+from comun.artefactos import DATASETS, ruta
+from comun.compacto import bandera
+from comun.correlacion import matriz_rezagos
+from comun.datos_duros import leer_eventos
+from comun.diccionarios import temas, regiones
+from comun.perfilado import etapa
+from comun.series import cobertura_peruana, con_titulo
+from comun.staging import leer_staging, filtro_idioma
+from comun.ventanas import cobertura_eventos, METRICAS
+
+# ── Configuración ──────────────────────────────────────────────
+LOG_DIR = Path("data/logs")
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+IDIOMA = "Spanish"
+FRECUENCIA = "M"          # periodo de las series ("M" mensual, "W-MON" semanal)
+MAX_REZAGO = 6            # periodos hacia cada lado
+REPLICAS = 199            # réplicas del bootstrap de bloques (0 = sin p-valores)
+MIN_ARTICULOS = 20        # series de cobertura con menos artículos se descartan
+MIN_EVENTOS = 5           # idem para series de datos duros
+NACIONAL = "Nacional"
+VENTANA_ANTES, VENTANA_DESPUES = 7, 30
+
+TODAY = datetime.today().strftime("%Y%m%d")
+LOG_PATH = LOG_DIR / f"cruce_analisis_{TODAY}.log"
+
+def log(msg):
+    ts = datetime.now().strftime("%H:%M:%S")
+    line = f"[{ts}] {msg}"
+    print(line)
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+def codigos_periodo(fechas, inicio, n_periodos):
+    """Fechas → índice del periodo en [0, n_periodos); -1 fuera de rango o nulas."""
+    ordinales = pd.to_datetime(fechas).dt.to_period(FRECUENCIA).array.asi8
+    codigos = ordinales - inicio.ordinal
+    return np.where((codigos >= 0) & (codigos < n_periodos) & (ordinales != np.iinfo(np.int64).min),
+                    codigos, -1)
+
+def contar(codigos, n_periodos, pesos=None):
+    """np.bincount por periodo ignorando los códigos -1."""
+    dentro = codigos >= 0
+    return np.bincount(codigos[dentro], weights=None if pesos is None else pesos[dentro],
+                       minlength=n_periodos)
+
+def series_cobertura(articulos, inicio, n_periodos):
+    """Matriz (tema × región) × periodo con la cuota de artículos del periodo."""
+    nombres_temas, nombres_regiones = list(temas), list(regiones)
+    codigos = codigos_periodo(articulos["fecha"], inicio, n_periodos)
+    total = contar(codigos, n_periodos)
+    total = np.where(total > 0, total, np.nan)
+    mascaras_region = {r: bandera(articulos["regiones_bits"], nombres_regiones, r)
+                       for r in nombres_regiones}
+
+    filas, etiquetas = [], []
+    for tema in nombres_temas:
+        en_tema = bandera(articulos["temas_bits"], nombres_temas, tema)
+        candidatas = [(NACIONAL, en_tema)] + [(r, en_tema & m) for r, m in mascaras_region.items()]
+        for region, mascara in candidatas:
+            n = contar(codigos[mascara], n_periodos)
+            if n.sum() >= MIN_ARTICULOS:
+                filas.append(n / total)
+                etiquetas.append((tema, region))
+    return np.array(filas).reshape(len(filas), n_periodos), etiquetas
+
+def series_eventos(eventos, inicio, n_periodos):
+    """Matriz (tema × región × métrica) × periodo: eventos y afectados por periodo de inicio."""
+    eventos = eventos.dropna(subset=["tema"])
+    codigos = codigos_periodo(eventos["fecha_inicio"], inicio, n_periodos)
+    afectados = eventos["afectados"].fillna(0).to_numpy(dtype=np.float64)
+    region = eventos["region"].to_numpy(dtype=object)
+    tema = eventos["tema"].to_numpy(dtype=object)
+
+    filas, etiquetas = [], []
+    for t in sorted(set(tema)):
+        en_tema = tema == t
+        candidatas = [(NACIONAL, en_tema)] + [(r, en_tema & (region == r))
+                                              for r in sorted({r for r in region[en_tema] if isinstance(r, str)})]
+        for r, mascara in candidatas:
+            if (codigos[mascara] >= 0).sum() < MIN_EVENTOS:
+                continue
+            filas.append(contar(codigos[mascara], n_periodos))
+            etiquetas.append((t, r, "n_eventos"))
+            filas.append(contar(codigos[mascara], n_periodos, afectados[mascara]))
+            etiquetas.append((t, r, "afectados"))
+    return np.array(filas).reshape(len(filas), n_periodos), etiquetas
+
+def main():
+    log("=" * 70)
+    log("CRUCE COBERTURA × DATOS DUROS")
+    log("=" * 70)
+
+    articulos = leer_staging(DATASETS["corpus_temas"],
+                             columnas=["fecha", "temas_bits", "regiones_bits", "_plan", "title_origen"],
+                             filtro=filtro_idioma(IDIOMA))
+    articulos = articulos[cobertura_peruana(articulos) & con_titulo(articulos)].dropna(subset=["fecha"])
+    eventos = leer_eventos(columnas=["fuente", "id_evento", "region", "tema", "amenaza",
+                                     "fecha_inicio", "fecha_fin", "fallecidos", "afectados"])
+    eventos = eventos.dropna(subset=["fecha_inicio"])
+    log(f"Artículos: {len(articulos):,} — eventos: {len(eventos):,}")
+    if articulos.empty or eventos.empty:
+        log("Sin artículos o sin eventos: nada que cruzar.")
+        return
+
+    # ── Cobertura por evento ───────────────────────────────────
+    t0 = time.perf_counter()
+    por_evento = cobertura_eventos(
+        eventos.rename(columns={"fecha_inicio": "inicio", "fecha_fin": "fin"}),
+        articulos, list(regiones), list(temas), VENTANA_ANTES, VENTANA_DESPUES)
+    por_evento.to_parquet(ruta("cobertura_eventos"), index=False)
+    sin_cobertura = (por_evento["n_articulos"] == 0).mean()
+    log(f"\nCobertura por evento ({time.perf_counter() - t0:.1f}s): "
+        f"{sin_cobertura:.0%} de los eventos sin artículos en su ventana")
+    log(por_evento.groupby("tema")[METRICAS[:1] + ["cuota"]].median().to_string())
+    log(f"Guardado: {ruta('cobertura_eventos')}")
+
+    # ── Series por periodo (rango común a prensa y eventos) ────
+    inicio = max(articulos["fecha"].min(), eventos["fecha_inicio"].min())
+    fin = min(articulos["fecha"].max(), eventos["fecha_inicio"].max())
+    periodos = pd.period_range(pd.Timestamp(inicio), pd.Timestamp(fin), freq=FRECUENCIA)
+    if len(periodos) < 2 * MAX_REZAGO + 3:
+        log(f"\nSolo {len(periodos)} periodos en común: muy pocos para correlacionar.")
+        return
+    x, etiquetas_x = series_cobertura(articulos, periodos[0], len(periodos))
+    y, etiquetas_y = series_eventos(eventos, periodos[0], len(periodos))
+    log(f"\nPeriodos: {periodos[0]} → {periodos[-1]} ({len(periodos)})")
+    log(f"Series de cobertura: {len(etiquetas_x)} — series de datos duros: {len(etiquetas_y)}")
+    if not etiquetas_x or not etiquetas_y:
+        log("Sin series suficientes para correlacionar.")
+        return
+
+    # ── Correlación cruzada con rezagos ────────────────────────
+    t0 = time.perf_counter()
+    tabla = matriz_rezagos(x, y, etiquetas_x, etiquetas_y, MAX_REZAGO, REPLICAS)
+    log(f"Correlación cruzada + {REPLICAS} réplicas: {time.perf_counter() - t0:.1f}s")
+
+    tabla[["tema_cobertura", "region_cobertura"]] = pd.DataFrame(tabla.pop("x").tolist())
+    tabla[["tema_evento", "region_evento", "metrica"]] = pd.DataFrame(tabla.pop("y").tolist())
+    tabla = tabla[["tema_cobertura", "region_cobertura", "tema_evento", "region_evento", "metrica",
+                   "rezago", "r", "p", "p_max", "n_periodos"]]
+    for col in ("tema_cobertura", "region_cobertura", "tema_evento", "region_evento", "metrica"):
+        tabla[col] = tabla[col].astype("category")
+    tabla.to_parquet(ruta("correlacion_rezagos"), index=False)
+    log(f"Guardado: {ruta('correlacion_rezagos')} ({len(tabla):,} filas)")
+
+    # Pares del mismo tema y región, mejor rezago de cada uno
+    mismo = tabla[(tabla["tema_cobertura"].astype(str) == tabla["tema_evento"].astype(str))
+                  & (tabla["region_cobertura"].astype(str) == tabla["region_evento"].astype(str))]
+    mejores = mismo.loc[mismo.groupby(["tema_evento", "region_evento", "metrica"], observed=True)["r"]
+                        .apply(lambda r: r.abs().idxmax())]
+    log(f"\nMismo tema y región, rezago de mayor |r| (p_max < 0.05: "
+        f"{(mejores['p_max'] < 0.05).sum()} de {len(mejores)}):")
+    log(mejores.sort_values("p_max").head(20).to_string(index=False))
+
+if __name__ == "__main__":
+    with etapa("06_cruce_analisis"):
+        main()
@@ -0,0 +1,114 @@
+"""
+buscar_texto.py
+Búsqueda de texto completo sobre títulos (02) y cuerpos (03) con el índice
+SQLite FTS5 de data/db/ (ver comun/indice_texto.py). Para la revisión
+manual de diccionarios: ¿cuántos artículos trae una palabra clave
+candidata, en qué meses y temas, y con qué contexto?
+
+Uso (desde la raíz del repo):
+    python scripts/buscar_texto.py actualizar
+    python scripts/buscar_texto.py '"estado de emergencia" AND helad*'
+    python scripts/buscar_texto.py 'title: friaje NOT alpaca*' --limite 50
+    python scripts/buscar_texto.py 'granizo*' --sin-tema    # lo que los diccionarios no captan
+    python scripts/buscar_texto.py actualizar --optimizar
+
+Se indexan todos los títulos en español, clasificados o no.
+
+Herramienta de ajuste de diccionarios. scripts/pipeline.py mantiene el
+índice al día con la etapa indexar_texto (función indexar()).
+"""
+
+import argparse
+import time
+
+from comun.artefactos import DATASETS, ruta
+from comun.compacto import decodificar
+from comun.diccionarios import temas
+from comun.indice_texto import (abrir, agregar_titulos, agregar_cuerpos, optimizar,
+                                buscar, contar, hits_por_mes, hits_por_tema)
+from comun.staging import leer_staging, ruta_dataset, filtro_idioma
+
+# ── Configuración ──────────────────────────────────────────────
+DB_PATH = ruta("indice_texto")
+CUERPOS_FILE = ruta("cuerpos")
+CORPUS = DATASETS["corpus_temas"]   # salida de 02
+IDIOMA = "Spanish"
+
+def actualizar(con, optimizar_indice=False):
+    """Carga incremental. El índice FTS se optimiza (fusión completa de
+    segmentos, costosa) solo en la primera carga o si se pide."""
+    nombres_temas = list(temas.keys())
+    t0 = time.perf_counter()
+    vacio = con.execute("SELECT count(*) FROM articulos").fetchone()[0] == 0
+
+    if ruta_dataset(CORPUS).exists():
+        df = leer_staging(CORPUS, columnas=['url', 'title', 'fecha', 'domain', 'temas_bits'],
+                          filtro=filtro_idioma(IDIOMA))
+        filas = (
+            {'url': u, 'title': t, 'fecha': f, 'domain': d, 'temas_bits': int(b),
+             'temas': decodificar(b, nombres_temas)}
+            for u, t, f, d, b in df[['url', 'title', 'fecha', 'domain', 'temas_bits']].itertuples(index=False)
+        )
+        print(f"Títulos nuevos o re-clasificados: {agregar_titulos(con, filas):,}")
+
+    if CUERPOS_FILE.exists():
+        print(f"Cuerpos nuevos o completados: {agregar_cuerpos(con, CUERPOS_FILE):,}")
+
+    if vacio or optimizar_indice:
+        optimizar(con)
+        print("Índice FTS optimizado.")
+    total = con.execute("SELECT count(*) FROM articulos").fetchone()[0]
+    print(f"Índice: {total:,} artículos en {DB_PATH} ({time.perf_counter() - t0:.1f}s)")
+
+def consultar(con, consulta, limite, sin_tema=False):
+    t0 = time.perf_counter()
+    n = contar(con, consulta, sin_tema)
+    por_mes = hits_por_mes(con, consulta, sin_tema)
+    por_tema = hits_por_tema(con, consulta)
+    resultados = buscar(con, consulta, limite, sin_tema=sin_tema)
+    ms = (time.perf_counter() - t0) * 1000
+
+    print("=" * 70)
+    print(f"  {consulta}{'  (sin tema)' if sin_tema else ''}  →  {n:,} artículos ({ms:.0f} ms)")
+    print("=" * 70)
+
+    print("\n── Por tema ──")
+    for tema, k in por_tema:
+        print(f"  {tema:30s} {k:6,}")
+
+    print("\n── Por mes ──")
+    for mes, k in por_mes:
+        bar = "█" * max(1, k * 40 // max(c for _, c in por_mes))
+        print(f"  {mes or '(sin fecha)':10s} {k:6,} {bar}")
+
+    print(f"\n── Top {limite} por relevancia ──")
+    for r in resultados:
+        print(f"\n  {r['fecha']}  {r['domain']}  {r['url']}")
+        print(f"  {r['title']}")
+        print(f"    {r['snippet']}")
+
+def indexar():
+    """Etapa del pipeline: actualiza el índice de forma incremental."""
+    con = abrir(DB_PATH)
+    actualizar(con)
+    con.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Búsqueda de texto completo en títulos y cuerpos")
+    parser.add_argument("consulta", help="'actualizar' o una consulta FTS5 (frases entre comillas, prefijos con *)")
+    parser.add_argument("--limite", type=int, default=20, help="número de snippets a mostrar")
+    parser.add_argument("--sin-tema", action="store_true",
+                        help="solo artículos que los diccionarios no clasifican")
+    parser.add_argument("--optimizar", action="store_true",
+                        help="con 'actualizar': optimizar el índice FTS tras la carga")
+    args = parser.parse_args()
+
+    con = abrir(DB_PATH)
+    if args.consulta == "actualizar":
+        actualizar(con, args.optimizar)
+    else:
+        consultar(con, args.consulta, args.limite, args.sin_tema)
+    con.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+comun
+Código compartido por los scripts del pipeline (diccionarios, detectores).
+Los scripts se ejecutan desde la raíz del repo (`python scripts/XX.py`),
+por lo que `scripts/` queda en sys.path y basta `from comun... import ...`.
+"""
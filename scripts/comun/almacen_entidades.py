@@ -0,0 +1,189 @@
+"""
+almacen_entidades.py
+Almacén SQLite de las entidades extraídas por 04, indexado para consultas
+ad hoc sin cargar todo en pandas («Puno × heladas en 2022 con damnificados»).
+
+Tablas:
+- articulos: una fila por URL con fecha, mes, medio, título, el máximo de
+  cada tipo de cifra y una huella del contenido (para saltar filas sin cambios)
+- menciones (articulo_id, tipo, valor, region): una fila por región,
+  provincia, distrito, cultivo o tema mencionado
+- cifras: spans de cifras de comun/cifras.py (tipo, valor, unidad, offsets)
+
+La carga es un upsert por URL: las filas nuevas se insertan, las que
+cambiaron reemplazan sus menciones y cifras, y las idénticas no se tocan.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+
+import pandas as pd
+
+TIPOS_MENCION = {
+    'regiones': 'region',
+    'provincias': 'provincia',
+    'distritos': 'distrito',
+    'cultivos': 'cultivo',
+    'temas': 'tema',
+}
+_CON_REGION = re.compile(r"^(.*) \((.*)\)$")   # 'Azángaro (Puno)'
+# Parámetros por sentencia en los IN (?, …): el tope de SQLite antes de 3.32
+# es 999 y un lote de 04 tiene 2.000 artículos
+MAX_PARAMETROS = 900
+
+
+def _esquema(tipos_cifra):
+    cifras = "".join(f",\n    {t} INTEGER" for t in tipos_cifra)
+    return f"""
+CREATE TABLE IF NOT EXISTS articulos (
+    id      INTEGER PRIMARY KEY,
+    url     TEXT NOT NULL UNIQUE,
+    fecha   TEXT,
+    mes     TEXT,
+    domain  TEXT,
+    title   TEXT,
+    huella  TEXT{cifras}
+);
+CREATE INDEX IF NOT EXISTS ix_articulos_fecha ON articulos (fecha);
+CREATE TABLE IF NOT EXISTS menciones (
+    articulo_id INTEGER NOT NULL REFERENCES articulos (id),
+    tipo        TEXT NOT NULL,
+    valor       TEXT NOT NULL,
+    region      TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_menciones_valor ON menciones (tipo, valor, articulo_id);
+CREATE INDEX IF NOT EXISTS ix_menciones_region ON menciones (region, tipo, articulo_id);
+CREATE INDEX IF NOT EXISTS ix_menciones_articulo ON menciones (articulo_id);
+CREATE TABLE IF NOT EXISTS cifras (
+    articulo_id INTEGER NOT NULL REFERENCES articulos (id),
+    tipo        TEXT NOT NULL,
+    valor       REAL NOT NULL,
+    unidad      TEXT,
+    evidencia   TEXT,
+    inicio      INTEGER,
+    fin         INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_cifras_tipo ON cifras (tipo, valor);
+CREATE INDEX IF NOT EXISTS ix_cifras_articulo ON cifras (articulo_id);
+"""
+
+
+def abrir(path, tipos_cifra):
+    """Abre (y crea si hace falta) el almacén."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode = WAL")
+    con.execute("PRAGMA synchronous = NORMAL")
+    con.executescript(_esquema(tipos_cifra))
+    return con
+
+
+def _huella(registro, spans):
+    # url_id es la posición en la corrida de 04, no parte del contenido
+    registro = {k: v for k, v in registro.items() if k != 'url_id'}
+    contenido = json.dumps([registro, spans], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+
+
+def _menciones(articulo_id, registro):
+    filas = []
+    for col, tipo in TIPOS_MENCION.items():
+        for valor in registro.get(col) or []:
+            m = _CON_REGION.match(valor)
+            if m:
+                filas.append((articulo_id, tipo, m.group(1), m.group(2)))
+            else:
+                filas.append((articulo_id, tipo, valor, valor if tipo == 'region' else None))
+    return filas
+
+
+def _trozos(valores):
+    for i in range(0, len(valores), MAX_PARAMETROS):
+        yield valores[i:i + MAX_PARAMETROS]
+
+
+def _en(valores):
+    return f"({', '.join('?' * len(valores))})"
+
+
+def guardar_lote(con, registros, spans, tipos_cifra):
+    """Upsert por URL de un lote de registros de 04 y sus spans de cifras.
+
+    Devuelve (insertados, actualizados, sin_cambios).
+    """
+    spans_por_url = {}
+    for s in spans:
+        spans_por_url.setdefault(s['url'], []).append(s)
+
+    columnas = ['url', 'fecha', 'mes', 'domain', 'title', 'huella'] + list(tipos_cifra)
+    insertar = f"""
+        INSERT INTO articulos ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})
+        ON CONFLICT (url) DO UPDATE SET
+            {', '.join(f'{c} = excluded.{c}' for c in columnas[1:])}
+        RETURNING id
+    """
+    conteo = {'insertados': 0, 'actualizados': 0, 'sin_cambios': 0}
+    with con:
+        previas = {}
+        for urls in _trozos([r['url'] for r in registros]):
+            previas.update(con.execute(f"SELECT url, huella FROM articulos WHERE url IN {_en(urls)}", urls))
+
+        nuevas = []   # (articulo_id, registro, spans) a (re)escribir
+        for r in registros:
+            sp = spans_por_url.get(r['url'], [])
+            huella = _huella(r, sp)
+            if previas.get(r['url']) == huella:
+                conteo['sin_cambios'] += 1
+                continue
+            fecha = str(r.get('fecha') or '')[:10] or None
+            valores = [r['url'], fecha, fecha[:7] if fecha else None, r.get('domain'), r.get('title'), huella]
+            valores += [r.get(t) for t in tipos_cifra]
+            (articulo_id,) = con.execute(insertar, valores).fetchone()
+            conteo['actualizados' if r['url'] in previas else 'insertados'] += 1
+            nuevas.append((articulo_id, r, sp))
+
+        # Las filas que cambiaron reemplazan sus menciones y cifras
+        cambiadas = [i for i, r, _ in nuevas if r['url'] in previas]
+        for ids in _trozos(cambiadas):
+            con.execute(f"DELETE FROM menciones WHERE articulo_id IN {_en(ids)}", ids)
+            con.execute(f"DELETE FROM cifras WHERE articulo_id IN {_en(ids)}", ids)
+        con.executemany("INSERT INTO menciones VALUES (?, ?, ?, ?)",
+                        [m for i, r, _ in nuevas for m in _menciones(i, r)])
+        con.executemany(
+            "INSERT INTO cifras VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(i, s['tipo'], s['valor'], s['unidad'], s['evidencia'], s['inicio'], s['fin'])
+             for i, _, sp in nuevas for s in sp],
+        )
+    return conteo['insertados'], conteo['actualizados'], conteo['sin_cambios']
+
+
+def consultar(con, region=None, tema=None, cultivo=None, desde=None, hasta=None, con_cifra=None):
+    """Artículos que cumplen todos los filtros dados, como DataFrame.
+
+    desde/hasta: fechas ISO inclusivas ('2022-01-01'); con_cifra: tipo de
+    cifra que debe estar presente ('damnificados').
+    Ej.: consultar(con, region='Puno', tema='heladas_friaje',
+                   desde='2022-01-01', hasta='2022-12-31', con_cifra='damnificados')
+    """
+    sql = ["SELECT a.* FROM articulos a"]
+    condiciones, params = [], []
+    for tipo, valor in (('region', region), ('tema', tema), ('cultivo', cultivo)):
+        if valor is not None:
+            sql.append(f"JOIN menciones m_{tipo} ON m_{tipo}.articulo_id = a.id "
+                       f"AND m_{tipo}.tipo = ? AND m_{tipo}.valor = ?")
+            params += [tipo, valor]
+    if desde is not None:
+        condiciones.append("a.fecha >= ?")
+        params.append(desde)
+    if hasta is not None:
+        condiciones.append("a.fecha <= ?")
+        params.append(hasta)
+    if con_cifra is not None:
+        condiciones.append("EXISTS (SELECT 1 FROM cifras c WHERE c.articulo_id = a.id AND c.tipo = ?)")
+        params.append(con_cifra)
+    if condiciones:
+        sql.append("WHERE " + " AND ".join(condiciones))
+    sql.append("ORDER BY a.fecha")
+    return pd.read_sql_query(" ".join(sql), con, params=params)
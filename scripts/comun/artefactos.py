@@ -0,0 +1,84 @@
+"""
+artefactos.py
+Catálogo de artefactos del pipeline: nombre lógico → ruta.
+Los scripts ubican sus entradas y salidas por nombre (ruta("cuerpos_normalizados"))
+en lugar de rutas o archivos fechados escritos a mano, y el runner
+(scripts/pipeline.py) usa el mismo catálogo para saber qué produce y qué
+consume cada etapa.
+
+Los datasets particionados de data/staging tienen además un nombre de
+dataset (DATASETS) para las funciones de comun/staging.py; su ruta en el
+catálogo es el directorio del dataset.
+"""
+
+from pathlib import Path
+
+from comun.staging import STAGING_DIR, ruta_dataset
+
+RAW_DIR = Path("data/raw")
+EXTERNAL_DIR = Path("data/external")
+DB_DIR = Path("data/db")
+OUTPUT_DIR = Path("outputs/tables")
+
+# Nombre del dataset particionado (para leer_staging / escribir_particionado)
+DATASETS = {
+    "corpus": "gdelt_clima_peru",              # 01
+    "corpus_gkg": "gdelt_clima_peru_gkg",      # 01b
+    "corpus_temas": "gdelt_clima_peru_temas",  # 02
+    "eventos_duros": "eventos_duros",          # 05
+}
+
+ARTEFACTOS = {
+    # 01 — cosecha GDELT
+    "corpus": ruta_dataset(DATASETS["corpus"]),
+    "cosecha_supervivencia": OUTPUT_DIR / "cosecha_supervivencia.csv",
+    "timeline_crudo": RAW_DIR / "gdelt_timeline",
+    "timeline_volumen": STAGING_DIR / "gdelt_timeline_volumen.parquet",
+    # 01b — ingesta masiva GKG / mentions
+    "gkg_espejo": RAW_DIR / "gdelt_gkg",
+    "gkg_filtrado": STAGING_DIR / "gkg_filtrado",
+    "corpus_gkg": ruta_dataset(DATASETS["corpus_gkg"]),
+    # 02 — detección temática en títulos
+    "corpus_temas": ruta_dataset(DATASETS["corpus_temas"]),
+    "serie_mensual_temas": OUTPUT_DIR / "serie_mensual_temas.csv",
+    "serie_cobertura_temas": OUTPUT_DIR / "serie_cobertura_temas.parquet",
+    # 03 — cuerpos completos
+    "cuerpos": RAW_DIR / "cuerpos" / "cuerpos_descargados.jsonl",
+    # 03a / 03b
+    "cuerpos_normalizados": STAGING_DIR / "cuerpos_normalizados.parquet",
+    "cuerpos_temas": STAGING_DIR / "cuerpos_temas.parquet",
+    # 04 — entidades
+    "entidades": STAGING_DIR / "entidades_extraidas.parquet",
+    "entidades_csv": OUTPUT_DIR / "entidades_extraidas.csv",
+    "cifras_spans": STAGING_DIR / "cifras_spans.parquet",
+    "menciones": STAGING_DIR / "menciones.parquet",
+    "entidades_catalogo": STAGING_DIR / "entidades_catalogo.parquet",
+    "menciones_superficies": STAGING_DIR / "menciones_superficies.parquet",
+    "coocurrencia_mensual": OUTPUT_DIR / "coocurrencia_region_tema_cultivo_mes.csv",
+    "resumen_entidades": OUTPUT_DIR / "resumen_entidades.json",
+    "entidades_db": DB_DIR / "entidades.sqlite",
+    # 05 — datos duros
+    "eventos_fuentes": STAGING_DIR / "datos_duros_fuentes",
+    "eventos_duros": ruta_dataset(DATASETS["eventos_duros"]),
+    # 06 — cruce cobertura × datos duros
+    "cobertura_eventos": OUTPUT_DIR / "cobertura_eventos.parquet",
+    "correlacion_rezagos": OUTPUT_DIR / "correlacion_rezagos.parquet",
+    # Caché de respuestas de la DOC API de GDELT (comun/gdelt.py)
+    "gdelt_cache": DB_DIR / "gdelt_cache.sqlite",
+    "gdelt_ritmo": DB_DIR / "gdelt_ritmo.sqlite",
+    # Índice de texto completo (buscar_texto.py)
+    "indice_texto": DB_DIR / "indice_texto.sqlite",
+    # Externos (descargas manuales)
+    "distritos": EXTERNAL_DIR / "ubigeo_distritos.csv",
+    "desinventar": EXTERNAL_DIR / "desinventar",
+    "emdat": EXTERNAL_DIR / "emdat",
+    "indeci": EXTERNAL_DIR / "indeci",
+}
+
+
+def ruta(nombre):
+    """Ruta de un artefacto del catálogo."""
+    try:
+        return ARTEFACTOS[nombre]
+    except KeyError:
+        raise KeyError(f"artefacto desconocido: {nombre!r} (ver comun/artefactos.py)") from None
@@ -0,0 +1,101 @@
+"""
+cifras.py
+Extractor de cifras de afectación como spans tipados.
+Cada patrón de `cifras_patrones` se compila una vez, con su número en el
+grupo n y su multiplicador opcional `mil` en m. Cada coincidencia se emite
+como un span tipado con offsets, el número tal como aparece, el valor ya
+interpretado y la unidad.
+
+Los patrones trabajan sobre texto normalizado (03a); los offsets se
+devuelven en ambos textos, el normalizado y el original, vía el mapa de
+offsets. Cada patrón recorre el texto por separado (como el findall por
+patrón original), así que las coincidencias de patrones distintos pueden
+solaparse: en "2 muertos y 10 fallecidos" el primer patrón de fallecidos
+abarca las dos cifras y aun así otro patrón extrae el 10. Un mismo número
+hallado por varios patrones del mismo tipo se reporta una vez.
+"""
+
+import re
+
+from comun.normalizar import a_original, plegar_patron
+
+VALOR_MAX = 10_000_000   # cifras mayores se descartan (años, teléfonos, montos)
+
+_CAPTURA = re.compile(r"(?<!\\)\((?!\?)")
+_MIL = r"(?:mil\s+)?"
+
+
+def _nombrar_grupos(patron):
+    """Renombra el grupo del número a n y el multiplicador `mil` a m."""
+    if re.compile(patron).groups != 1:
+        raise ValueError(f"el patrón de cifra debe tener un solo grupo de captura: {patron!r}")
+    patron = _CAPTURA.sub("(?P<n>", patron, count=1)
+    return patron.replace(_MIL, "(?P<m>mil\\s+)?", 1)
+
+
+def compilar_cifras(cifras_patrones):
+    """Compila {tipo: [patrones]} plegados, en orden del diccionario.
+
+    Devuelve (regexes, tipos) donde tipos[i] es el tipo de regexes[i].
+    """
+    regexes, tipos = [], []
+    for tipo, patrones in cifras_patrones.items():
+        for patron in patrones:
+            regexes.append(re.compile(_nombrar_grupos(plegar_patron(patron))))
+            tipos.append(tipo)
+    return regexes, tipos
+
+
+def valor_numerico(numero, mil=False):
+    """Interpreta un número en formato peruano: '1.200' → 1200, '1,5 mil' → 1500.
+
+    Un separador seguido de exactamente tres dígitos es de miles; si no, es
+    la coma decimal. Devuelve None si no hay dígitos.
+    """
+    numero = numero.strip(".,")
+    if not numero:
+        return None
+    partes = re.split(r"[.,]", numero)
+    if len(partes) > 1 and len(partes[-1]) != 3:
+        valor = float("".join(partes[:-1]) + "." + partes[-1])
+    else:
+        valor = float("".join(partes))
+    return valor * 1000 if mil else valor
+
+
+def extraer_cifras(regexes, tipos, unidades, texto, seg_norm=(), seg_orig=()):
+    """Spans de cifras en `texto` (normalizado), ordenados por posición.
+
+    Cada span: tipo, valor, unidad, numero (tal cual), mil, evidencia (texto
+    normalizado de la coincidencia), inicio/fin en el texto original e
+    inicio_norm/fin_norm en el normalizado.
+    """
+    spans, vistos = [], set()
+    for rx, tipo in zip(regexes, tipos):
+        for m in rx.finditer(texto):
+            if (tipo, m.start("n")) in vistos:
+                continue
+            vistos.add((tipo, m.start("n")))
+            spans.append((m, tipo))
+    spans.sort(key=lambda s: s[0].start())
+
+    salida = []
+    for m, tipo in spans:
+        mil = "m" in m.re.groupindex and m.group("m") is not None
+        valor = valor_numerico(m.group("n"), mil)
+        if valor is None or not 0 < valor < VALOR_MAX:
+            continue
+        inicio, fin = m.span()
+        salida.append({
+            'tipo': tipo,
+            'valor': valor,
+            'unidad': unidades.get(tipo),
+            'numero': m.group("n"),
+            'mil': mil,
+            'evidencia': m.group(),
+            'inicio': a_original(seg_norm, seg_orig, inicio),
+            'fin': a_original(seg_norm, seg_orig, fin - 1) + 1,
+            'inicio_norm': inicio,
+            'fin_norm': fin,
+        })
+    return salida
@@ -0,0 +1,68 @@
+"""
+compacto.py
+Representación compacta del corpus en memoria:
+- columnas repetitivas (dominio, idioma, país, query, trimestre) como categóricas
+- banderas de tema/región empaquetadas en un entero por artículo (bitset)
+  en vez de una columna bool por tema/región.
+El bit i corresponde al i-ésimo nombre del diccionario (orden de inserción).
+"""
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAS = ['domain', 'language', 'sourcecountry', '_query', '_trimestre', 'title_origen']
+
+
+def compactar(df):
+    """Convierte in situ las columnas repetitivas a categóricas."""
+    for col in CATEGORICAS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def dtype_bits(n):
+    """Entero sin signo más pequeño con al menos n bits."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if n <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"Demasiadas banderas para un bitset: {n}")
+
+
+def empaquetar(banderas, n_bits):
+    """Empaqueta una secuencia de arrays bool (uno por bit) en un array de enteros."""
+    dtype = dtype_bits(n_bits)
+    bits = None
+    for i, b in enumerate(banderas):
+        valor = np.asarray(b, dtype=dtype) << dtype(i)
+        bits = valor if bits is None else bits | valor
+    return bits
+
+
+def bandera(bits, nombres, nombre):
+    """Vista bool de una bandera del bitset (Series/array de enteros)."""
+    i = nombres.index(nombre)
+    valores = np.asarray(bits)
+    activa = (valores >> valores.dtype.type(i)) & 1 == 1
+    if isinstance(bits, pd.Series):
+        return pd.Series(activa, index=bits.index, name=nombre)
+    return activa
+
+
+def expandir(bits, nombres, prefijo=''):
+    """DataFrame temporal de una columna bool por nombre (para agregaciones)."""
+    return pd.DataFrame(
+        {f'{prefijo}{n}': bandera(bits, nombres, n) for n in nombres},
+        index=getattr(bits, 'index', None),
+    )
+
+
+def decodificar(valor, nombres):
+    """Lista de nombres activos en un bitset escalar."""
+    valor = int(valor)
+    return [n for i, n in enumerate(nombres) if valor >> i & 1]
+
+
+def contar_bits(bits, nombres):
+    """Número de filas con cada bandera activa."""
+    return {n: int(bandera(bits, nombres, n).sum()) for n in nombres}
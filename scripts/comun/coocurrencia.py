@@ -0,0 +1,123 @@
+"""
+coocurrencia.py
+Co-ocurrencias entre entidades (regiones, provincias, cultivos, temas, mes)
+con matrices dispersas.
+Cada dimensión es una matriz indicadora artículos × etiquetas (CSR, 0/1).
+Una tabla de a × b sale de A.T @ B; para tres o más dimensiones se combinan
+primero las de la izquierda con un producto fila a fila (Khatri-Rao: una
+columna por combinación presente en algún artículo) y se multiplica por la
+última. Los conteos son de artículos: un artículo que menciona Puno y
+heladas suma 1 al par, sin importar cuántas veces los mencione.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from scipy import sparse
+
+
+def indicadora(listas, etiquetas=None):
+    """Matriz indicadora desde una columna de listas (Series, lista o pa.Array).
+
+    Devuelve (matriz CSR n × k, etiquetas). Con `etiquetas` dadas se respeta
+    ese orden y se ignoran valores fuera de él.
+    """
+    arr = pa.array(listas) if not isinstance(listas, (pa.Array, pa.ChunkedArray)) else listas
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    arr = arr.fill_null([])
+    filas = pc.list_parent_indices(arr).to_numpy()
+    valores = pc.list_flatten(arr).to_numpy(zero_copy_only=False).astype(object)
+
+    if etiquetas is None:
+        codigos, unicos = pd.factorize(valores, sort=True)
+        etiquetas = list(unicos)
+    else:
+        codigos = pd.Index(etiquetas).get_indexer(valores)
+        filas, codigos = filas[codigos >= 0], codigos[codigos >= 0]
+
+    m = sparse.csr_matrix(
+        (np.ones(len(filas), dtype=np.int32), (filas, codigos)),
+        shape=(len(arr), len(etiquetas)),
+    )
+    m.data[:] = 1   # duplicados dentro de un artículo cuentan una vez
+    return m, list(etiquetas)
+
+
+def indicadora_categoria(valores, etiquetas=None):
+    """Matriz indicadora de una columna de un solo valor por artículo (ej. mes)."""
+    valores = pd.Series(valores)
+    if etiquetas is None:
+        codigos, unicos = pd.factorize(valores, sort=True)
+        etiquetas = list(unicos)
+    else:
+        codigos = pd.Index(etiquetas).get_indexer(valores)
+    filas = np.flatnonzero(codigos >= 0)
+    m = sparse.csr_matrix(
+        (np.ones(len(filas), dtype=np.int32), (filas, codigos[filas])),
+        shape=(len(codigos), len(etiquetas)),
+    )
+    return m, list(etiquetas)
+
+
+def _khatri_rao(a, b):
+    """Producto fila a fila: columna (i, j) = a[:, i] * b[:, j], solo combinaciones presentes."""
+    a, b = a.tocoo(), b.tocoo()
+    pa_ = pd.DataFrame({'fila': a.row, 'i': a.col})
+    pb_ = pd.DataFrame({'fila': b.row, 'j': b.col})
+    pares = pa_.merge(pb_, on='fila')
+    combinado = pares['i'].to_numpy(np.int64) * b.shape[1] + pares['j'].to_numpy(np.int64)
+    codigos, presentes = pd.factorize(combinado, sort=True)
+    m = sparse.csr_matrix(
+        (np.ones(len(pares), dtype=np.int32), (pares['fila'].to_numpy(), codigos)),
+        shape=(a.shape[0], len(presentes)),
+    )
+    return m, np.divmod(presentes, b.shape[1])
+
+
+def coocurrencia(dimensiones, minimo=1):
+    """Tabla tidy de co-ocurrencias entre dos o más dimensiones.
+
+    dimensiones: {nombre: (matriz, etiquetas)}, todas con las mismas filas
+    (artículos) y en el orden de las columnas de salida.
+    Devuelve un DataFrame con una columna por dimensión y `n` (artículos),
+    ordenado de mayor a menor.
+    """
+    if len(dimensiones) < 2:
+        raise ValueError("se necesitan al menos dos dimensiones")
+    nombres = list(dimensiones)
+    matrices = [dimensiones[n][0] for n in nombres]
+
+    # Combinar todas menos la última; `indices[k]` da, por columna combinada,
+    # el índice de la etiqueta en la dimensión k
+    izq = matrices[0].tocsr()
+    indices = [np.arange(izq.shape[1])]
+    for m in matrices[1:-1]:
+        izq, (ia, ib) = _khatri_rao(izq, m)
+        indices = [idx[ia] for idx in indices] + [ib]
+
+    tabla = (izq.T @ matrices[-1]).tocoo()
+    if minimo > 1:
+        mask = tabla.data >= minimo
+        tabla = sparse.coo_matrix((tabla.data[mask], (tabla.row[mask], tabla.col[mask])), shape=tabla.shape)
+
+    columnas = {}
+    for k, nombre in enumerate(nombres[:-1]):
+        etiquetas = np.asarray(dimensiones[nombre][1], dtype=object)
+        columnas[nombre] = etiquetas[indices[k][tabla.row]]
+    columnas[nombres[-1]] = np.asarray(dimensiones[nombres[-1]][1], dtype=object)[tabla.col]
+    columnas['n'] = tabla.data.astype(np.int64)
+
+    return (pd.DataFrame(columnas)
+            .sort_values('n', ascending=False, kind='stable', ignore_index=True))
+
+
+def matrices_entidades(df, columnas=('regiones', 'provincias', 'cultivos', 'temas'), col_fecha='fecha'):
+    """Matrices indicadoras de las columnas de listas de entidades_extraidas, más 'mes'."""
+    dims = {c: indicadora(df[c]) for c in columnas}
+    if col_fecha in df:
+        meses = pd.to_datetime(df[col_fecha], errors='coerce').dt.to_period('M').astype(str)
+        meses = meses.where(meses != 'NaT')
+        dims['mes'] = indicadora_categoria(meses)
+    return dims
@@ -0,0 +1,107 @@
+"""
+correlacion.py
+Correlación cruzada con rezagos entre muchas series a la vez: cada serie de
+cobertura (tema × región) contra cada serie de datos duros, para todos los
+rezagos en [-max_rezago, max_rezago].
+
+Las series se apilan en matrices (una fila por serie, mismas fechas) y se
+estandarizan; la correlación cruzada de todos los pares sale de un solo
+producto en el dominio de la frecuencia (rfft con relleno de ceros, así la
+correlación es lineal y no circular), por bloques de filas de X para acotar
+la memoria.
+
+Convención: r(k) = corr(x[t + k], y[t]); un rezago positivo significa que la
+cobertura (x) va k periodos detrás de los eventos (y).
+
+Significancia por bootstrap de bloques circulares: se remuestrea el eje
+temporal de Y en bloques (conserva la autocorrelación de cada serie y rompe
+su alineación con X) y se recalculan todas las correlaciones. Se reportan:
+- p      fracción de réplicas con |r| >= |r observado| en ese rezago
+- p_max  lo mismo contra el máximo |r| de la réplica en todos los rezagos
+         (corrige por haber mirado muchos rezagos)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import fft
+
+BLOQUE_FILAS = 64
+
+
+def estandarizar(m):
+    """Filas con media 0 y desviación 1; NaN → 0 (la media) tras estandarizar.
+    Devuelve (matriz, válidas): las filas constantes no son válidas."""
+    m = np.asarray(m, dtype=np.float64)
+    media = np.nanmean(m, axis=1, keepdims=True)
+    desv = np.nanstd(m, axis=1, keepdims=True)
+    validas = (desv[:, 0] > 0) & np.isfinite(desv[:, 0])
+    z = np.where(validas[:, None], (m - media) / np.where(validas[:, None], desv, 1), 0.0)
+    return np.nan_to_num(z), validas
+
+
+def correlacion_cruzada(x, y, max_rezago):
+    """r[i, j, k] = correlación de x[i] rezagada k - max_rezago periodos respecto de y[j].
+
+    x, y ya estandarizadas (n_x × T, n_y × T). Cada rezago se normaliza por
+    el número de periodos que se solapan (T - |k|).
+    """
+    t = x.shape[1]
+    n = fft.next_fast_len(2 * t - 1, real=True)
+    rezagos = np.arange(-max_rezago, max_rezago + 1)
+    columnas = rezagos % n
+    solape = t - np.abs(rezagos)
+
+    fy = np.conj(fft.rfft(y, n, axis=1))
+    r = np.empty((x.shape[0], y.shape[0], len(rezagos)))
+    for i in range(0, x.shape[0], BLOQUE_FILAS):
+        fx = fft.rfft(x[i:i + BLOQUE_FILAS], n, axis=1)
+        cc = fft.irfft(fx[:, None, :] * fy[None, :, :], n, axis=2)
+        r[i:i + BLOQUE_FILAS] = cc[:, :, columnas] / solape
+    return r
+
+
+def indices_bloques(t, bloque, rng):
+    """Índices de un remuestreo por bloques circulares de largo `bloque`."""
+    inicios = rng.integers(0, t, -(-t // bloque))
+    return ((inicios[:, None] + np.arange(bloque)) % t).ravel()[:t]
+
+
+def matriz_rezagos(x, y, etiquetas_x, etiquetas_y, max_rezago=6, replicas=199,
+                   bloque=None, semilla=0):
+    """Tabla tidy (x, y, rezago, r, p, p_max, n_periodos) para todos los pares.
+
+    x, y: matrices series × periodos (mismas fechas); las series constantes
+    (p. ej. una región sin eventos) se descartan. `bloque` por defecto ~T^(1/3).
+    """
+    zx, validas_x = estandarizar(x)
+    zy, validas_y = estandarizar(y)
+    zx, zy = zx[validas_x], zy[validas_y]
+    etiquetas_x = [e for e, v in zip(etiquetas_x, validas_x) if v]
+    etiquetas_y = [e for e, v in zip(etiquetas_y, validas_y) if v]
+    t = zx.shape[1]
+    max_rezago = min(max_rezago, t - 2)
+    rezagos = np.arange(-max_rezago, max_rezago + 1)
+
+    r = correlacion_cruzada(zx, zy, max_rezago)
+    abs_r = np.abs(r)
+    mayores = np.zeros(r.shape, dtype=np.int32)
+    mayores_max = np.zeros(r.shape, dtype=np.int32)
+    if replicas:
+        bloque = bloque or max(2, round(t ** (1 / 3)))
+        rng = np.random.default_rng(semilla)
+        for _ in range(replicas):
+            yb, _ = estandarizar(zy[:, indices_bloques(t, bloque, rng)])
+            rb = np.abs(correlacion_cruzada(zx, yb, max_rezago))
+            mayores += rb >= abs_r
+            mayores_max += rb.max(axis=2, keepdims=True) >= abs_r
+
+    i, j, k = np.indices(r.shape).reshape(3, -1)
+    return pd.DataFrame({
+        "x": pd.Series(etiquetas_x, dtype=object).to_numpy()[i],
+        "y": pd.Series(etiquetas_y, dtype=object).to_numpy()[j],
+        "rezago": rezagos[k],
+        "r": r.ravel(),
+        "p": (mayores.ravel() + 1) / (replicas + 1) if replicas else np.nan,
+        "p_max": (mayores_max.ravel() + 1) / (replicas + 1) if replicas else np.nan,
+        "n_periodos": t - np.abs(rezagos[k]),
+    })
@@ -0,0 +1,49 @@
+"""
+cuerpos.py
+Extracción del texto principal de una página de noticias (usada por 03).
+Separada del script para poder probarla y medirla sobre HTML guardado,
+sin red.
+"""
+
+from bs4 import BeautifulSoup
+
+
+def extraer_cuerpo(html, domain):
+    """Extrae el texto principal de una página de noticias."""
+    soup = BeautifulSoup(html, 'lxml')
+    
+    # Eliminar scripts, styles, nav, footer, ads
+    for tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'iframe']):
+        tag.decompose()
+    
+    # Buscar contenedor principal por clases comunes
+    contenedores = [
+        ('article', None),
+        ('div', 'story-contents'),
+        ('div', 'article-body'),
+        ('div', 'nota-contenido'),
+        ('div', 'news-body'),
+        ('div', 'content-body'),
+        ('div', 'entry-content'),
+        ('div', 'post-content'),
+        ('div', 'article-content'),
+        ('div', 'cuerpo'),
+    ]
+    
+    for tag, cls in contenedores:
+        if cls:
+            found = soup.find(tag, class_=lambda c: c and cls in str(c).lower())
+        else:
+            found = soup.find(tag)
+        if found:
+            paragraphs = found.find_all('p')
+            text = '\n'.join(p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 30)
+            if len(text) > 200:
+                return text
+    
+    # Fallback: todos los párrafos largos de la página
+    paragraphs = soup.find_all('p')
+    long_p = [p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50]
+    text = '\n'.join(long_p)
+    
+    return text if len(text) > 100 else ""
@@ -0,0 +1,323 @@
+"""
+datos_duros.py
+Lectura columnar de las exportaciones de datos duros (DesInventar, EM-DAT,
+INDECI) y normalización a un esquema común de eventos:
+fuente, id_evento, ubigeo, region, fecha_inicio, fecha_fin, mes, amenaza,
+tema, fallecidos, afectados, damnificados, viviendas, hectareas_afectadas.
+
+Cada fuente declara en FUENTES qué columnas de su exportación alimentan cada
+campo, como lista de nombres candidatos: los encabezados se comparan
+plegados (minúsculas, sin tildes ni signos), así "FECHA_EMERGENCIA",
+"Fecha emergencia" y "fecha.emergencia" son la misma columna. Solo se leen
+las columnas que se usan (pyarrow.csv con include_columns).
+
+La región sale del ubigeo (2 primeros dígitos), del nombre del departamento
+o, si no hay ninguno (EM-DAT), de las regiones nombradas en el texto de
+ubicación; un evento de varias regiones queda como una fila por región. La
+amenaza se asigna a un tema de 02 con el diccionario `amenazas`.
+El dataset resultante (data/staging/eventos_duros/) va particionado por
+fuente y año y ordenado por región y mes, así las estadísticas de cada row
+group permiten filtrar por región-mes sin leer todo.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+
+from comun.artefactos import DATASETS
+from comun.diccionarios import amenazas, departamentos_ubigeo, departamentos_equivalentes, regiones
+from comun.normalizar import plegar, plegar_patron
+from comun.staging import ruta_dataset
+
+DATASET = DATASETS["eventos_duros"]
+ROWS_PER_GROUP = 16_000
+EXTENSIONES = {".csv", ".txt", ".tsv", ".xlsx", ".xls"}
+
+ESQUEMA = pa.schema([
+    ("fuente", pa.string()),
+    ("id_evento", pa.string()),
+    ("ubigeo", pa.string()),
+    ("region", pa.string()),
+    ("fecha_inicio", pa.timestamp("ms")),
+    ("fecha_fin", pa.timestamp("ms")),
+    ("mes", pa.timestamp("ms")),
+    ("amenaza", pa.string()),
+    ("tema", pa.string()),
+    ("fallecidos", pa.int64()),
+    ("afectados", pa.int64()),
+    ("damnificados", pa.int64()),
+    ("viviendas", pa.int64()),
+    ("hectareas_afectadas", pa.float64()),
+    ("archivo", pa.string()),
+])
+CONTEOS = ["fallecidos", "afectados", "damnificados", "viviendas"]
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("fuente", pa.string()), ("anio", pa.int16())]), flavor="hive"
+)
+
+# ── Columnas por fuente ───────────────────────────────────────
+# fecha: una columna de fecha o la terna anio/mes/dia; fin_*: fecha de término
+# amenaza: se concatenan todas las presentes (tipo + subtipo en EM-DAT)
+# filtro: (columna, valor) para quedarse con Perú en exportaciones globales
+FUENTES = {
+    "desinventar": {
+        "id_evento": ["serial"],
+        "anio": ["fechano"], "mes": ["fechames"], "dia": ["fechadia"],
+        "ubigeo": ["level2", "codigo distrito"],
+        "departamento": ["name0", "departamento"],
+        "amenaza": ["evento"],
+        "fallecidos": ["muertos"],
+        "afectados": ["afectados"],
+        "damnificados": ["damnificados"],
+        "viviendas": ["vivafec", "viviendas afectadas"],
+        "hectareas_afectadas": ["nhectareas", "hectareas"],
+    },
+    "emdat": {
+        "id_evento": ["disno", "dis no"],
+        "anio": ["start year"], "mes": ["start month"], "dia": ["start day"],
+        "fin_anio": ["end year"], "fin_mes": ["end month"], "fin_dia": ["end day"],
+        "lugar": ["location"],
+        "amenaza": ["disaster type", "disaster subtype"],
+        "fallecidos": ["total deaths"],
+        "afectados": ["total affected", "no affected"],
+        "damnificados": ["no homeless"],
+        "filtro": ("iso", "PER"),
+    },
+    "indeci": {
+        "id_evento": ["codigo", "codigo emergencia", "nro emergencia", "id"],
+        "fecha": ["fecha", "fecha emergencia", "fecha ocurrencia", "fecha inicio"],
+        "fin_fecha": ["fecha fin", "fecha termino"],
+        "ubigeo": ["ubigeo"],
+        "departamento": ["departamento"],
+        "amenaza": ["fenomeno", "tipo fenomeno", "peligro"],
+        "fallecidos": ["fallecidos", "personas fallecidas"],
+        "afectados": ["personas afectadas", "afectados"],
+        "damnificados": ["personas damnificadas", "damnificados"],
+        "viviendas": ["viviendas afectadas"],
+        "hectareas_afectadas": ["ha cultivo afectadas", "hectareas afectadas", "cultivo afectado ha"],
+    },
+}
+
+_NO_ALNUM = re.compile(r"[^0-9a-z]+")
+_MILES = re.compile(r"[.,](?=\d{3}(?:\D|$))")
+
+
+def clave(nombre):
+    """Encabezado plegado para comparar: 'No. Affected' → 'no affected'."""
+    return _NO_ALNUM.sub(" ", plegar(str(nombre))).strip()
+
+
+# ── Lectura ───────────────────────────────────────────────────
+
+def _formato_csv(path):
+    """(encoding, delimitador, encabezados) a partir de la primera línea."""
+    with open(path, "rb") as f:
+        muestra = f.read(1 << 16)
+    try:
+        encoding = "utf-8"
+        primera = muestra.decode("utf-8-sig").splitlines()[0]
+    except UnicodeDecodeError:
+        encoding = "latin-1"
+        primera = muestra.decode("latin-1").splitlines()[0]
+    delimitador = max([",", ";", "\t", "|"], key=primera.count)
+    encabezados = [c.strip().strip('"') for c in primera.split(delimitador)]
+    return encoding, delimitador, encabezados
+
+
+def columnas_usadas(encabezados, spec):
+    """{campo: [encabezados originales]} de los campos de `spec` presentes."""
+    por_clave = {}
+    for c in encabezados:
+        por_clave.setdefault(clave(c), c)
+    usadas = {}
+    for campo, candidatos in spec.items():
+        if campo == "filtro":
+            candidatos = [candidatos[0]]
+        presentes = [por_clave[k] for k in map(clave, candidatos) if k in por_clave]
+        if presentes:
+            usadas[campo] = presentes if campo == "amenaza" else presentes[:1]
+    return usadas
+
+
+def leer_exportacion(path, spec):
+    """DataFrame (texto) con una columna por campo de `spec` presente en el archivo."""
+    if path.suffix.lower() in (".xlsx", ".xls"):
+        crudo = pd.read_excel(path, dtype=str)
+        usadas = columnas_usadas(crudo.columns, spec)
+    else:
+        encoding, delimitador, encabezados = _formato_csv(path)
+        usadas = columnas_usadas(encabezados, spec)
+        necesarias = sorted({c for cols in usadas.values() for c in cols})
+        tabla = pv.read_csv(
+            path,
+            read_options=pv.ReadOptions(encoding=encoding, block_size=1 << 24),
+            parse_options=pv.ParseOptions(delimiter=delimitador, newlines_in_values=True),
+            convert_options=pv.ConvertOptions(include_columns=necesarias,
+                                               column_types={c: pa.string() for c in necesarias}),
+        )
+        crudo = tabla.to_pandas()
+
+    df = pd.DataFrame(index=crudo.index)
+    for campo, cols in usadas.items():
+        if campo == "amenaza":
+            partes = [crudo[c].fillna("").astype("string") for c in cols]
+            df[campo] = partes[0].str.cat(partes[1:], sep=" ").str.strip()
+        else:
+            df[campo] = crudo[cols[0]]
+    return df
+
+
+# ── Normalización ─────────────────────────────────────────────
+
+def _numero(serie):
+    """'1,234' / '1.234' / '12.5' → número; vacío o no numérico → NaN."""
+    texto = serie.astype("string").str.strip().str.replace(_MILES, "", regex=True).str.replace(",", ".")
+    return pd.to_numeric(texto, errors="coerce")
+
+
+# Formatos de fecha no ISO de las exportaciones, en orden de prueba (día primero)
+FORMATOS_FECHA = ["%d/%m/%Y", "%d/%m/%Y %H:%M:%S", "%d-%m-%Y", "%Y/%m/%d"]
+
+
+def _parsear_fechas(serie):
+    """ISO (incluido el 'YYYY-MM-DD 00:00:00' del Excel leído como texto) y luego
+    FORMATOS_FECHA, cada uno solo sobre lo que sigue sin fecha."""
+    texto = serie.astype("string").str.strip()
+    fechas = pd.to_datetime(texto, format="ISO8601", errors="coerce")
+    for formato in FORMATOS_FECHA:
+        faltan = fechas.isna() & texto.notna()
+        if not faltan.any():
+            break
+        fechas[faltan] = pd.to_datetime(texto[faltan], format=formato, errors="coerce")
+    return fechas
+
+
+def _fecha(df, prefijo=""):
+    if f"{prefijo}fecha" in df:
+        return _parsear_fechas(df[f"{prefijo}fecha"])
+    if f"{prefijo}anio" not in df:
+        return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ms]")
+    partes = {"year": _numero(df[f"{prefijo}anio"])}
+    for campo, nombre in (("month", "mes"), ("day", "dia")):
+        partes[campo] = _numero(df[f"{prefijo}{nombre}"]).fillna(1) if f"{prefijo}{nombre}" in df else 1
+    return pd.to_datetime(pd.DataFrame(partes, index=df.index), errors="coerce")
+
+
+def _ubigeo(serie):
+    digitos = serie.astype("string").str.replace(r"\D", "", regex=True)
+    digitos = digitos.where(digitos.str.len() != 5, "0" + digitos)   # cero inicial perdido en Excel
+    return digitos.where(digitos.str.len() == 6)
+
+
+def tema_amenaza(valores):
+    """{amenaza: tema} para los valores distintos (primer tema de `amenazas` que coincide)."""
+    compilados = [(tema, re.compile("|".join(plegar_patron(p) for p in patrones)))
+                  for tema, patrones in amenazas.items()]
+    resultado = {}
+    for valor in valores:
+        texto = plegar(valor)
+        resultado[valor] = next((t for t, r in compilados if r.search(texto)), None)
+    return resultado
+
+
+def _regiones_en_texto(serie):
+    """Listas de regiones de `regiones` nombradas en un texto libre de ubicación
+    (los departamentos equivalentes cuentan como su región: Callao → Lima)."""
+    patrones = list(regiones.items()) + [(r, rf"\b{d}\b") for d, r in departamentos_equivalentes.items()]
+    patron = re.compile("|".join(f"(?P<r{i}>{plegar_patron(p)})" for i, (_, p) in enumerate(patrones)))
+    nombres = [r for r, _ in patrones]
+    return serie.fillna("").map(
+        lambda t: sorted({nombres[int(m.lastgroup[1:])] for m in patron.finditer(plegar(t))}) or [None]
+    )
+
+
+def normalizar_eventos(df, fuente, archivo):
+    """DataFrame de leer_exportacion → esquema común (ESQUEMA)."""
+    spec = FUENTES[fuente]
+    if "filtro" in df:
+        df = df[df["filtro"].astype("string").str.strip().str.upper() == spec["filtro"][1]]
+
+    out = pd.DataFrame(index=df.index)
+    out["fuente"] = fuente
+    vacio = pd.Series(pd.NA, index=df.index, dtype="string")
+    out["id_evento"] = df["id_evento"].astype("string") if "id_evento" in df else vacio
+    out["ubigeo"] = _ubigeo(df["ubigeo"]) if "ubigeo" in df else vacio
+    out["fecha_inicio"] = _fecha(df)
+    fin = _fecha(df, "fin_")
+    out["fecha_fin"] = fin.where(fin >= out["fecha_inicio"], out["fecha_inicio"])
+    out["mes"] = out["fecha_inicio"].dt.to_period("M").dt.start_time
+
+    # Región: ubigeo → departamento → regiones nombradas en la ubicación
+    por_nombre = {clave(n): departamentos_equivalentes.get(n, n) for n in departamentos_ubigeo.values()}
+    region = out["ubigeo"].str[:2].map(departamentos_ubigeo).replace(departamentos_equivalentes)
+    if "departamento" in df:
+        region = region.fillna(df["departamento"].astype("string").map(
+            lambda d: por_nombre.get(clave(d), str(d).strip().title()) if isinstance(d, str) else None))
+    if "lugar" in df:
+        region = region.astype(object).where(region.notna(), _regiones_en_texto(df["lugar"]))
+        out["region"] = region
+        out = out.explode("region")
+    else:
+        out["region"] = region
+
+    amenaza = df["amenaza"].reindex(out.index).fillna("").astype(str) if "amenaza" in df else ""
+    out["amenaza"] = amenaza
+    out["tema"] = out["amenaza"].map(tema_amenaza(out["amenaza"].unique()))
+
+    for campo in CONTEOS + ["hectareas_afectadas"]:
+        valores = _numero(df[campo]).reindex(out.index) if campo in df else np.nan
+        out[campo] = valores
+    out["archivo"] = archivo
+    out = out.dropna(subset=["fecha_inicio"]).reset_index(drop=True)
+    for campo in CONTEOS:
+        out[campo] = out[campo].round().astype("Int64")
+    return pa.Table.from_pandas(out[ESQUEMA.names], schema=ESQUEMA, preserve_index=False)
+
+
+# ── Dataset ───────────────────────────────────────────────────
+
+def escribir_eventos(tabla):
+    """Escribe el dataset completo (reemplaza el anterior), particionado por
+    fuente/año y ordenado por región y mes dentro de cada partición."""
+    anio = pc.year(tabla["fecha_inicio"]).cast(pa.int16())
+    tabla = tabla.append_column("anio", anio).sort_by(
+        [("region", "ascending"), ("mes", "ascending"), ("fecha_inicio", "ascending")])
+    formato = ds.ParquetFileFormat()
+    ds.write_dataset(
+        tabla,
+        ruta_dataset(DATASET),
+        format=formato,
+        partitioning=PARTITIONING,
+        existing_data_behavior="delete_matching",
+        max_rows_per_group=ROWS_PER_GROUP,
+        min_rows_per_group=ROWS_PER_GROUP // 4,
+        file_options=formato.make_write_options(write_statistics=True, compression="zstd"),
+    )
+    return ruta_dataset(DATASET)
+
+
+def leer_eventos(region=None, temas=None, desde=None, hasta=None, fuentes=None, columnas=None):
+    """Eventos con el filtro empujado al escaneo (particiones y row groups)."""
+    dataset = ds.dataset(ruta_dataset(DATASET), format="parquet", partitioning=PARTITIONING)
+    condiciones = []
+    if region is not None:
+        condiciones.append(pc.field("region").isin([region] if isinstance(region, str) else list(region)))
+    if temas is not None:
+        condiciones.append(pc.field("tema").isin(list(temas)))
+    if fuentes is not None:
+        condiciones.append(pc.field("fuente").isin(list(fuentes)))
+    if desde is not None:
+        condiciones.append(pc.field("mes") >= pd.Timestamp(desde).to_period("M").start_time)
+        condiciones.append(pc.field("anio") >= pd.Timestamp(desde).year)
+    if hasta is not None:
+        condiciones.append(pc.field("mes") <= pd.Timestamp(hasta))
+        condiciones.append(pc.field("anio") <= pd.Timestamp(hasta).year)
+    filtro = None
+    for c in condiciones:
+        filtro = c if filtro is None else filtro & c
+    return dataset.to_table(columns=columnas, filter=filtro).to_pandas()
@@ -0,0 +1,71 @@
+"""
+deteccion.py
+Detección de temas y regiones sobre títulos normalizados, con dos backends:
+- "pandas": .str.count / .str.contains (módulo re, bucle sobre objetos Python)
+- "arrow":  pyarrow.compute count_substring_regex / match_substring_regex
+            (RE2 en C++, liberan el GIL → un hilo por patrón)
+Ambos devuelven lo mismo: conteos por tema y bitsets de temas y regiones.
+Los patrones de temas/regiones no usan lookarounds ni backreferences, así
+que son válidos en RE2; sobre texto plegado (ASCII) \\w, \\s y \\b coinciden.
+Las regiones pueden buscarse sobre otro texto (títulos sin tildes pero con
+mayúsculas, ver comun/normalizar.py).
+"""
+
+import os
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from concurrent.futures import ThreadPoolExecutor
+
+from comun.compacto import empaquetar
+
+BACKENDS = ("pandas", "arrow")
+BACKEND = os.environ.get("DETECCION_BACKEND", "pandas")
+
+
+def _pandas(titulos, temas_plegados, regiones_plegadas, titulos_regiones):
+    conteos = {
+        tema: titulos.str.count("|".join(patrones)).to_numpy()
+        for tema, patrones in temas_plegados.items()
+    }
+    regiones = [titulos_regiones.str.contains(p, regex=True).to_numpy() for p in regiones_plegadas.values()]
+    return conteos, regiones
+
+
+def _arrow(titulos, temas_plegados, regiones_plegadas, titulos_regiones, hilos=None):
+    arr = pa.array(titulos, type=pa.large_string())
+    arr_regiones = arr if titulos_regiones is titulos else pa.array(titulos_regiones, type=pa.large_string())
+
+    def contar(patrones):
+        return pc.count_substring_regex(arr, "|".join(patrones)).to_numpy(zero_copy_only=False)
+
+    def buscar(patron):
+        return pc.match_substring_regex(arr_regiones, patron).to_numpy(zero_copy_only=False)
+
+    with ThreadPoolExecutor(max_workers=hilos or os.cpu_count()) as pool:
+        futuros_temas = {t: pool.submit(contar, ps) for t, ps in temas_plegados.items()}
+        futuros_reg = [pool.submit(buscar, p) for p in regiones_plegadas.values()]
+        conteos = {t: f.result() for t, f in futuros_temas.items()}
+        regiones = [f.result() for f in futuros_reg]
+    return conteos, regiones
+
+
+def detectar(titulos, temas_plegados, regiones_plegadas, backend=BACKEND, titulos_regiones=None):
+    """Devuelve (conteos {tema: array uint8}, temas_bits, regiones_bits).
+
+    `titulos` es una Series de títulos normalizados sin nulos; las regiones se
+    buscan en `titulos_regiones` si se da (mismo largo y orden).
+    """
+    if titulos_regiones is None:
+        titulos_regiones = titulos
+    if backend == "pandas":
+        conteos, regiones = _pandas(titulos, temas_plegados, regiones_plegadas, titulos_regiones)
+    elif backend == "arrow":
+        conteos, regiones = _arrow(titulos, temas_plegados, regiones_plegadas, titulos_regiones)
+    else:
+        raise ValueError(f"Backend desconocido: {backend!r} (opciones: {BACKENDS})")
+
+    temas_bits = empaquetar([c > 0 for c in conteos.values()], len(conteos))
+    regiones_bits = empaquetar(regiones, len(regiones))
+    conteos = {t: np.minimum(c, 255).astype("uint8") for t, c in conteos.items()}
+    return conteos, temas_bits, regiones_bits
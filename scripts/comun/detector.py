@@ -0,0 +1,62 @@
+"""
+detector.py
+Detector temático de una sola pasada.
+Compila todos los patrones de todos los temas en un único regex con un
+grupo nombrado por tema, de modo que cada texto se recorre una sola vez
+y cada coincidencia se atribuye a su tema vía `match.lastgroup`.
+"""
+
+import re
+import time
+from collections import Counter
+
+# Largo máximo de un tramo: entre tramos se revisa el presupuesto de tiempo,
+# así un cuerpo sin saltos de línea no se escanea entero de una vez
+MAX_TRAMO = 5000
+
+
+def compilar_temas(temas):
+    """Compila {tema: [patrones]} en un solo regex con grupos nombrados.
+
+    Los nombres de tema deben ser identificadores válidos (heladas_friaje, ...).
+    """
+    partes = [f"(?P<{tema}>{'|'.join(patrones)})" for tema, patrones in temas.items()]
+    return re.compile("|".join(partes))
+
+
+def tramos(texto, largo=MAX_TRAMO):
+    """Párrafos del texto; los de más de `largo` caracteres se cortan en el
+    último espacio antes del límite (o en el límite si no hay espacio)."""
+    for parrafo in texto.split("\n"):
+        while len(parrafo) > largo:
+            corte = parrafo.rfind(" ", 0, largo)
+            corte = corte if corte > 0 else largo
+            yield parrafo[:corte]
+            parrafo = parrafo[corte:]
+        yield parrafo
+
+
+def contar_temas(patron, texto, limite_s=None):
+    """Cuenta coincidencias por tema en una sola pasada sobre el texto.
+
+    El texto se recorre por tramos (párrafos, cortados a MAX_TRAMO); si se
+    pasa `limite_s`, el presupuesto se revisa tras cada tramo y cada
+    coincidencia, y al agotarse se deja de escanear y se marca como truncado.
+    Devuelve (Counter {tema: hits}, truncado).
+    """
+    hits = Counter()
+    fin = None if limite_s is None else time.perf_counter() + limite_s
+    for tramo in tramos(texto):
+        for m in patron.finditer(tramo):
+            hits[m.lastgroup] += 1
+            if fin is not None and time.perf_counter() > fin:
+                return hits, True
+        if fin is not None and time.perf_counter() > fin:
+            return hits, True
+    return hits, False
+
+
+def clasificar(hits, umbral=3, umbrales=None):
+    """Temas cuyo número de hits alcanza el umbral (general o por tema)."""
+    umbrales = umbrales or {}
+    return [tema for tema, n in hits.items() if n >= umbrales.get(tema, umbral)]
@@ -0,0 +1,300 @@
+"""
+diccionarios.py
+Diccionarios de temas, regiones y entidades compartidos por los scripts del pipeline.
+Metodología basada en Bastián Olea (prensa_chile/delincuencia_prensa).
+"""
+
+# ── Temas ─────────────────────────────────────────────────────
+temas = {
+    "heladas_friaje": [
+        r"helad[ao]s?",
+        r"friaje",
+        r"ola\s+de\s+fr[ií]o",
+        r"temperatur\w+\s+(baj|descen|bajo\s+cero)",
+        r"nevada",
+        r"nev[oó]",
+        r"hipotermia",
+        r"frost",
+        r"cold\s+wave",
+        r"freeze",
+    ],
+    "inundaciones_huaicos": [
+        r"inundaci[oó]n",
+        r"inundaciones",
+        r"huaic[oa]",
+        r"desbord[eó]",
+        r"crecida",
+        r"riada",
+        r"anegad",
+        r"flood",
+        r"flash\s+flood",
+        r"overflow",
+    ],
+    "lluvias_intensas": [
+        r"lluvias?\s+(intensa|torrencial|fuerte|extrema)",
+        r"precipitaci[oó]n",
+        r"tormenta",
+        r"aguacero",
+        r"diluvio",
+        r"heavy\s+rain",
+        r"downpour",
+        r"rainfall",
+    ],
+    "deslizamientos": [
+        r"deslizamiento",
+        r"derrumbe",
+        r"alud",
+        r"aluvi[oó]n",
+        r"avalanch",
+        r"landslide",
+        r"mudslide",
+        r"rockslide",
+    ],
+    "sequias": [
+        r"sequ[ií]a",
+        r"d[eé]ficit\s+h[ií]drico",
+        r"estr[eé]s\s+h[ií]drico",
+        r"escasez\s+de\s+agua",
+        r"falta\s+de\s+(agua|lluvia|riego)",
+        r"drought",
+        r"water\s+(shortage|scarcity|crisis)",
+        r"dry\s+spell",
+    ],
+    "granizadas": [
+        r"granizad[ao]",
+        r"granizo",
+        r"hail",
+        r"hailstorm",
+        r"hailstone",
+    ],
+    "el_nino_variabilidad": [
+        r"[Ee]l\s+[Nn]i[ñn]o",
+        r"[Ll]a\s+[Nn]i[ñn]a",
+        r"\bENSO\b",
+        r"[Ff]en[oó]meno\s+(del\s+)?[Nn]i[ñn]o",
+        r"[Nn]i[ñn]o\s+(costero|global)",
+        r"variabilidad\s+clim[aá]tica",
+        r"oscilaci[oó]n",
+    ],
+    "cambio_climatico": [
+        r"cambio\s+clim[aá]tico",
+        r"calentamiento\s+global",
+        r"climate\s+change",
+        r"global\s+warming",
+        r"efecto\s+invernadero",
+        r"greenhouse",
+        r"emisi[oó]n.*carbono",
+        r"carbon\s+emission",
+    ],
+    "impacto_agricola": [
+        r"p[eé]rdida.*cosecha",
+        r"cosecha.*p[eé]rdida",
+        r"cultivo.*afectad",
+        r"cultivo.*da[ñn]ad",
+        r"cultivo.*destru",
+        r"hect[aá]rea.*afectad",
+        r"hect[aá]rea.*perdid",
+        r"campa[ñn]a\s+agr[ií]cola",
+        r"emergencia\s+agr[ai]ria",
+        r"seguro\s+agr[ai]rio",
+        r"plaga",
+        r"crop\s+(loss|damage|failure)",
+        r"harvest\s+(loss|damage|fail)",
+        r"agricultural\s+(disaster|emergency|damage)",
+    ],
+    "impacto_ganadero": [
+        r"ganado\s+(muert|afectad|perdid)",
+        r"mortalidad.*ganado",
+        r"mortalidad.*alpaca",
+        r"mortalidad.*ovino",
+        r"alpaca.*muert",
+        r"ovino.*muert",
+        r"livestock\s+(death|loss|mortality)",
+    ],
+    "seguridad_alimentaria": [
+        r"seguridad\s+alimentaria",
+        r"inseguridad\s+alimentaria",
+        r"hambre",
+        r"hambruna",
+        r"desnutrici[oó]n",
+        r"food\s+security",
+        r"food\s+insecurity",
+        r"hunger",
+        r"famine",
+        r"malnutrition",
+    ],
+    "emergencias_institucional": [
+        r"declaratoria\s+de\s+emergencia",
+        r"estado\s+de\s+emergencia",
+        r"\bINDECI\b",
+        r"\bSENAMHI\b",
+        r"alerta\s+(meteorol[oó]gica|roja|naranja|amarilla)",
+        r"damnificad",
+        r"evacuaci[oó]n",
+        r"evacuad",
+        r"albergue",
+        r"ayuda\s+humanitaria",
+        r"emergency\s+declaration",
+        r"disaster\s+relief",
+        r"humanitarian\s+aid",
+    ],
+}
+
+# ── Regiones ──────────────────────────────────────────────────
+# Regiones para geolocalizacion
+regiones = {
+    "Lima": r"\bLima\b",
+    "Cusco": r"\bCusco\b|\bCuzco\b",
+    "Puno": r"\bPuno\b",
+    "Arequipa": r"\bArequipa\b",
+    "Junin": r"\bJun[ií]n\b",
+    "Huancavelica": r"\bHuancavelica\b",
+    "Ayacucho": r"\bAyacucho\b",
+    "Apurimac": r"\bApur[ií]mac\b",
+    "Ica": r"\bIca\b",
+    "Ancash": r"\b[AÁ]ncash\b",
+    "La Libertad": r"\bLa\s+Libertad\b",
+    "Piura": r"\bPiura\b",
+    "Cajamarca": r"\bCajamarca\b",
+    "Huanuco": r"\bHu[aá]nuco\b",
+    "Pasco": r"\bPasco\b",
+    "Tacna": r"\bTacna\b",
+    "Moquegua": r"\bMoquegua\b",
+    "Lambayeque": r"\bLambayeque\b",
+    "Loreto": r"\bLoreto\b",
+    "Madre de Dios": r"\bMadre\s+de\s+Dios\b",
+    "San Martin": r"\bSan\s+Mart[ií]n\b",
+    "Ucayali": r"\bUcayali\b",
+    "Amazonas": r"\bAmazonas\b",
+    "Tumbes": r"\bTumbes\b",
+}
+
+# ── Entidades (extracción desde cuerpos, script 04) ───────────
+
+# Regiones y capitales
+regiones_peru = {
+    "Amazonas": ["Chachapoyas", "Bagua", "Bongará", "Condorcanqui", "Luya", "Rodríguez de Mendoza", "Utcubamba"],
+    "Áncash": ["Huaraz", "Aija", "Antonio Raymondi", "Asunción", "Bolognesi", "Carhuaz", "Carlos Fermín Fitzcarrald", "Casma", "Corongo", "Huari", "Huarmey", "Huaylas", "Mariscal Luzuriaga", "Ocros", "Pallasca", "Pomabamba", "Recuay", "Santa", "Sihuas", "Yungay"],
+    "Apurímac": ["Abancay", "Andahuaylas", "Antabamba", "Aymaraes", "Chincheros", "Cotabambas", "Grau"],
+    "Arequipa": ["Arequipa", "Camaná", "Caravelí", "Castilla", "Caylloma", "Condesuyos", "Islay", "La Unión"],
+    "Ayacucho": ["Huamanga", "Cangallo", "Huanca Sancos", "Huanta", "La Mar", "Lucanas", "Parinacochas", "Páucar del Sara Sara", "Sucre", "Víctor Fajardo", "Vilcas Huamán"],
+    "Cajamarca": ["Cajamarca", "Cajabamba", "Celendín", "Chota", "Contumazá", "Cutervo", "Hualgayoc", "Jaén", "San Ignacio", "San Marcos", "San Miguel", "San Pablo", "Santa Cruz"],
+    "Cusco": ["Cusco", "Acomayo", "Anta", "Calca", "Canas", "Canchis", "Chumbivilcas", "Espinar", "La Convención", "Paruro", "Paucartambo", "Quispicanchi", "Urubamba", "Santa Teresa", "Quillabamba"],
+    "Huancavelica": ["Huancavelica", "Acobamba", "Angaraes", "Castrovirreyna", "Churcampa", "Huaytará", "Tayacaja"],
+    "Huánuco": ["Huánuco", "Ambo", "Dos de Mayo", "Huacaybamba", "Huamalíes", "Leoncio Prado", "Marañón", "Pachitea", "Puerto Inca", "Lauricocha", "Yarowilca"],
+    "Ica": ["Ica", "Chincha", "Nazca", "Palpa", "Pisco"],
+    "Junín": ["Huancayo", "Chanchamayo", "Chupaca", "Concepción", "Jauja", "Junín", "Satipo", "Tarma", "Yauli"],
+    "La Libertad": ["Trujillo", "Ascope", "Bolívar", "Chepén", "Julcán", "Otuzco", "Pacasmayo", "Pataz", "Sánchez Carrión", "Santiago de Chuco", "Gran Chimú", "Virú"],
+    "Lambayeque": ["Chiclayo", "Ferreñafe", "Lambayeque"],
+    "Lima": ["Lima", "Barranca", "Cajatambo", "Canta", "Cañete", "Huaral", "Huarochirí", "Huaura", "Oyón", "Yauyos"],
+    "Loreto": ["Iquitos", "Alto Amazonas", "Loreto", "Mariscal Ramón Castilla", "Maynas", "Requena", "Ucayali", "Datem del Marañón", "Putumayo"],
+    "Madre de Dios": ["Puerto Maldonado", "Manu", "Tahuamanu", "Tambopata"],
+    "Moquegua": ["Moquegua", "General Sánchez Cerro", "Ilo", "Mariscal Nieto"],
+    "Pasco": ["Cerro de Pasco", "Daniel Alcides Carrión", "Oxapampa", "Pasco"],
+    "Piura": ["Piura", "Ayabaca", "Huancabamba", "Morropón", "Paita", "Sechura", "Sullana", "Talara"],
+    "Puno": ["Puno", "Azángaro", "Carabaya", "Chucuito", "El Collao", "Huancané", "Lampa", "Melgar", "Moho", "San Antonio de Putina", "San Román", "Sandia", "Yunguyo", "Juliaca", "Ayaviri", "Ilave", "Juli"],
+    "San Martín": ["Moyobamba", "Bellavista", "El Dorado", "Huallaga", "Lamas", "Mariscal Cáceres", "Picota", "Rioja", "San Martín", "Tocache", "Tarapoto"],
+    "Tacna": ["Tacna", "Candarave", "Jorge Basadre", "Tarata"],
+    "Tumbes": ["Tumbes", "Contralmirante Villar", "Zarumilla"],
+    "Ucayali": ["Pucallpa", "Atalaya", "Coronel Portillo", "Padre Abad", "Purús"],
+}
+
+# Cultivos y productos agrícolas
+cultivos = {
+    "papa": r"\bpapa[s]?\b",
+    "maíz": r"\bma[ií]z\b",
+    "quinua": r"\bquinua\b|\bquinoa\b",
+    "arroz": r"\barroz\b",
+    "trigo": r"\btrigo\b",
+    "cebada": r"\bcebada\b",
+    "haba": r"\bhaba[s]?\b",
+    "oca": r"\boca[s]?\b(?!\s+de\s+lobo)",
+    "olluco": r"\bolluco[s]?\b",
+    "café": r"\bcaf[eé]\b",
+    "cacao": r"\bcacao\b",
+    "caña de azúcar": r"\bca[ñn]a\s+de\s+az[uú]car\b",
+    "algodón": r"\balgod[oó]n\b",
+    "espárrago": r"\besp[aá]rrago[s]?\b",
+    "uva": r"\buva[s]?\b",
+    "palta": r"\bpalta[s]?\b|\baguacate[s]?\b",
+    "mango": r"\bmango[s]?\b",
+    "arándano": r"\bar[aá]ndano[s]?\b",
+    "cebolla": r"\bcebolla[s]?\b",
+    "ajo": r"\bajo[s]?\b(?!\s+de)",
+    "alpaca": r"\balpaca[s]?\b",
+    "ovino": r"\bovino[s]?\b|\boveja[s]?\b",
+    "vacuno": r"\bvacuno[s]?\b|\bvaca[s]?\b|\bganado\s+vacuno\b",
+    "llama": r"\bllama[s]?\b(?!\s+(la|el|al|a\s+la|de))",
+    "vicuña": r"\bvicu[ñn]a[s]?\b",
+}
+
+# Patrones de cifras de afectación: un solo grupo de captura (el número) y,
+# opcionalmente, (?:mil\s+)? como multiplicador. Comodines no codiciosos para
+# que el grupo capture el número completo y no solo su último dígito.
+cifras_patrones = {
+    "hectareas_afectadas": [
+        r"([\d.,]+)\s*(?:mil\s+)?hect[aá]reas?\s+(?:afectad|da[ñn]ad|destruid|perdid|arrasad)",
+        r"afect[oóa]\s+(?:a\s+)?([\d.,]+)\s*(?:mil\s+)?hect[aá]reas?",
+        r"(?:pérdida|da[ñn]o)\s+(?:de\s+)?([\d.,]+)\s*(?:mil\s+)?hect[aá]reas?",
+    ],
+    "fallecidos": [
+        r"([\d.,]+)\s+(?:muerto|fallecid|v[ií]ctima|persona).{0,20}?(?:muert|fallec)",
+        r"(?:muert|fallec).{0,20}?([\d.,]+)\s+persona",
+        r"(?:cobr[oó]|dej[oó]|caus[oó]).{0,20}?([\d.,]+)\s+(?:muerto|fallecid|v[ií]ctima)",
+        r"(\d+)\s+muerto[s]?",
+        r"(\d+)\s+fallecido[s]?",
+    ],
+    "damnificados": [
+        r"([\d.,]+)\s*(?:mil\s+)?(?:damnificad|afectad)",
+        r"(?:damnific|afect).{0,15}?([\d.,]+)\s*(?:mil\s+)?(?:persona|familia|habitante)",
+    ],
+    "viviendas": [
+        r"([\d.,]+)\s*(?:mil\s+)?vivienda[s]?\s+(?:afectad|da[ñn]ad|destruid|colapsad|derrumbad|inundad)",
+        r"(?:afect|da[ñn]|destru|colaps).{0,15}?([\d.,]+)\s*(?:mil\s+)?vivienda",
+    ],
+    "familias": [
+        r"([\d.,]+)\s*(?:mil\s+)?familia[s]?\s+(?:afectad|damnificad)",
+    ],
+}
+
+# Unidad de cada tipo de cifra
+cifras_unidades = {
+    "hectareas_afectadas": "ha",
+    "fallecidos": "personas",
+    "damnificados": "personas",
+    "viviendas": "viviendas",
+    "familias": "familias",
+}
+
+# ── Datos duros (script 05) ───────────────────────────────────
+
+# Tipo de amenaza de DesInventar / EM-DAT / INDECI → tema de 02.
+# Se prueba en este orden y gana el primero que coincide
+# ("inundación por lluvias intensas" → inundaciones_huaicos).
+amenazas = {
+    "heladas_friaje": [r"helada", r"friaje", r"nevada", r"ola\s+de\s+fr[ií]o", r"baja[s]?\s+temperatura",
+                       r"cold\s+wave", r"frost", r"severe\s+winter"],
+    "granizadas": [r"granizad", r"granizo", r"hail"],
+    "deslizamientos": [r"deslizamiento", r"derrumbe", r"alud", r"aluvi[oó]n", r"reptaci[oó]n",
+                       r"landslide", r"mudslide", r"avalanche", r"mass\s+movement"],
+    "inundaciones_huaicos": [r"inundaci[oó]n", r"huayc?o", r"huaico", r"desborde", r"crecida",
+                             r"flood", r"riverine"],
+    "sequias": [r"sequ[ií]a", r"d[eé]ficit\s+h[ií]drico", r"drought"],
+    "lluvias_intensas": [r"lluvia", r"precipitaci[oó]n", r"tormenta", r"vendaval",
+                         r"storm", r"heavy\s+rain"],
+    "el_nino_variabilidad": [r"ni[ñn]o", r"ni[ñn]a"],
+}
+
+# Código de departamento del ubigeo INEI (2 primeros dígitos) → región
+# con el mismo nombre que en `regiones`
+departamentos_ubigeo = {
+    "01": "Amazonas", "02": "Ancash", "03": "Apurimac", "04": "Arequipa", "05": "Ayacucho",
+    "06": "Cajamarca", "07": "Callao", "08": "Cusco", "09": "Huancavelica", "10": "Huanuco",
+    "11": "Ica", "12": "Junin", "13": "La Libertad", "14": "Lambayeque", "15": "Lima",
+    "16": "Loreto", "17": "Madre de Dios", "18": "Moquegua", "19": "Pasco", "20": "Piura",
+    "21": "Puno", "22": "San Martin", "23": "Tacna", "24": "Tumbes", "25": "Ucayali",
+}
+
+# Departamentos sin región propia en `regiones` → región con la que se cruzan.
+# La prensa reporta el Callao junto con Lima ("Lima y Callao")
+departamentos_equivalentes = {"Callao": "Lima"}
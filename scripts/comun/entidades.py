@@ -0,0 +1,135 @@
+"""
+entidades.py
+Extracción de entidades de un artículo normalizado (lugares, cultivos,
+cifras de afectación). Vive fuera de 04 para que los procesos del pool
+puedan importarla: `preparar` construye gazetteer y patrones una vez por
+proceso (initializer del pool) y `extraer_lote` procesa una tanda.
+
+Cada lugar o cultivo encontrado se emite además como mención con offsets
+(`registro['menciones']`). Las entidades se identifican con un ID entero del
+catálogo, que se arma de forma determinista desde los diccionarios: todos
+los procesos (y todas las corridas con los mismos diccionarios) asignan
+el mismo ID a la misma entidad.
+"""
+
+import re
+
+from comun.cifras import compilar_cifras, extraer_cifras
+from comun.diccionarios import regiones_peru, cultivos, cifras_patrones, cifras_unidades
+from comun.gazetteer import construir_gazetteer, buscar
+from comun.normalizar import a_original, plegar_patron
+
+TIPOS_CIFRA = list(cifras_patrones)
+TIPOS_ENTIDAD = ["region", "provincia", "distrito", "cultivo"]   # código = posición
+
+_estado = {}
+
+
+def construir_catalogo(distritos=()):
+    """[(tipo, nombre, region)] en orden fijo; el ID de una entidad es su posición."""
+    catalogo = []
+    for region, provincias in regiones_peru.items():
+        catalogo.append(("region", region, region))
+        catalogo += [("provincia", prov, region) for prov in provincias]
+    catalogo += [("distrito", distrito, region) for distrito, _prov, region in distritos]
+    catalogo += [("cultivo", c, None) for c in cultivos]
+    return list(dict.fromkeys(catalogo))
+
+
+def compilar_cultivos():
+    """Un solo regex con un grupo k<i> por cultivo (los nombres no son identificadores)."""
+    return re.compile("|".join(
+        f"(?P<k{i}>{plegar_patron(p)})" for i, p in enumerate(cultivos.values())
+    ))
+
+
+def preparar(distritos=()):
+    """Construye gazetteer, catálogo y compila patrones plegados (una vez por proceso)."""
+    _estado['gazetteer'] = construir_gazetteer(regiones_peru, distritos)
+    _estado['catalogo'] = {e: i for i, e in enumerate(construir_catalogo(distritos))}
+    _estado['cultivos'] = compilar_cultivos()
+    _estado['cifras'] = compilar_cifras(cifras_patrones)
+
+
+def patrones_plegados():
+    """[(grupo, patron)] de cultivos y cifras, para la guarda de backtracking."""
+    return (
+        [(f"cultivo:{c}", plegar_patron(p)) for c, p in cultivos.items()]
+        + [(f"cifra:{t}", plegar_patron(p)) for t, ps in cifras_patrones.items() for p in ps]
+    )
+
+
+def extraer_articulo(art):
+    """Registro de entidades de un artículo con `texto_norm` (salida de 03a).
+
+    Además del máximo por tipo de cifra, `registro['cifras']` trae todos los
+    spans de cifras (ver comun/cifras.py) para auditar de dónde sale cada valor.
+    `registro['menciones']`: [(tipo, entidad_id, inicio, fin, superficie)] con
+    offsets en el texto original y la superficie tal como aparece en el
+    texto normalizado.
+    """
+    if not _estado:
+        preparar()
+    texto = art['texto_norm']
+    seg_norm, seg_orig = art.get('seg_norm') or (), art.get('seg_orig') or ()
+    catalogo = _estado['catalogo']
+    menciones = []
+
+    def mencion(entrada, inicio, fin):
+        menciones.append((
+            TIPOS_ENTIDAD.index(entrada[0]),
+            catalogo[entrada],
+            a_original(seg_norm, seg_orig, inicio),
+            a_original(seg_norm, seg_orig, fin - 1) + 1,
+            texto[inicio:fin],
+        ))
+
+    registro = {
+        'url': art['url'],
+        'domain': art['domain'],
+        'fecha': art['fecha'],
+        'title': art.get('title', ''),
+        'temas': list(art.get('temas', [])),
+    }
+
+    # 1. Detectar regiones, provincias y distritos (una pasada por el gazetteer)
+    regiones_encontradas = []
+    provincias_encontradas = []
+    distritos_encontrados = []
+
+    for entrada, inicio, fin in buscar(_estado['gazetteer'], texto):
+        tipo, nombre, region = entrada
+        mencion(entrada, inicio, fin)
+        if tipo == "region":
+            regiones_encontradas.append(region)
+        elif tipo == "provincia":
+            provincias_encontradas.append(f"{nombre} ({region})")
+        else:
+            distritos_encontrados.append(f"{nombre} ({region})")
+
+    registro['regiones'] = sorted(set(regiones_encontradas))
+    registro['provincias'] = sorted(set(provincias_encontradas))
+    registro['distritos'] = sorted(set(distritos_encontrados))
+
+    # 2. Detectar cultivos (una pasada, todas las menciones)
+    nombres_cultivos = list(cultivos)
+    encontrados = set()
+    for m in _estado['cultivos'].finditer(texto):
+        nombre = nombres_cultivos[int(m.lastgroup[1:])]
+        encontrados.add(nombre)
+        mencion(("cultivo", nombre, None), *m.span())
+    registro['cultivos'] = [c for c in nombres_cultivos if c in encontrados]
+
+    # 3. Extraer cifras (spans con offsets al texto original)
+    spans = extraer_cifras(*_estado['cifras'], cifras_unidades, texto, seg_norm, seg_orig)
+    for tipo_cifra in cifras_patrones:
+        valores = [s['valor'] for s in spans if s['tipo'] == tipo_cifra]
+        registro[tipo_cifra] = round(max(valores)) if valores else None
+    registro['cifras'] = spans
+    registro['menciones'] = menciones
+
+    return registro
+
+
+def extraer_lote(arts):
+    return [extraer_articulo(a) for a in arts]
@@ -0,0 +1,80 @@
+"""
+gazetteer.py
+Gazetteer de lugares (regiones, provincias, distritos) como trie de tokens.
+Se construye una sola vez; cada texto se recorre en una pasada: desde cada
+token se baja por el trie mientras los tokens siguientes coincidan, y se
+reportan todos los nombres completos encontrados en el camino.
+Como se trabaja con tokens \\w+, los límites de palabra quedan garantizados
+(equivale a \\bnombre\\b) y el costo por texto depende del número de tokens
+y de la longitud máxima de un nombre, no del tamaño del gazetteer.
+"""
+
+import re
+import pandas as pd
+
+from comun.normalizar import plegar
+
+_TOKEN = re.compile(r"\w+")
+_FIN = None   # clave de las entradas terminales en cada nodo
+
+
+def _tokens(nombre):
+    return [m.group() for m in _TOKEN.finditer(plegar(nombre))]
+
+
+def agregar(trie, nombre, entrada):
+    """Agrega un nombre (se pliega y tokeniza) con su entrada (tipo, nombre, region)."""
+    nodo = trie
+    for tok in _tokens(nombre):
+        nodo = nodo.setdefault(tok, {})
+    nodo.setdefault(_FIN, []).append(entrada)
+
+
+def construir_gazetteer(regiones_peru, distritos=None, min_chars=4):
+    """Trie con regiones y provincias de `regiones_peru` y distritos opcionales.
+
+    Provincias/distritos de menos de `min_chars` caracteres se omiten para
+    evitar matches cortos (mismo criterio que la versión regex de 04).
+    distritos: iterable de (distrito, provincia, region).
+    """
+    trie = {}
+    for region, provincias in regiones_peru.items():
+        agregar(trie, region, ("region", region, region))
+        for prov in provincias:
+            if len(prov) >= min_chars:
+                agregar(trie, prov, ("provincia", prov, region))
+    for distrito, _prov, region in distritos or []:
+        if len(distrito) >= min_chars:
+            agregar(trie, distrito, ("distrito", distrito, region))
+    return trie
+
+
+def cargar_distritos(path, regiones_peru):
+    """Lee un CSV de ubigeos INEI (columnas departamento, provincia, distrito).
+
+    Los nombres de departamento se alinean con las claves de regiones_peru
+    vía plegado (ANCASH → Áncash).
+    """
+    df = pd.read_csv(path, dtype=str, usecols=["departamento", "provincia", "distrito"])
+    por_plegado = {plegar(r): r for r in regiones_peru}
+    return [
+        (d.title(), p.title(), por_plegado.get(plegar(dep), dep.title()))
+        for dep, p, d in df.itertuples(index=False)
+    ]
+
+
+def buscar(trie, texto):
+    """Todas las menciones en `texto` (ya normalizado): [(entrada, inicio, fin)]."""
+    toks = [(m.group(), m.start(), m.end()) for m in _TOKEN.finditer(texto)]
+    menciones = []
+    for i, (tok, inicio, _) in enumerate(toks):
+        nodo = trie.get(tok)
+        j = i
+        while nodo is not None:
+            for entrada in nodo.get(_FIN, ()):
+                menciones.append((entrada, inicio, toks[j][2]))
+            j += 1
+            if j == len(toks):
+                break
+            nodo = nodo.get(toks[j][0])
+    return menciones
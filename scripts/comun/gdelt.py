@@ -0,0 +1,324 @@
+"""
+gdelt.py
+Cliente de la DOC API de GDELT compartido por la cosecha (01) y los scripts
+de exploración (00, 00b), con caché de respuestas en SQLite
+(data/db/gdelt_cache.sqlite).
+
+La clave de caché son los parámetros de la consulta (query, modo, ventana,
+maxrecords...), así una exploración que repite una consulta ya hecha por la
+cosecha, o por una corrida anterior, responde al instante. Vigencia:
+- ventanas cerradas (terminan antes del trimestre en curso): TTL_CERRADA
+- ventanas del trimestre en curso: TTL_ABIERTA, GDELT sigue sumando artículos
+Las ventanas abiertas (terminan en ahora() o después) se guardan con la clave
+de su periodo, sin el fin: cada corrida reemplaza la fila anterior en lugar
+de sumar una por hora, y el TTL decide cuándo volver a pedirla.
+
+La caché solo responde a una ventana idéntica, así que todos piden los mismos
+periodos de calendario: trimestres para artículos (como la cosecha de 01) y
+años para timelines (timelinevolraw, como el modo timeline de 01).
+articulos_alineados y timeline_alineado responden un rango cualquiera con la
+unión de esos periodos, recortada al rango; timelinevol se calcula desde
+timelinevolraw (100 · value / norm) en vez de pedirse aparte.
+
+Ritmo compartido entre procesos: las consultas que no están en caché piden
+turno en data/db/gdelt_ritmo.sqlite, así la cosecha y una exploración que
+corren a la vez se reparten el mismo ritmo (una request cada PAUSA segundos
+en total) en lugar de sumar el suyo. Cada turno se reserva dentro de una
+transacción BEGIN IMMEDIATE, que hace de candado entre procesos e hilos. Un 429
+en cualquier proceso corre la próxima request de todos (espera compartida,
+creciente mientras se repitan los 429). en_paralelo corre los recorridos de
+exploración con varios hilos: lo que está en caché responde al instante y
+solo los fallos de caché esperan turno.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from comun.artefactos import ruta
+
+BASE_URL = "https://api.gdeltproject.org/api/v2/doc/doc"
+PAUSA = 10                       # segundos entre requests reales
+RETRY_WAIT = 35                  # espera base ante 429
+MAX_RETRIES = 4
+TIMEOUT = 30
+MAX_RECORDS = 250
+TIMELINE_RAW = "timelinevolraw"  # value = artículos de la query, norm = total monitoreado
+TTL_CERRADA = 365 * 24 * 3600    # ventanas históricas: prácticamente fijas
+TTL_ABIERTA = 6 * 3600           # trimestre en curso
+FORMATO = "%Y%m%d%H%M%S"
+FIN_ABIERTO = "ahora"            # enddatetime de la clave de las ventanas abiertas
+HILOS = 4
+
+CACHE_PATH = ruta("gdelt_cache")
+RITMO_PATH = ruta("gdelt_ritmo")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS respuestas (
+    clave     TEXT PRIMARY KEY,
+    params    TEXT NOT NULL,
+    guardado  REAL NOT NULL,
+    expira    REAL NOT NULL,
+    respuesta TEXT NOT NULL
+);
+"""
+
+# Una sola fila: próximo turno libre, fin de la espera por 429 y racha de 429
+ESQUEMA_RITMO = """
+CREATE TABLE IF NOT EXISTS ritmo (
+    id          INTEGER PRIMARY KEY CHECK (id = 1),
+    proximo     REAL NOT NULL,
+    espera_429  REAL NOT NULL,
+    racha_429   INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO ritmo VALUES (1, 0, 0, 0);
+"""
+
+_local = threading.local()
+
+
+def ahora():
+    """Fin de las ventanas abiertas: la hora en punto, para que la clave sea estable."""
+    return datetime.now().replace(minute=0, second=0, microsecond=0)
+
+
+def parametros(query, modo, start, end, **extra):
+    """Parámetros de la DOC API para una ventana [start, end]."""
+    params = {
+        "query": query,
+        "mode": modo,
+        "format": "json",
+        "startdatetime": start.strftime(FORMATO),
+        "enddatetime": end.strftime(FORMATO),
+    }
+    params.update({k: v for k, v in extra.items() if v is not None})
+    return params
+
+
+def clave(params):
+    """Hash de los parámetros; las ventanas abiertas usan FIN_ABIERTO como fin."""
+    if params.get("enddatetime", "") >= ahora().strftime(FORMATO):
+        params = {**params, "enddatetime": FIN_ABIERTO}
+    texto = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def ttl(params):
+    """TTL_CERRADA si la ventana termina antes del trimestre en curso."""
+    hoy = datetime.now()
+    inicio_trimestre = datetime(hoy.year, 3 * ((hoy.month - 1) // 3) + 1, 1)
+    fin = datetime.strptime(params["enddatetime"], FORMATO)
+    return TTL_CERRADA if fin < inicio_trimestre else TTL_ABIERTA
+
+
+def _conexion():
+    """Una conexión por hilo (sqlite3 no comparte conexiones entre hilos)."""
+    con = getattr(_local, "con", None)
+    if con is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(CACHE_PATH, timeout=30)
+        con.execute("PRAGMA journal_mode = WAL")
+        con.execute("PRAGMA synchronous = NORMAL")
+        con.executescript(ESQUEMA)
+        _local.con = con
+    return con
+
+
+def leer_cache(params):
+    """Respuesta vigente en caché o None. Un artlist con menos registros se
+    responde recortando el de MAX_RECORDS de la misma ventana."""
+    con = _conexion()
+    candidatos = [params]
+    if params.get("mode") == "artlist" and int(params.get("maxrecords", MAX_RECORDS)) < MAX_RECORDS:
+        candidatos.append({**params, "maxrecords": MAX_RECORDS})
+    for p in candidatos:
+        fila = con.execute("SELECT respuesta FROM respuestas WHERE clave = ? AND expira > ?",
+                           (clave(p), time.time())).fetchone()
+        if fila:
+            data = json.loads(fila[0])
+            if p is not params:
+                data["articles"] = data.get("articles", [])[:int(params["maxrecords"])]
+            return data
+    return None
+
+
+def guardar_cache(params, data):
+    """Guarda la respuesta y de paso borra las vencidas (no vuelven a servir)."""
+    con = _conexion()
+    guardado = time.time()
+    with con:
+        con.execute("DELETE FROM respuestas WHERE expira <= ?", (guardado,))
+        con.execute("INSERT OR REPLACE INTO respuestas VALUES (?, ?, ?, ?, ?)",
+                    (clave(params), json.dumps(params, sort_keys=True, ensure_ascii=False),
+                     guardado, guardado + ttl(params), json.dumps(data, ensure_ascii=False)))
+
+
+def _conexion_ritmo():
+    con = getattr(_local, "ritmo", None)
+    if con is None:
+        RITMO_PATH.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(RITMO_PATH, timeout=60, isolation_level=None)
+        con.execute("PRAGMA journal_mode = WAL")
+        con.executescript(ESQUEMA_RITMO)
+        _local.ritmo = con
+    return con
+
+
+def _transaccion(cambio):
+    """Aplica cambio(proximo, espera_429, racha) → (proximo, espera_429, racha, resultado)
+    a la fila de ritmo bajo el candado de escritura de SQLite."""
+    con = _conexion_ritmo()
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        proximo, espera_429, racha = con.execute(
+            "SELECT proximo, espera_429, racha_429 FROM ritmo WHERE id = 1").fetchone()
+        resultado = cambio(proximo, espera_429, racha)
+        con.execute("UPDATE ritmo SET proximo = ?, espera_429 = ?, racha_429 = ? WHERE id = 1",
+                    resultado[:3])
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    return resultado[3]
+
+
+def _esperar_turno():
+    """Reserva el próximo turno libre (compartido entre procesos) y lo espera.
+    Si mientras tanto otro proceso recibió un 429, reserva de nuevo tras la espera."""
+    def reservar(proximo, espera_429, racha):
+        turno = max(time.time(), proximo, espera_429)
+        return turno + PAUSA, espera_429, racha, turno
+    while True:
+        espera = _transaccion(reservar) - time.time()
+        if espera > 0:
+            time.sleep(espera)
+        espera_429, = _conexion_ritmo().execute("SELECT espera_429 FROM ritmo WHERE id = 1").fetchone()
+        if espera_429 <= time.time():
+            return
+
+
+def _registrar_429():
+    """Corre la próxima request de todos los procesos; devuelve la espera en segundos."""
+    def retroceder(proximo, espera_429, racha):
+        fin = max(espera_429, time.time() + RETRY_WAIT * (racha + 1))
+        return proximo, fin, racha + 1, fin - time.time()
+    return _transaccion(retroceder)
+
+
+def _registrar_exito():
+    con = _conexion_ritmo()
+    con.execute("UPDATE ritmo SET racha_429 = 0 WHERE id = 1 AND racha_429 > 0")
+
+
+def consultar(params, log=print, cache=True):
+    """JSON de la DOC API, desde la caché si hay respuesta vigente.
+    None si falla tras los reintentos (los fallos no se guardan)."""
+    if cache:
+        data = leer_cache(params)
+        if data is not None:
+            return data
+    for attempt in range(MAX_RETRIES):
+        _esperar_turno()
+        try:
+            r = requests.get(BASE_URL, params=params, timeout=TIMEOUT)
+            if r.status_code == 429:
+                wait = _registrar_429()
+                log(f"    429 — pausa compartida de {wait:.0f}s (intento {attempt+1})")
+                continue
+            if r.status_code != 200:
+                log(f"    HTTP {r.status_code}")
+                return None
+            _registrar_exito()
+            data = r.json()
+        except json.JSONDecodeError:
+            log(f"    JSON inválido (intento {attempt+1})")
+            time.sleep(15)
+            continue
+        except Exception as e:
+            log(f"    Error: {str(e)[:60]} (intento {attempt+1})")
+            time.sleep(15)
+            continue
+        if cache:
+            guardar_cache(params, data)
+        return data
+    return None
+
+
+def articulos(query, start, end, max_records=MAX_RECORDS, log=print, **extra):
+    """Lista de artículos (modo artlist); [] si la consulta falla."""
+    data = consultar(parametros(query, "artlist", start, end, maxrecords=max_records, **extra), log)
+    return (data or {}).get("articles", [])
+
+
+def timeline(query, start, end, modo="timelinevol", log=print, **extra):
+    """Puntos de la curva de un modo timeline ([{"date", "value", ...}]); None si falla."""
+    data = consultar(parametros(query, modo, start, end, **extra), log)
+    if data is None:
+        return None
+    return (data.get("timeline") or [{}])[0].get("data", [])
+
+
+# ── Ventanas alineadas con la cosecha ─────────────────────────
+def trimestres(inicio, fin):
+    """[(nombre, start, end)] de los trimestres que tocan [inicio, fin], como los
+    pide 01: end = último día del trimestre (00:00), sin pasar de ahora()."""
+    tope = ahora()
+    salida = []
+    for anio in range(inicio.year, fin.year + 1):
+        for q in range(1, 5):
+            start = datetime(anio, 3 * q - 2, 1)
+            end = (datetime(anio + 1, 1, 1) if q == 4 else datetime(anio, 3 * q + 1, 1)) - timedelta(days=1)
+            if start > tope:
+                return salida
+            if start <= fin and end + timedelta(days=1) > inicio:
+                salida.append((f"{anio}Q{q}", start, min(end, tope)))
+    return salida
+
+
+def anios(inicio, fin):
+    """[(nombre, start, end)] de los años que tocan [inicio, fin], sin pasar de ahora()."""
+    tope = ahora()
+    return [(str(a), datetime(a, 1, 1), min(datetime(a, 12, 31, 23, 59, 59), tope))
+            for a in range(inicio.year, fin.year + 1) if datetime(a, 1, 1) <= tope]
+
+
+def _en_rango(fecha, inicio, fin):
+    """fecha de GDELT ("20240115T103000Z") dentro de [inicio, fin]."""
+    return inicio.strftime("%Y%m%dT%H%M%SZ") <= (fecha or "") <= fin.strftime("%Y%m%dT%H%M%SZ")
+
+
+def articulos_alineados(query, inicio, fin, max_records=MAX_RECORDS, log=print, **extra):
+    """Artículos de [inicio, fin] pedidos por trimestre (claves de la cosecha).
+    Cada trimestre aporta hasta max_records, no el rango completo."""
+    vistos, salida = set(), []
+    for _, start, end in trimestres(inicio, fin):
+        for a in articulos(query, start, end, max_records, log, **extra):
+            if a.get("url") not in vistos and _en_rango(a.get("seendate"), inicio, fin):
+                vistos.add(a.get("url"))
+                salida.append(a)
+    return salida
+
+
+def timeline_alineado(query, inicio, fin, modo="timelinevol", log=print, **extra):
+    """Curva de [inicio, fin] pedida por año; None si falla algún año."""
+    pedido = TIMELINE_RAW if modo == "timelinevol" else modo
+    puntos = []
+    for _, start, end in anios(inicio, fin):
+        datos = timeline(query, start, end, pedido, log, **extra)
+        if datos is None:
+            return None
+        puntos += [p for p in datos if _en_rango(p.get("date"), inicio, fin)]
+    if modo == "timelinevol":
+        puntos = [{**p, "value": 100 * p["value"] / p["norm"] if p.get("norm") else 0.0} for p in puntos]
+    return puntos
+
+
+def en_paralelo(funcion, argumentos, hilos=HILOS):
+    """[funcion(*a) for a in argumentos] con varios hilos, en el mismo orden."""
+    with ThreadPoolExecutor(hilos) as pool:
+        return list(pool.map(lambda a: funcion(*a), argumentos))
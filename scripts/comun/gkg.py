@@ -0,0 +1,203 @@
+"""
+gkg.py
+Lectura en streaming de los archivos masivos de GDELT 2.0 (un zip con un CSV
+tabulado cada 15 minutos) para llegar más atrás que el tope de 250 registros
+por consulta de la DOC API:
+- <ts>.gkg.csv.zip          Global Knowledge Graph 2.1 (un registro por documento)
+- <ts>.mentions.CSV.zip     menciones de eventos; el país sale del evento, así que
+                            se necesita el <ts>.export.CSV.zip del mismo intervalo
+Las variantes <ts>.translation.* traen las fuentes no inglesas traducidas.
+
+Cada archivo se descomprime como flujo y se recorre línea a línea sin
+decodificar: primero un filtro barato sobre bytes (¿aparece el código de país
+o el dominio nacional?) y solo las líneas que pasan se decodifican y se parten.
+Las filas que quedan siguen el esquema de la DOC API artlist (url, title,
+seendate, domain, language, sourcecountry, ...) para unirse al corpus de 01.
+title_origen dice de dónde sale el título: "pagina" (PAGE_TITLE del GKG) o
+"slug" (palabras de la URL: mentions no trae título, y algunos registros GKG
+tampoco). Un slug va en minúsculas y sin tildes ni puntuación, así que 02 lo
+deja fuera de la detección sobre títulos y de las series de cobertura.
+_plan es el plan de la cosecha de 01 al que equivaldría la fila (ver
+plan_equivalente), así la prensa en español de fuera de Perú queda fuera de
+la cobertura peruana (series.cobertura_peruana) igual que en la DOC API.
+"""
+
+import html
+import re
+import zipfile
+from urllib.parse import urlsplit
+
+from comun.normalizar import plegar
+
+# ── Columnas (0-based, sin encabezado) ────────────────────────
+# GKG 2.1
+GKG_FECHA, GKG_DOMINIO, GKG_URL = 1, 3, 4
+GKG_TEMAS, GKG_LUGARES, GKG_LUGARES_V2 = 7, 9, 10
+GKG_IMAGEN, GKG_TRADUCCION, GKG_EXTRAS = 18, 25, 26
+GKG_N_COLUMNAS = 27
+# Eventos 2.0 (export): país FIPS de actor 1, actor 2 y lugar de la acción
+EV_ID, EV_PAISES = 0, (37, 45, 53)
+# Mentions 2.0
+MEN_EVENTO, MEN_FECHA, MEN_TIPO, MEN_DOMINIO, MEN_URL, MEN_TRADUCCION = 0, 2, 3, 4, 5, 14
+MEN_TIPO_WEB = "1"
+
+# Idioma de origen (srclc: ISO 639-3) → nombre como en la DOC API
+IDIOMAS = {
+    "spa": "Spanish", "eng": "English", "por": "Portuguese", "fra": "French",
+    "deu": "German", "ita": "Italian", "que": "Quechua", "zho": "Chinese",
+}
+# title_origen
+ORIGEN_PAGINA, ORIGEN_SLUG = "pagina", "slug"
+
+# Dominio nacional → país de la fuente (la DOC API lo infiere igual, por dominio)
+PAISES_TLD = {
+    "pe": "Peru", "cl": "Chile", "bo": "Bolivia", "ec": "Ecuador", "co": "Colombia",
+    "ar": "Argentina", "mx": "Mexico", "es": "Spain", "br": "Brazil", "ve": "Venezuela",
+}
+
+_TITULO = re.compile(r"<PAGE_TITLE>(.*?)</PAGE_TITLE>", re.S)
+_SEPARADORES_URL = re.compile(r"[-_/.+]+")
+
+
+def tipo_archivo(nombre):
+    """'gkg', 'mentions', 'export' o None según el nombre del archivo."""
+    nombre = nombre.lower()
+    for tipo in ("gkg", "mentions", "export"):
+        if nombre.endswith(f".{tipo}.csv.zip"):
+            return tipo
+    return None
+
+
+def lineas(path):
+    """Líneas (bytes) del CSV dentro del zip, descomprimidas a medida que se leen."""
+    with zipfile.ZipFile(path) as z:
+        with z.open(z.namelist()[0]) as f:
+            yield from f
+
+
+def idioma(traduccion):
+    """'srclc:spa;eng:GT-SPA 1.0' → 'Spanish'; sin traducción, la fuente es inglesa."""
+    if not traduccion.startswith("srclc:"):
+        return "English"
+    codigo = traduccion[6:].split(";", 1)[0]
+    return IDIOMAS.get(codigo, codigo)
+
+
+def pais_fuente(dominio):
+    return PAISES_TLD.get(dominio.rsplit(".", 1)[-1])
+
+
+def plan_equivalente(sourcecountry, language):
+    """Plan de PLANES (01) que habría traído la fila: "pe" (español, dominio
+    peruano), "es_ext" (español, otro dominio) o "todo" (otros idiomas)."""
+    if language != "Spanish":
+        return "todo"
+    return "pe" if sourcecountry == "Peru" else "es_ext"
+
+
+def texto_url(url):
+    """Palabras del slug de la URL ('/inundaciones-en-piura-dejan-...')."""
+    return _SEPARADORES_URL.sub(" ", urlsplit(url).path).strip()
+
+
+def trimestre(fecha):
+    """'20230515...' → '2023Q2' (mismo formato que _trimestre en 01)."""
+    return f"{fecha[:4]}Q{(int(fecha[4:6]) - 1) // 3 + 1}"
+
+
+def _fila(url, title, title_origen, fecha, domain, language, socialimage, origen):
+    return {
+        "url": url,
+        "url_mobile": "",
+        "title": title,
+        "title_origen": title_origen,
+        "seendate": f"{fecha[:8]}T{fecha[8:14]}Z",
+        "socialimage": socialimage,
+        "domain": domain,
+        "language": language,
+        "sourcecountry": pais_fuente(domain),
+        "_query": origen,
+        "_plan": plan_equivalente(pais_fuente(domain), language),
+        "_trimestre": trimestre(fecha),
+    }
+
+
+def _paises(lugares):
+    """Códigos de país de un campo de lugares GKG (Tipo#Nombre#País#...;...)."""
+    return {lugar.split("#", 3)[2] for lugar in lugares.split(";") if lugar.count("#") >= 3}
+
+
+def filtrar_gkg(path, patron, prefijos_temas=(), pais="PE", tld="pe"):
+    """Filas de un archivo GKG sobre `pais` (lugares o dominio nacional) y los temas.
+
+    Un registro pasa si menciona un lugar del país o viene de un dominio .tld,
+    y además el título o el slug de la URL coinciden con `patron` (regex sobre
+    texto plegado) o alguno de sus temas GKG empieza por `prefijos_temas`.
+    """
+    marca_lugar = f"#{pais}#".encode()
+    marca_dominio = f".{tld}\t".encode()
+    prefijos_temas = tuple(prefijos_temas)
+    filas, vistas = [], set()
+
+    for linea in lineas(path):
+        if marca_lugar not in linea and marca_dominio not in linea:
+            continue
+        campos = linea.decode("utf-8", errors="replace").rstrip("\r\n").split("\t")
+        if len(campos) < GKG_N_COLUMNAS or campos[GKG_URL] in vistas:
+            continue
+        dominio = campos[GKG_DOMINIO]
+        if not (dominio.endswith(f".{tld}")
+                or pais in _paises(campos[GKG_LUGARES_V2] or campos[GKG_LUGARES])):
+            continue
+
+        m = _TITULO.search(campos[GKG_EXTRAS])
+        titulo = html.unescape(m.group(1)).strip() if m else ""
+        url = campos[GKG_URL]
+        tema_gkg = prefijos_temas and any(t.startswith(prefijos_temas)
+                                          for t in campos[GKG_TEMAS].split(";"))
+        if not (tema_gkg or patron.search(plegar(f"{titulo} {texto_url(url)}"))):
+            continue
+
+        vistas.add(url)
+        origen_titulo = ORIGEN_PAGINA if titulo else ORIGEN_SLUG
+        filas.append(_fila(url, titulo or texto_url(url), origen_titulo,
+                           campos[GKG_FECHA], dominio,
+                           idioma(campos[GKG_TRADUCCION]),
+                           campos[GKG_IMAGEN], "gkg"))
+    return filas
+
+
+def eventos_pais(path, pais="PE"):
+    """IDs (bytes) de los eventos de un export con actor o acción en `pais`."""
+    codigo = pais.encode()
+    marca = b"\t" + codigo + b"\t"
+    ids = set()
+    for linea in lineas(path):
+        if marca not in linea:
+            continue
+        campos = linea.split(b"\t")
+        if len(campos) > max(EV_PAISES) and any(campos[i] == codigo for i in EV_PAISES):
+            ids.add(campos[EV_ID])
+    return ids
+
+
+def filtrar_menciones(path, eventos, patron):
+    """Filas de un archivo mentions cuyas menciones web son de `eventos` y cuyo
+    slug de URL coincide con `patron` (mentions no trae título: se usa el slug)."""
+    filas, vistas = [], set()
+    for linea in lineas(path):
+        evento = linea[:linea.find(b"\t")]
+        if evento not in eventos:
+            continue
+        campos = linea.decode("utf-8", errors="replace").rstrip("\r\n").split("\t")
+        if len(campos) <= MEN_TRADUCCION or campos[MEN_TIPO] != MEN_TIPO_WEB:
+            continue
+        url = campos[MEN_URL]
+        slug = texto_url(url)
+        if url in vistas or not patron.search(plegar(slug)):
+            continue
+        vistas.add(url)
+        filas.append(_fila(url, slug, ORIGEN_SLUG, campos[MEN_FECHA], campos[MEN_DOMINIO],
+                           idioma(campos[MEN_TRADUCCION]),
+                           "", "mentions"))
+    return filas
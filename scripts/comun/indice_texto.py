@@ -0,0 +1,229 @@
+"""
+indice_texto.py
+Índice de texto completo (SQLite FTS5) sobre títulos y cuerpos, para
+ajustar diccionarios sin recorrer el corpus: probar una palabra clave
+candidata, ver en qué meses/temas aparece y revisar falsos positivos con
+snippets resaltados.
+
+Tablas:
+- articulos (id, url única, fecha, mes, domain, temas_bits): una fila por
+  artículo, clasificado o no (temas_bits = 0: ningún tema del diccionario,
+  justo los que interesa revisar al probar palabras candidatas)
+- articulo_tema (articulo_id, tema): temas asignados por 02 (títulos)
+- textos (FTS5, rowid = articulos.id): title, cuerpo
+- estado (clave, valor): progreso de la carga incremental
+
+El tokenizador unicode61 con remove_diacritics ignora tildes y mayúsculas
+(«sequía» = «sequia»). Los índices de prefijo aceleran consultas tipo helad*.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS articulos (
+    id      INTEGER PRIMARY KEY,
+    url     TEXT NOT NULL UNIQUE,
+    fecha   TEXT,
+    mes     TEXT,
+    domain  TEXT,
+    temas_bits INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_articulos_mes ON articulos (mes);
+CREATE TABLE IF NOT EXISTS articulo_tema (
+    articulo_id INTEGER NOT NULL REFERENCES articulos (id),
+    tema        TEXT NOT NULL,
+    PRIMARY KEY (articulo_id, tema)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_articulo_tema_tema ON articulo_tema (tema);
+CREATE VIRTUAL TABLE IF NOT EXISTS textos USING fts5 (
+    title, cuerpo,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '3 4'
+);
+CREATE TABLE IF NOT EXISTS estado (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+
+def abrir(path):
+    """Abre (y crea si hace falta) la base del índice."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode = WAL")
+    con.execute("PRAGMA synchronous = NORMAL")
+    con.executescript(ESQUEMA)
+    return con
+
+
+def _leer_estado(con, clave, defecto=None):
+    fila = con.execute("SELECT valor FROM estado WHERE clave = ?", (clave,)).fetchone()
+    return fila[0] if fila else defecto
+
+
+def _guardar_estado(con, clave, valor):
+    con.execute("INSERT OR REPLACE INTO estado (clave, valor) VALUES (?, ?)", (clave, str(valor)))
+
+
+def _upsert(con, url, fecha, domain, title, cuerpo, temas, temas_bits=None):
+    """Inserta el artículo o completa su cuerpo si ya estaba solo con título.
+
+    Devuelve True si el índice cambió.
+    """
+    fecha = str(fecha or "")[:10] or None
+    fila = con.execute("SELECT id FROM articulos WHERE url = ?", (url,)).fetchone()
+    if fila is None:
+        cur = con.execute(
+            "INSERT INTO articulos (url, fecha, mes, domain, temas_bits) VALUES (?, ?, ?, ?, ?)",
+            (url, fecha, fecha[:7] if fecha else None, domain, temas_bits),
+        )
+        rowid = cur.lastrowid
+        con.execute("INSERT INTO textos (rowid, title, cuerpo) VALUES (?, ?, ?)", (rowid, title or "", cuerpo or ""))
+    else:
+        rowid = fila[0]
+        if not cuerpo:
+            return False
+        con.execute("UPDATE textos SET cuerpo = ? WHERE rowid = ?", (cuerpo, rowid))
+    con.executemany(
+        "INSERT OR IGNORE INTO articulo_tema (articulo_id, tema) VALUES (?, ?)",
+        [(rowid, t) for t in temas or []],
+    )
+    return True
+
+
+def _retemar(con, rowid, temas, temas_bits):
+    """Reemplaza los temas de un artículo ya indexado (02 re-corrió con otros diccionarios)."""
+    con.execute("UPDATE articulos SET temas_bits = ? WHERE id = ?", (temas_bits, rowid))
+    con.execute("DELETE FROM articulo_tema WHERE articulo_id = ?", (rowid,))
+    con.executemany("INSERT INTO articulo_tema (articulo_id, tema) VALUES (?, ?)",
+                    [(rowid, t) for t in temas or []])
+
+
+def agregar_titulos(con, filas):
+    """Agrega artículos solo con título (corpus de 02) y actualiza los temas
+    de los ya indexados cuyo temas_bits cambió.
+
+    filas: iterable de dicts con url, fecha, domain, title, temas y temas_bits.
+    Devuelve el número de artículos agregados o re-clasificados.
+    """
+    existentes = {u: (i, b) for i, u, b in con.execute("SELECT id, url, temas_bits FROM articulos")}
+    n = 0
+    with con:
+        for f in filas:
+            previo = existentes.get(f['url'])
+            if previo is None:
+                n += _upsert(con, f['url'], f.get('fecha'), f.get('domain'), f.get('title'), None,
+                             f.get('temas'), f.get('temas_bits'))
+                existentes[f['url']] = (None, f.get('temas_bits'))
+            elif previo[0] is not None and previo[1] != f.get('temas_bits'):
+                _retemar(con, previo[0], f.get('temas'), f.get('temas_bits'))
+                existentes[f['url']] = (None, f.get('temas_bits'))
+                n += 1
+    return n
+
+
+def _firma_cuerpos(path, offset):
+    """Identidad de lo ya leído del JSONL: inodo y hash de su comienzo
+    (hasta 4 KB dentro de lo leído, que no cambia si 03 solo agrega líneas)."""
+    with open(path, "rb") as f:
+        cabeza = f.read(min(offset, 4096))
+    return f"{os.stat(path).st_ino}:{hashlib.blake2b(cabeza, digest_size=8).hexdigest()}"
+
+
+def _offset_valido(path, offset, firma):
+    """El offset guardado sirve si el archivo es el mismo y solo creció."""
+    if offset == 0 or path.stat().st_size < offset or firma != _firma_cuerpos(path, offset):
+        return False
+    with open(path, "rb") as f:
+        f.seek(offset - 1)
+        return f.read(1) == b"\n"
+
+
+def agregar_cuerpos(con, path_jsonl):
+    """Carga incremental del JSONL de 03: retoma desde el último byte leído.
+
+    El JSONL solo crece (03 agrega líneas), así que basta con recordar el
+    offset. Si el archivo se regeneró (otro inodo, otro comienzo, más corto,
+    o el offset ya no cae en un fin de línea) se relee desde el inicio; las
+    URL ya indexadas se actualizan en lugar de duplicarse.
+    """
+    offset = int(_leer_estado(con, "offset_cuerpos", 0))
+    if not _offset_valido(path_jsonl, offset, _leer_estado(con, "firma_cuerpos")):
+        offset = 0
+    n = 0
+    with con, open(path_jsonl, "rb") as f:
+        f.seek(offset)
+        for linea in f:
+            if not linea.endswith(b"\n"):
+                break   # línea a medio escribir por 03: se toma en la próxima corrida
+            offset += len(linea)
+            if not linea.strip():
+                continue
+            art = json.loads(linea)
+            n += _upsert(con, art['url'], art.get('fecha'), art.get('domain'),
+                         art.get('title'), art.get('cuerpo'), art.get('temas'))
+        _guardar_estado(con, "offset_cuerpos", offset)
+        _guardar_estado(con, "firma_cuerpos", _firma_cuerpos(path_jsonl, offset))
+    return n
+
+
+def optimizar(con):
+    """Fusiona los segmentos del índice FTS (conviene tras cargas grandes)."""
+    con.execute("INSERT INTO textos (textos) VALUES ('optimize')")
+    con.commit()
+
+
+# ── Consultas ─────────────────────────────────────────────────
+# `consulta` usa la sintaxis FTS5: "estado de emergencia" (frase), helad*
+# (prefijo), friaje AND alpaca*, title: sequia (solo títulos), NEAR(a b, 5)
+
+# sin_tema=True: solo artículos que los diccionarios no clasifican (temas_bits = 0)
+_SIN_TEMA = " AND a.temas_bits = 0"
+
+
+def buscar(con, consulta, limite=20, marca=("[", "]"), sin_tema=False):
+    """Artículos más relevantes (bm25) con un snippet resaltado."""
+    sql = f"""
+        SELECT a.url, a.fecha, a.domain, t.title,
+               snippet(textos, -1, ?, ?, '…', 16) AS snippet
+        FROM textos t JOIN articulos a ON a.id = t.rowid
+        WHERE textos MATCH ?{_SIN_TEMA if sin_tema else ""}
+        ORDER BY rank
+        LIMIT ?
+    """
+    cur = con.execute(sql, (marca[0], marca[1], consulta, limite))
+    columnas = [d[0] for d in cur.description]
+    return [dict(zip(columnas, fila)) for fila in cur]
+
+
+def contar(con, consulta, sin_tema=False):
+    if not sin_tema:
+        return con.execute("SELECT count(*) FROM textos WHERE textos MATCH ?", (consulta,)).fetchone()[0]
+    return con.execute(f"""
+        SELECT count(*) FROM textos t JOIN articulos a ON a.id = t.rowid
+        WHERE textos MATCH ?{_SIN_TEMA}
+    """, (consulta,)).fetchone()[0]
+
+
+def hits_por_mes(con, consulta, sin_tema=False):
+    """[(mes, artículos)] que coinciden con la consulta."""
+    return con.execute(f"""
+        SELECT a.mes, count(*)
+        FROM textos t JOIN articulos a ON a.id = t.rowid
+        WHERE textos MATCH ?{_SIN_TEMA if sin_tema else ""}
+        GROUP BY a.mes ORDER BY a.mes
+    """, (consulta,)).fetchall()
+
+
+def hits_por_tema(con, consulta):
+    """[(tema, artículos)] que coinciden; '(sin tema)' para los no clasificados."""
+    return con.execute("""
+        SELECT coalesce(at.tema, '(sin tema)') AS tema, count(DISTINCT t.rowid) AS n
+        FROM textos t LEFT JOIN articulo_tema at ON at.articulo_id = t.rowid
+        WHERE textos MATCH ?
+        GROUP BY tema ORDER BY n DESC
+    """, (consulta,)).fetchall()
@@ -0,0 +1,151 @@
+"""
+normalizar.py
+Normalización de texto para el matching: minúsculas, sin tildes (á→a, ñ→n,
+ü→u) y espacios colapsados (cada tramo de espacios pasa a un solo ' ', o a
+'\n' si contenía un salto de línea, para conservar los párrafos).
+
+Con el texto ya normalizado, los patrones no necesitan alternativas como
+[oó], [ií], [ñn] o [Ee]: `plegar_patron` las simplifica automáticamente a
+partir de los diccionarios originales.
+
+Los nombres propios (regiones) se buscan aparte, distinguiendo mayúsculas:
+`quitar_tildes_serie` solo quita las tildes (conserva mayúsculas y la ñ, así
+'Puño' no pasa a 'Puno') y `plegar_patron(p, minusculas=False)` adapta el
+patrón a ese texto. "la libertad" o "lima" en minúsculas no son regiones.
+
+Offsets: el plegado de caracteres es 1 a 1, solo el colapso de espacios
+desplaza posiciones. El mapa de offsets guarda un par (inicio_norm,
+inicio_orig) por cada punto donde cambia el desplazamiento; `a_original`
+traduce cualquier posición del texto normalizado al texto original.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+
+
+def _tabla_plegado():
+    """Tabla 1 a 1: mayúsculas → minúsculas y letras latinas con diacrítico → base."""
+    tabla = {}
+    for cp in range(0x41, 0x250):
+        c = chr(cp)
+        base = unicodedata.normalize("NFD", c)[0].lower()
+        if base != c and len(base) == 1:
+            tabla[cp] = base
+    return tabla
+
+
+def _tabla_tildes():
+    """Tabla 1 a 1: letras latinas con diacrítico → base, conservando mayúsculas y ñ/Ñ."""
+    tabla = {}
+    for cp in range(0x41, 0x250):
+        c = chr(cp)
+        base = unicodedata.normalize("NFD", c)[0]
+        if base != c and len(base) == 1 and c not in "ñÑ":
+            tabla[cp] = base
+    return tabla
+
+
+TABLA = _tabla_plegado()
+TABLA_TILDES = _tabla_tildes()
+_NO_ESPACIO = re.compile(r"\S+")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def plegar(texto):
+    """Minúsculas y sin tildes, sin cambiar la longitud del texto."""
+    plegado = texto.translate(TABLA)
+    bajo = plegado.lower()
+    # str.lower puede alargar algunos caracteres raros (ej. 'İ'); en ese caso
+    # se conserva solo el plegado de la tabla para no romper los offsets
+    return bajo if len(bajo) == len(plegado) else plegado
+
+
+def normalizar(texto):
+    """Devuelve (texto_normalizado, seg_norm, seg_orig).
+
+    seg_norm/seg_orig son listas paralelas de inicios de segmento: la
+    posición i del texto normalizado corresponde a
+    seg_orig[k] + (i - seg_norm[k]) con k = último segmento con seg_norm[k] <= i.
+    """
+    plegado = plegar(texto)
+    partes = []
+    seg_norm, seg_orig = [], []
+    n = 0
+    fin_previo = None
+    desplazamiento = None
+
+    for m in _NO_ESPACIO.finditer(plegado):
+        inicio, fin = m.span()
+        if fin_previo is not None:
+            partes.append("\n" if "\n" in plegado[fin_previo:inicio] else " ")
+            n += 1
+        if inicio - n != desplazamiento:
+            desplazamiento = inicio - n
+            seg_norm.append(n)
+            seg_orig.append(inicio)
+        partes.append(m.group())
+        n += fin - inicio
+        fin_previo = fin
+
+    return "".join(partes), seg_norm, seg_orig
+
+
+def a_original(seg_norm, seg_orig, i):
+    """Posición en el texto original de la posición i del texto normalizado."""
+    k = max(bisect_right(seg_norm, i) - 1, 0)
+    if not seg_orig:
+        return i
+    return seg_orig[k] + (i - seg_norm[k])
+
+
+def normalizar_serie(serie):
+    """Versión vectorizada para columnas cortas (títulos), sin mapa de offsets."""
+    return (
+        serie.fillna("")
+        .str.translate(TABLA)
+        .str.lower()
+        .str.replace(_ESPACIOS.pattern, " ", regex=True)
+        .str.strip()
+    )
+
+
+def quitar_tildes_serie(serie):
+    """Títulos sin tildes pero con mayúsculas y ñ (para patrones de nombres propios)."""
+    return serie.fillna("").str.translate(TABLA_TILDES)
+
+
+# ── Plegado de patrones ───────────────────────────────────────
+_CLASE = re.compile(r"\[([^\]\\^-]+)\]")
+
+
+def _simplificar_clase(m):
+    chars = "".join(dict.fromkeys(m.group(1)))
+    return re.escape(chars) if len(chars) == 1 else f"[{chars}]"
+
+
+def plegar_patron(patron, minusculas=True):
+    """Adapta un patrón del diccionario al texto normalizado.
+
+    Pliega los literales (no los escapes como \\b, \\s, \\S) y reduce las
+    clases que quedan redundantes: [oó] → o, [Ee] → e, [ñn] → n.
+    Con minusculas=False solo quita tildes (para quitar_tildes_serie).
+    """
+    plegar_c = plegar if minusculas else (lambda c: c.translate(TABLA_TILDES))
+    salida = []
+    escapado = False
+    for c in patron:
+        if escapado:
+            salida.append(c)
+            escapado = False
+        elif c == "\\":
+            salida.append(c)
+            escapado = True
+        else:
+            salida.append(plegar_c(c))
+    return _CLASE.sub(_simplificar_clase, "".join(salida))
+
+
+def plegar_temas(temas):
+    """{tema: [patrones]} con todos los patrones plegados."""
+    return {tema: [plegar_patron(p) for p in patrones] for tema, patrones in temas.items()}
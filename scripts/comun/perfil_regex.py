@@ -0,0 +1,231 @@
+"""
+perfil_regex.py
+Costo de los patrones regex de los diccionarios:
+- revisión estática del árbol del patrón (re._parser) para detectar riesgo
+  de backtracking antes de usarlo en una corrida
+- prueba de escalado con una entrada adversaria (t(2n) / t(n))
+- perfil por patrón sobre el corpus: hits, tiempo, % del total y peores textos
+
+re._parser y re._constants son internos de CPython (3.11–3.13; antes
+sre_parse / sre_constants). Si faltan o su árbol cambia de forma, la
+revisión cae a una prueba empírica: tiempos sobre entradas adversarias
+armadas con los literales del patrón. Es menos fina que la estática, pero
+exigir_patrones_seguros (guarda de 03b y 04) sigue abortando ante el
+backtracking exponencial.
+"""
+
+import heapq
+import re
+import time
+
+import pandas as pd
+
+try:
+    from re import _constants as sre
+    from re import _parser as sre_parse
+except ImportError:
+    try:
+        import sre_constants as sre
+        import sre_parse
+    except ImportError:
+        sre = sre_parse = None
+
+REVISION_ESTATICA = sre_parse is not None
+COMODIN_LARGO = 50   # .{0,N} con N mayor que esto se trata como ilimitado
+if REVISION_ESTATICA:
+    ILIMITADO = sre.MAXREPEAT
+    REPETICIONES = (sre.MAX_REPEAT, sre.MIN_REPEAT, getattr(sre, "POSSESSIVE_REPEAT", None))
+
+# Prueba empírica: un texto de hasta LARGO_EMPIRICO repeticiones de la semilla
+# que tarda más de TOPE_EMPIRICO_S delata backtracking exponencial
+LARGO_EMPIRICO = 64
+TOPE_EMPIRICO_S = 0.05
+ESCALADO_CUADRATICO = 3.0   # t(2n)/t(n): ≈2 lineal, ≈4 cuadrático
+MEDICIONES = 3              # se toma el mínimo: una pausa del sistema no es backtracking
+
+
+# ── Revisión estática ─────────────────────────────────────────
+def _hijos(op, av):
+    """Subpatrones directos de un nodo del árbol."""
+    if op in REPETICIONES:
+        return [av[2]]
+    if op == sre.SUBPATTERN:
+        return [av[-1]]
+    if op == sre.BRANCH:
+        return list(av[1])
+    if op in (sre.ASSERT, sre.ASSERT_NOT):
+        return [av[1]]
+    return []
+
+
+def _tiene_repeticion_ilimitada(subpatron):
+    for op, av in subpatron:
+        if op in REPETICIONES and av[1] == ILIMITADO:
+            return True
+        if any(_tiene_repeticion_ilimitada(h) for h in _hijos(op, av)):
+            return True
+    return False
+
+
+def _es_comodin(op, av):
+    """Repetición de '.' (o clase negada) con tope ilimitado o muy alto."""
+    if op not in REPETICIONES:
+        return False
+    minimo, maximo, cuerpo = av
+    largo = maximo == ILIMITADO or maximo > COMODIN_LARGO
+    return largo and len(cuerpo) == 1 and cuerpo[0][0] in (sre.ANY, sre.NOT_LITERAL)
+
+
+def _revisar(subpatron, hallazgos):
+    nodos = list(subpatron)
+    for i, (op, av) in enumerate(nodos):
+        if op in REPETICIONES and av[1] == ILIMITADO and _tiene_repeticion_ilimitada(av[2]):
+            hallazgos.append(("alto", "cuantificadores ilimitados anidados (backtracking exponencial)"))
+        if _es_comodin(op, av) and i < len(nodos) - 1:
+            hallazgos.append(("medio", "comodín sin tope (o muy largo) seguido de más patrón (costo cuadrático en textos largos)"))
+        for hijo in _hijos(op, av):
+            _revisar(hijo, hallazgos)
+
+
+def _revision_estatica(patron):
+    hallazgos = []
+    _revisar(sre_parse.parse(patron), hallazgos)
+    return list(dict.fromkeys(hallazgos))
+
+
+def riesgo_backtracking(patron):
+    """Lista de (nivel, motivo) para un patrón; vacía si no hay riesgo conocido."""
+    if REVISION_ESTATICA:
+        try:
+            return _revision_estatica(patron)
+        except re.error:
+            raise
+        except Exception:
+            pass   # árbol interno con otra forma: se mide
+    return _riesgo_empirico(patron)
+
+
+# ── Prueba empírica (sin el parser interno de re) ─────────────
+def _semilla_literal(patron):
+    """Letras del patrón sin escapes ni metacaracteres: r"\\bhelad\\w*" → "helad"."""
+    return re.sub(r"\\.|[^\w]", "", patron) or "a"
+
+
+def _tiempo(rx, texto, repeticiones=MEDICIONES):
+    """Mejor tiempo de `repeticiones` recorridos completos de `texto`."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        for _ in rx.finditer(texto):
+            pass
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def _riesgo_empirico(patron):
+    rx = re.compile(patron)
+    semilla = _semilla_literal(patron)
+    for unir in ("", " "):
+        for k in range(1, LARGO_EMPIRICO + 1):
+            if _tiempo(rx, (semilla + unir) * k + "!") > TOPE_EMPIRICO_S:
+                return [("alto", "tiempo explosivo en entradas cortas (backtracking exponencial, prueba empírica)")]
+    if min(medir_escalado(patron) for _ in range(2)) > ESCALADO_CUADRATICO:   # confirmado dos veces
+        return [("medio", "tiempo más que lineal en textos largos (prueba empírica)")]
+    return []
+
+
+def revisar_patrones(patrones):
+    """Revisa [(grupo, patron)]; devuelve [(grupo, patron, nivel, motivo)]."""
+    return [
+        (grupo, patron, nivel, motivo)
+        for grupo, patron in patrones
+        for nivel, motivo in riesgo_backtracking(patron)
+    ]
+
+
+def exigir_patrones_seguros(patrones, log=print):
+    """Guarda previa a una corrida: avisa los de riesgo medio y aborta con los de riesgo alto."""
+    if not REVISION_ESTATICA:
+        log("  [regex] sin re._parser en esta versión de Python: revisión empírica")
+    hallazgos = revisar_patrones(patrones)
+    for grupo, patron, nivel, motivo in hallazgos:
+        log(f"  [regex {nivel}] {grupo}: {patron!r} — {motivo}")
+    altos = [h for h in hallazgos if h[2] == "alto"]
+    if altos:
+        raise ValueError(f"{len(altos)} patrón(es) con riesgo de backtracking catastrófico")
+    return hallazgos
+
+
+# ── Prueba de escalado ────────────────────────────────────────
+def _ejemplo(subpatron):
+    """Cadena mínima que recorre el patrón hasta el primer comodín sin tope."""
+    partes = []
+    for op, av in subpatron:
+        if _es_comodin(op, av):
+            break
+        if op == sre.LITERAL:
+            partes.append(chr(av))
+        elif op == sre.IN:
+            literales = [chr(v) for o, v in av if o == sre.LITERAL]
+            partes.append(literales[0] if literales else "a")
+        elif op in REPETICIONES:
+            partes.append(_ejemplo(av[2]) * max(av[0], 1))
+        elif op == sre.SUBPATTERN:
+            partes.append(_ejemplo(av[-1]))
+        elif op == sre.BRANCH:
+            partes.append(_ejemplo(av[1][0]))
+        elif op == sre.ANY:
+            partes.append("a")
+    return "".join(partes)
+
+
+def medir_escalado(patron, n=2_000):
+    """Razón t(2n)/t(n) sobre una entrada adversaria (≈2 lineal, ≈4 cuadrático)."""
+    rx = re.compile(patron)
+    semilla = (_ejemplo(sre_parse.parse(patron)) or "a") if REVISION_ESTATICA else _semilla_literal(patron)
+    t1, t2 = (_tiempo(rx, (semilla + " ") * k) for k in (n, 2 * n))
+    return t2 / t1 if t1 > 0 else float("nan")
+
+
+# ── Perfil sobre el corpus ────────────────────────────────────
+def perfilar(patrones, textos, top=3):
+    """Tiempo y hits de cada patrón sobre cada texto.
+
+    patrones: [(grupo, patron)]; textos: iterable de (id, texto).
+    Devuelve un DataFrame ordenado por tiempo total.
+    """
+    compilados = [(grupo, patron, re.compile(patron)) for grupo, patron in patrones]
+    hits = [0] * len(compilados)
+    tiempo = [0.0] * len(compilados)
+    peores = [[] for _ in compilados]   # heaps (segundos, id, chars)
+    n_textos = 0
+
+    for id_texto, texto in textos:
+        n_textos += 1
+        for i, (_, _, rx) in enumerate(compilados):
+            t0 = time.perf_counter()
+            n = sum(1 for _ in rx.finditer(texto))
+            dt = time.perf_counter() - t0
+            hits[i] += n
+            tiempo[i] += dt
+            if len(peores[i]) < top:
+                heapq.heappush(peores[i], (dt, id_texto, len(texto)))
+            elif dt > peores[i][0][0]:
+                heapq.heapreplace(peores[i], (dt, id_texto, len(texto)))
+
+    total = sum(tiempo) or 1.0
+    filas = []
+    for i, (grupo, patron, _) in enumerate(compilados):
+        peor = sorted(peores[i], reverse=True)
+        filas.append({
+            "grupo": grupo,
+            "patron": patron,
+            "hits": hits[i],
+            "tiempo_s": tiempo[i],
+            "pct_tiempo": tiempo[i] / total * 100,
+            "us_por_texto": tiempo[i] / max(n_textos, 1) * 1e6,
+            "peor_ms": peor[0][0] * 1000 if peor else 0.0,
+            "peores": "; ".join(f"{u} ({c:,} chars, {s * 1000:.1f} ms)" for s, u, c in peor),
+            "riesgo": "; ".join(f"{n}: {m}" for n, m in riesgo_backtracking(patron)),
+        })
+    return pd.DataFrame(filas).sort_values("tiempo_s", ascending=False, ignore_index=True)
@@ -0,0 +1,109 @@
+"""
+perfilado.py
+Perfilado opcional por etapa: cProfile, tiempo de reloj y de CPU, y pico de
+memoria con tracemalloc.
+
+Se activa con la variable de entorno PERFILAR=1 o con el flag --perfilar en
+la línea de comandos de cualquier script del pipeline:
+    PERFILAR=1 python scripts/04_extraer_entidades.py
+    python scripts/02_explorar_y_detectar_temas.py --perfilar
+
+Cada script envuelve su trabajo en `with etapa("nombre"):` (las etapas se
+pueden anidar). Al cerrar la etapa más externa se escriben en data/logs/:
+- perfil_<etapa>_<ts>.pstats   (abrir con `python -m pstats` o snakeviz)
+- perfil_<ts>.txt              resumen: reloj, CPU y pico de memoria por etapa
+                               y las TOP_N funciones con más tiempo propio
+cProfile se aplica solo a la etapa más externa (no admite perfiles anidados);
+las internas registran tiempos y memoria. Los procesos hijos de un pool no se
+perfilan.
+
+Desactivado, `etapa()` devuelve un contexto vacío compartido: sin timers,
+sin cProfile ni tracemalloc.
+"""
+
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+LOG_DIR = Path("data/logs")
+TOP_N = int(os.environ.get("PERFILAR_TOP", 25))
+
+ACTIVO = os.environ.get("PERFILAR", "") not in ("", "0") or "--perfilar" in sys.argv
+if "--perfilar" in sys.argv:
+    sys.argv.remove("--perfilar")   # para que argparse de cada script no lo vea
+
+_TS = datetime.now().strftime("%Y%m%d_%H%M%S")
+_NULO = contextlib.nullcontext()
+_pila = []
+
+
+class _Etapa:
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        if not _pila:
+            tracemalloc.start()
+            self.perfil = cProfile.Profile()
+        else:
+            self.perfil = None
+        actual, pico = tracemalloc.get_traced_memory()
+        for padre in _pila:
+            padre.pico = max(padre.pico, pico)
+        tracemalloc.reset_peak()
+        self.inicio_mem = actual
+        self.pico = actual
+        _pila.append(self)
+        self.t_reloj = time.perf_counter()
+        self.t_cpu = time.process_time()
+        if self.perfil:
+            self.perfil.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.perfil:
+            self.perfil.disable()
+        reloj = time.perf_counter() - self.t_reloj
+        cpu = time.process_time() - self.t_cpu
+        _, pico = tracemalloc.get_traced_memory()
+        self.pico = max(self.pico, pico)
+        _pila.pop()
+        for padre in _pila:
+            padre.pico = max(padre.pico, pico)
+
+        nivel = len(_pila)
+        linea = (f"{'  ' * nivel}{self.nombre:40s} reloj {reloj:9.2f}s  cpu {cpu:9.2f}s  "
+                 f"pico {self.pico / 2**20:9.1f} MB  (inicio {self.inicio_mem / 2**20:.1f} MB)")
+        _escribir(linea)
+        if self.perfil:
+            tracemalloc.stop()
+            _reporte_cprofile(self.nombre, self.perfil)
+        return False
+
+
+def _escribir(texto):
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    print(f"[perfil] {texto}")
+    with open(LOG_DIR / f"perfil_{_TS}.txt", "a", encoding="utf-8") as f:
+        f.write(texto + "\n")
+
+
+def _reporte_cprofile(nombre, perfil):
+    ruta = LOG_DIR / f"perfil_{nombre}_{_TS}.pstats"
+    perfil.dump_stats(ruta)
+    salida = io.StringIO()
+    pstats.Stats(perfil, stream=salida).sort_stats("tottime").print_stats(TOP_N)
+    _escribir(f"\n── {nombre}: top {TOP_N} por tiempo propio ({ruta.name}) ──\n{salida.getvalue()}")
+
+
+def etapa(nombre):
+    """Contexto de perfilado de una etapa; vacío si el perfilado está apagado."""
+    return _Etapa(nombre) if ACTIVO else _NULO
+
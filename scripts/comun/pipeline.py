@@ -0,0 +1,291 @@
+"""
+pipeline.py
+Ejecución del pipeline como grafo de etapas con caché por huella de contenido.
+
+Cada etapa es una función importable de un script (p. ej. main() de
+03a_normalizar_cuerpos.py) con entradas y salidas declaradas por nombre del
+catálogo de artefactos (comun/artefactos.py). Las dependencias se deducen de
+ahí: una etapa depende de las que producen sus entradas.
+
+La huella de una etapa combina:
+- el código: el script y los módulos de comun/ que importa (recursivo)
+- el contenido de sus entradas
+- la definición de la etapa (script, función, entradas, salidas)
+La configuración vive en constantes de los scripts y en comun/diccionarios.py,
+así que entra por el código. Si la huella y el contenido de las salidas
+coinciden con los de la última ejecución exitosa, la etapa se omite.
+
+Las huellas de archivos (blake2b) se guardan junto con tamaño y mtime en
+data/staging/_pipeline_estado.json: un archivo solo se vuelve a leer si
+cambió alguno de los dos.
+
+Las etapas listas se ejecutan en paralelo, cada una en un proceso nuevo
+(spawn), con su salida en data/logs/pipeline_<etapa>_<ts>.log.
+"""
+
+import ast
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from pathlib import Path
+
+from comun.artefactos import ruta
+from comun.staging import STAGING_DIR
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+ESTADO_PATH = STAGING_DIR / "_pipeline_estado.json"
+LOG_DIR = Path("data/logs")
+BLOQUE = 1 << 20
+
+
+# ── Huellas ───────────────────────────────────────────────────
+
+def huella_archivo(path, cache):
+    """blake2b del contenido; `cache` {ruta: [tamaño, mtime_ns, huella]} evita releer."""
+    st = path.stat()
+    clave = str(path)
+    previa = cache.get(clave)
+    if previa and previa[0] == st.st_size and previa[1] == st.st_mtime_ns:
+        return previa[2]
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while bloque := f.read(BLOQUE):
+            h.update(bloque)
+    cache[clave] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+    return h.hexdigest()
+
+
+def huella_artefacto(path, cache):
+    """Huella de un archivo o de un directorio (dataset particionado); None si no existe."""
+    path = Path(path)
+    if path.is_file():
+        return huella_archivo(path, cache)
+    if not path.is_dir():
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    for archivo in sorted(p for p in path.rglob("*") if p.is_file()):
+        h.update(archivo.relative_to(path).as_posix().encode())
+        h.update(huella_archivo(archivo, cache).encode())
+    return h.hexdigest()
+
+
+def modulos_codigo(script):
+    """Archivos de código de un script: él mismo y los módulos de comun/ que importa."""
+    pendientes = [SCRIPTS_DIR / f"{script}.py"]
+    vistos = set()
+    while pendientes:
+        archivo = pendientes.pop()
+        if archivo in vistos or not archivo.exists():
+            continue
+        vistos.add(archivo)
+        for nodo in ast.walk(ast.parse(archivo.read_text(encoding="utf-8"))):
+            if isinstance(nodo, ast.ImportFrom) and nodo.module == "comun":
+                nombres = [a.name for a in nodo.names]          # from comun import x
+            elif isinstance(nodo, ast.ImportFrom) and (nodo.module or "").startswith("comun."):
+                nombres = [nodo.module.split(".", 1)[1]]        # from comun.x import y
+            elif isinstance(nodo, ast.Import):
+                nombres = [a.name.split(".", 1)[1] for a in nodo.names if a.name.startswith("comun.")]
+            else:
+                continue
+            pendientes.extend(SCRIPTS_DIR / "comun" / f"{n.replace('.', '/')}.py" for n in nombres)
+    return sorted(vistos)
+
+
+def huella_etapa(etapa, cache):
+    h = hashlib.blake2b(digest_size=16)
+    definicion = {k: etapa.get(k) for k in ("script", "funcion", "entradas", "salidas")}
+    h.update(json.dumps(definicion, sort_keys=True).encode())
+    for archivo in modulos_codigo(etapa["script"]):
+        h.update(archivo.relative_to(SCRIPTS_DIR).as_posix().encode())
+        h.update(huella_archivo(archivo, cache).encode())
+    for nombre in etapa["entradas"]:
+        h.update(f"{nombre}={huella_artefacto(ruta(nombre), cache)}".encode())
+    return h.hexdigest()
+
+
+def huellas_salidas(etapa, cache):
+    return {nombre: huella_artefacto(ruta(nombre), cache) for nombre in etapa["salidas"]}
+
+
+# ── Estado ────────────────────────────────────────────────────
+
+def cargar_estado():
+    if ESTADO_PATH.exists():
+        return json.loads(ESTADO_PATH.read_text(encoding="utf-8"))
+    return {"archivos": {}, "etapas": {}}
+
+
+def guardar_estado(estado):
+    ESTADO_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ESTADO_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(estado, ensure_ascii=False, indent=1), encoding="utf-8")
+    tmp.replace(ESTADO_PATH)
+
+
+# ── Grafo ─────────────────────────────────────────────────────
+
+def dependencias(etapas):
+    """{etapa: [etapas que producen sus entradas]}; valida productores únicos y ciclos."""
+    productor = {}
+    for e in etapas:
+        for s in e["salidas"]:
+            if s in productor:
+                raise ValueError(f"artefacto {s!r} producido por {productor[s]} y {e['nombre']}")
+            productor[s] = e["nombre"]
+    deps = {e["nombre"]: sorted({productor[x] for x in e["entradas"] if x in productor})
+            for e in etapas}
+    orden(deps)
+    return deps
+
+
+def orden(deps):
+    """Orden topológico (estable según el orden de definición)."""
+    resultado, visitando, hechos = [], set(), set()
+
+    def visitar(n):
+        if n in hechos:
+            return
+        if n in visitando:
+            raise ValueError(f"ciclo en el pipeline en la etapa {n}")
+        visitando.add(n)
+        for d in deps[n]:
+            visitar(d)
+        visitando.discard(n)
+        hechos.add(n)
+        resultado.append(n)
+
+    for n in deps:
+        visitar(n)
+    return resultado
+
+
+def ancestros(deps, objetivos):
+    seleccion, pila = set(), list(objetivos)
+    while pila:
+        n = pila.pop()
+        if n not in seleccion:
+            seleccion.add(n)
+            pila.extend(deps[n])
+    return seleccion
+
+
+# ── Ejecución ─────────────────────────────────────────────────
+
+def _correr_etapa(nombre, script, funcion, log_path):
+    """En el proceso hijo: importa el script y llama a la función de la etapa,
+    con stdout/stderr (también los de sus subprocesos) redirigidos al log."""
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    from comun.perfilado import etapa
+
+    log = open(log_path, "a", encoding="utf-8")
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+    t0 = time.perf_counter()
+    try:
+        with etapa(nombre):
+            getattr(importlib.import_module(script), funcion)()
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"{script}.{funcion} terminó con código {e.code}") from None
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return time.perf_counter() - t0
+
+
+def ejecutar(etapas, objetivos=None, forzar=(), en_seco=False, red=False, paralelo=2):
+    """Ejecuta las etapas desactualizadas (y las que dependen de ellas).
+
+    objetivos: solo esas etapas y sus ancestros (None = todas)
+    forzar:    etapas a ejecutar aunque estén al día
+    en_seco:   solo informar qué se ejecutaría
+    red:       permitir etapas con `red: True` (cosecha y descargas); sin red,
+               se dan por al día si sus salidas existen
+    Devuelve {etapa: (estado, segundos)}.
+    """
+    por_nombre = {e["nombre"]: e for e in etapas}
+    deps = dependencias(etapas)
+    seleccion = ancestros(deps, objetivos) if objetivos else set(por_nombre)
+    pendientes = [n for n in orden(deps) if n in seleccion]
+    forzar = set(forzar)
+
+    estado = cargar_estado()
+    cache = estado["archivos"]
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    resultados = {}
+    en_curso = {}
+
+    def informar(nombre, estado_etapa, segundos=None, detalle=""):
+        resultados[nombre] = (estado_etapa, segundos)
+        tiempo = f"{segundos:7.1f}s" if segundos is not None else " " * 8
+        print(f"  {nombre:22s} {estado_etapa:12s} {tiempo}  {detalle}".rstrip(), flush=True)
+
+    def decidir(nombre):
+        """Estado de una etapa cuyas dependencias ya se resolvieron; None = ejecutar."""
+        e = por_nombre[nombre]
+        estados_deps = [resultados[d][0] for d in deps[nombre] if d in resultados]
+        if any(s in ("falló", "bloqueada") for s in estados_deps):
+            return "bloqueada", "falló una dependencia"
+        if e.get("red") and not red:
+            if all(huella_artefacto(ruta(s), cache) for s in e["salidas"]):
+                return "congelada", "requiere --red para actualizar"
+            return "bloqueada", "sin salidas previas; requiere --red"
+        if "pendiente" in estados_deps:
+            return "pendiente", "cambia una dependencia"
+        previa = estado["etapas"].get(nombre, {})
+        e["_huella"] = huella_etapa(e, cache)
+        if (nombre not in forzar and previa.get("huella") == e["_huella"]
+                and previa.get("salidas") == huellas_salidas(e, cache)):
+            return "al día", ""
+        if en_seco:
+            return "pendiente", "forzada" if nombre in forzar else "cambió código o entradas"
+        return None, ""
+
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, paralelo), mp_context=contexto,
+                             max_tasks_per_child=1) as pool:
+        while pendientes or en_curso:
+            for nombre in list(pendientes):
+                if any(d not in resultados for d in deps[nombre] if d in seleccion):
+                    continue
+                pendientes.remove(nombre)
+                estado_etapa, detalle = decidir(nombre)
+                if estado_etapa:
+                    informar(nombre, estado_etapa, detalle=detalle)
+                    continue
+                e = por_nombre[nombre]
+                log_path = LOG_DIR / f"pipeline_{nombre}_{ts}.log"
+                en_curso[pool.submit(_correr_etapa, nombre, e["script"], e["funcion"],
+                                     str(log_path))] = (nombre, log_path)
+                print(f"  {nombre:22s} {'ejecutando':12s} {'':8s}  → {log_path}", flush=True)
+
+            if not en_curso:
+                continue
+            listos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                nombre, log_path = en_curso.pop(futuro)
+                e = por_nombre[nombre]
+                try:
+                    segundos = futuro.result()
+                except Exception as exc:
+                    informar(nombre, "falló", detalle=f"{exc!r} (ver {log_path})")
+                    continue
+                estado["etapas"][nombre] = {
+                    "huella": e["_huella"],
+                    "salidas": huellas_salidas(e, cache),
+                    "fecha": datetime.now().isoformat(timespec="seconds"),
+                    "segundos": round(segundos, 1),
+                }
+                guardar_estado(estado)
+                informar(nombre, "ejecutada", segundos)
+
+    guardar_estado(estado)
+    return resultados
@@ -0,0 +1,134 @@
+"""
+series.py
+Series temporales de cobertura por tema (métricas del README):
+n_tema, n_total, p_tema = n_tema / n_total y p_tema_suavizado.
+Un único groupby diario sobre los artículos; semanas y meses se agregan
+desde esa tabla diaria, no desde el corpus.
+
+n_total depende de la lista de queries y del tope de 250 registros de la
+cosecha; agregar_timeline suma denominadores independientes de eso, desde
+las curvas de volumen de GDELT (modo timeline de 01): p_tema_timeline =
+volumen de las queries del tema / volumen de la consulta base de Perú.
+"""
+
+import re
+import pandas as pd
+
+from comun.normalizar import plegar, plegar_temas
+
+# Planes de cosecha de 01 que no son prensa peruana (ver PLANES en 01)
+PLANES_FUERA_PERU = ["es_ext"]
+
+# Granularidad → (regla de resample, ventana de suavizado en periodos)
+GRANULARIDADES = {
+    "diaria": ("D", 21),     # media móvil 21 días
+    "semanal": ("W-MON", 3), # ~21 días
+    "mensual": ("MS", 3),    # 3 meses
+}
+
+
+def conteos_diarios(df, tema_cols, fecha_col="fecha"):
+    """Conteos diarios por tema y total, con días sin artículos rellenados en 0."""
+    dia = df[fecha_col].dt.floor("D")
+    diario = df[tema_cols].astype("int32").groupby(dia).agg("sum")
+    diario["total"] = dia.value_counts(sort=False)
+    diario.columns = [c.replace("tema_", "") for c in diario.columns]
+    rango = pd.date_range(diario.index.min(), diario.index.max(), freq="D")
+    return diario.reindex(rango, fill_value=0)
+
+
+def serie_cobertura(df, tema_cols, fecha_col="fecha"):
+    """Tabla tidy: granularidad, periodo, tema, n_tema, n_total, p_tema, p_tema_suavizado."""
+    diario = conteos_diarios(df.dropna(subset=[fecha_col]), tema_cols, fecha_col)
+    temas = [c for c in diario.columns if c != "total"]
+
+    partes = []
+    for granularidad, (regla, ventana) in GRANULARIDADES.items():
+        tabla = diario if regla == "D" else diario.resample(regla, label="left", closed="left").sum()
+        total = tabla["total"]
+        p = tabla[temas].div(total.where(total > 0), axis=0)
+        p_suav = p.rolling(ventana, min_periods=1).mean()
+
+        larga = pd.DataFrame({
+            "n_tema": tabla[temas].stack(),
+            "p_tema": p.stack(future_stack=True),
+            "p_tema_suavizado": p_suav.stack(future_stack=True),
+        })
+        larga.index.names = ["periodo", "tema"]
+        larga = larga.reset_index()
+        larga["n_total"] = larga["periodo"].map(total)
+        larga.insert(0, "granularidad", granularidad)
+        partes.append(larga)
+
+    serie = pd.concat(partes, ignore_index=True)
+    serie["granularidad"] = serie["granularidad"].astype("category")
+    serie["tema"] = pd.Categorical(serie["tema"], categories=temas)
+    return serie[["granularidad", "periodo", "tema", "n_tema", "n_total", "p_tema", "p_tema_suavizado"]]
+
+
+def cobertura_peruana(df):
+    """Máscara de los artículos que cuentan para la cobertura peruana: fuera los
+    de planes de prensa extranjera (01 y, por dominio, 01b). Sin `_plan`
+    (cosechas antiguas) cuentan todos."""
+    if "_plan" not in df.columns:
+        return pd.Series(True, index=df.index)
+    return ~df["_plan"].isin(PLANES_FUERA_PERU)
+
+
+def con_titulo(df):
+    """Máscara de los artículos con título de verdad: fuera los que usan el slug
+    de la URL como título (title_origen de la ingesta GKG/mentions, 01b)."""
+    if "title_origen" not in df.columns:
+        return pd.Series(True, index=df.index)
+    return df["title_origen"].astype(object) != "slug"
+
+
+def pivot_mensual(serie):
+    """Formato ancho mensual (periodo × tema + total), como serie_mensual_temas.csv."""
+    mensual = serie[serie["granularidad"] == "mensual"]
+    ancho = mensual.pivot(index="periodo", columns="tema", values="n_tema")
+    ancho.columns = ancho.columns.astype(str)
+    ancho["total"] = mensual.groupby("periodo")["n_total"].first()
+    ancho.index = ancho.index.to_period("M")
+    ancho.index.name = "fecha"
+    return ancho.astype(int)
+
+
+def temas_de_queries(queries, temas):
+    """{query: [temas]} según los patrones del diccionario (que incluyen términos en inglés)."""
+    plegados = plegar_temas(temas)
+    return {q: [t for t, patrones in plegados.items() if any(re.search(p, plegar(q)) for p in patrones)]
+            for q in queries}
+
+
+def agregar_timeline(serie, timeline, temas):
+    """Agrega a la serie tidy n_tema_timeline, n_base_timeline y p_tema_timeline.
+
+    timeline: tabla de 01 (query, fecha, n, n_monitoreado, es_base). El
+    volumen diario de un tema es el de su query más amplia (el máximo, no la
+    suma: "drought peru" ya contiene a "drought peru agriculture").
+    """
+    base = timeline[timeline["es_base"]].groupby("fecha")["n"].sum()
+    por_query = timeline[~timeline["es_base"]]
+    asignacion = temas_de_queries(por_query["query"].astype(str).unique(), temas)
+    por_tema = por_query.assign(tema=por_query["query"].astype(str).map(asignacion)).explode("tema")
+    diario = (por_tema.dropna(subset=["tema"])
+              .pivot_table(index="fecha", columns="tema", values="n", aggfunc="max", fill_value=0))
+    diario = diario.join(base.rename("__base__"), how="outer").fillna(0)
+    diario = diario.reindex(pd.date_range(diario.index.min(), diario.index.max(), freq="D"), fill_value=0)
+
+    partes = []
+    for granularidad, (regla, _) in GRANULARIDADES.items():
+        tabla = diario if regla == "D" else diario.resample(regla, label="left", closed="left").sum()
+        base_periodo = tabla["__base__"]
+        larga = tabla.drop(columns="__base__").stack().rename("n_tema_timeline").rename_axis(["periodo", "tema"]).reset_index()
+        larga["n_base_timeline"] = larga["periodo"].map(base_periodo)
+        larga["granularidad"] = granularidad
+        partes.append(larga)
+    extra = pd.concat(partes, ignore_index=True)
+    extra["p_tema_timeline"] = extra["n_tema_timeline"] / extra["n_base_timeline"].where(extra["n_base_timeline"] > 0)
+
+    claves = ["granularidad", "periodo", "tema"]
+    unida = serie.astype({"granularidad": str, "tema": str}).merge(
+        extra.astype({"periodo": serie["periodo"].dtype}), on=claves, how="left")
+    return unida.astype({"granularidad": serie["granularidad"].dtype, "tema": serie["tema"].dtype})
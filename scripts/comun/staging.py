@@ -0,0 +1,79 @@
+"""
+staging.py
+Lectura y escritura de datasets en data/staging/ como Parquet particionado
+por idioma y año (hive: language=Spanish/year=2023/...), con estadísticas
+por row group. Los loaders usan pyarrow.dataset con proyección de columnas
+y filtros empujados al escaneo: solo se leen las particiones y row groups
+que el filtro puede satisfacer, y solo las columnas pedidas.
+"""
+
+import shutil
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pathlib import Path
+
+STAGING_DIR = Path("data/staging")
+PARTICIONES = ["language", "year"]
+ROWS_PER_GROUP = 64_000
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("language", pa.string()), ("year", pa.int16())]), flavor="hive"
+)
+
+
+def ruta_dataset(nombre):
+    return STAGING_DIR / nombre
+
+
+def escribir_particionado(df, nombre):
+    """Escribe un DataFrame como dataset particionado por language/year,
+    reemplazando el anterior entero (un idioma o año que ya no está en `df`
+    no deja particiones viejas).
+
+    Dentro de cada partición las filas van ordenadas por fecha, así las
+    estadísticas min/max de cada row group permiten saltar rangos de fechas.
+    """
+    df = df.assign(year=df["fecha"].dt.year.astype("Int16")).sort_values("fecha")
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    if ruta_dataset(nombre).is_dir():
+        shutil.rmtree(ruta_dataset(nombre))
+    formato = ds.ParquetFileFormat()
+    ds.write_dataset(
+        tabla,
+        ruta_dataset(nombre),
+        format=formato,
+        partitioning=PARTITIONING,
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=ROWS_PER_GROUP,
+        min_rows_per_group=ROWS_PER_GROUP // 4,
+        file_options=formato.make_write_options(write_statistics=True, compression="zstd"),
+    )
+    return ruta_dataset(nombre)
+
+
+def abrir_dataset(nombre):
+    """Dataset particionado; si no existe, cae al Parquet plano `<nombre>.parquet`."""
+    ruta = ruta_dataset(nombre)
+    if ruta.is_dir():
+        return ds.dataset(ruta, format="parquet", partitioning=PARTITIONING)
+    return ds.dataset(ruta.with_suffix(".parquet"), format="parquet")
+
+
+def filtro_idioma(*idiomas):
+    """Expresión de filtro `language IN idiomas` para pasar a leer_staging."""
+    return pc.field("language").isin(list(idiomas))
+
+
+def leer_staging(nombre, columnas=None, filtro=None):
+    """Lee solo `columnas` de las filas que cumplen `filtro` (expresión pyarrow)."""
+    dataset = abrir_dataset(nombre)
+    if columnas is not None:
+        columnas = [c for c in columnas if c in dataset.schema.names]
+    return dataset.to_table(columns=columnas, filter=filtro).to_pandas()
+
+
+def contar_filas(nombre, filtro=None):
+    """Número de filas sin leer columnas (usa metadatos de Parquet)."""
+    return abrir_dataset(nombre).count_rows(filter=filtro)
@@ -0,0 +1,123 @@
+"""
+ventanas.py
+Cruce de eventos de datos duros (EM-DAT, DesInventar, INDECI: inicio, fin,
+región, tema) con la cobertura de prensa: para cada evento, qué artículos
+caen en su ventana [inicio - antes, fin + despues] y son de su región y tema.
+
+En vez de filtrar el corpus una vez por evento (O(eventos × artículos)), las
+fechas de los artículos se ordenan una vez y los bordes de todas las ventanas
+se ubican con np.searchsorted. Los eventos se agrupan por (región, tema): las
+máscaras por región y por tema se calculan una vez, se combinan por grupo y
+cada grupo es una búsqueda binaria vectorizada,
+O(artículos × grupos + eventos × log artículos).
+
+Los artículos traen regiones y temas como bitsets (regiones_bits y
+temas_bits de 02; ver comun/compacto.py). Región o tema nulos en un evento
+significan "cualquiera" (p. ej. eventos nacionales de EM-DAT).
+"""
+
+import numpy as np
+import pandas as pd
+
+from comun.compacto import bandera
+from comun.normalizar import plegar
+
+METRICAS = ["n_articulos", "n_antes", "n_durante", "n_despues", "n_ventana",
+            "cuota", "dias_primer_articulo"]
+
+
+def dias(fechas):
+    """Fechas → días desde 1970 (int64) para comparar y buscar en arrays."""
+    return pd.to_datetime(fechas).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def bordes(fechas_ordenadas, inicio, fin, antes, despues):
+    """Índices de la ventana de cada evento en `fechas_ordenadas`:
+    [lo, a) antes del inicio, [a, b) durante el evento, [b, hi) después."""
+    f = fechas_ordenadas
+    return (np.searchsorted(f, inicio - antes, "left"),
+            np.searchsorted(f, inicio, "left"),
+            np.searchsorted(f, fin, "right"),
+            np.searchsorted(f, fin + despues, "right"))
+
+
+def _indice_nombres(nombres):
+    """Nombre plegado → nombre del diccionario ('JUNÍN' y 'Junín' → 'Junin')."""
+    return {plegar(n): n for n in nombres}
+
+
+def cobertura_eventos(eventos, articulos, nombres_regiones, nombres_temas,
+                      antes=7, despues=30):
+    """Métricas de cobertura por evento.
+
+    eventos:   DataFrame con inicio, fin (nulo = inicio), region y tema (nulos = todos)
+    articulos: DataFrame con fecha, regiones_bits y temas_bits
+    antes/despues: días de margen de la ventana (adelanto y rezago)
+
+    Devuelve `eventos` con las columnas de METRICAS:
+    - n_articulos           artículos de la región y tema en la ventana
+    - n_antes / n_durante / n_despues   reparto respecto de [inicio, fin]
+    - n_ventana             todos los artículos del corpus en la ventana
+    - cuota                 n_articulos / n_ventana
+    - dias_primer_articulo  días del inicio al primer artículo desde el inicio (NaN si no hay)
+    Eventos con región o tema fuera de los diccionarios quedan con 0 artículos.
+    """
+    fechas = dias(articulos["fecha"])
+    validas = ~np.isnat(pd.to_datetime(articulos["fecha"]).to_numpy())
+    orden = np.argsort(np.where(validas, fechas, np.iinfo(np.int64).max), kind="stable")
+    orden = orden[:validas.sum()]
+    fechas = fechas[orden]
+    regiones_bits = np.asarray(articulos["regiones_bits"])[orden]
+    temas_bits = np.asarray(articulos["temas_bits"])[orden]
+
+    inicio = dias(eventos["inicio"])
+    fin = dias(eventos["fin"].fillna(eventos["inicio"]))
+    fin = np.maximum(fin, inicio)
+
+    n = len(eventos)
+    n_antes, n_durante, n_despues = (np.zeros(n, dtype=np.int64) for _ in range(3))
+    primer = np.full(n, np.nan)
+
+    lo, _, _, hi = bordes(fechas, inicio, fin, antes, despues)
+    n_ventana = hi - lo
+
+    por_region = _indice_nombres(nombres_regiones)
+    por_tema = _indice_nombres(nombres_temas)
+    claves = pd.DataFrame({
+        "region": eventos["region"].map(lambda r: por_region.get(plegar(r), "?") if isinstance(r, str) else None),
+        "tema": eventos["tema"].map(lambda t: por_tema.get(plegar(t), "?") if isinstance(t, str) else None),
+    })
+    # Máscaras por región y por tema, calculadas una vez y combinadas por grupo
+    mascaras_region = {r: bandera(regiones_bits, list(nombres_regiones), r)
+                       for r in claves["region"].dropna().unique() if r != "?"}
+    mascaras_tema = {t: bandera(temas_bits, list(nombres_temas), t)
+                     for t in claves["tema"].dropna().unique() if t != "?"}
+    for (region, tema), idx in claves.groupby(["region", "tema"], dropna=False).indices.items():
+        if region == "?" or tema == "?":
+            continue
+        if isinstance(region, str) and isinstance(tema, str):
+            f = fechas[mascaras_region[region] & mascaras_tema[tema]]
+        elif isinstance(region, str):
+            f = fechas[mascaras_region[region]]
+        elif isinstance(tema, str):
+            f = fechas[mascaras_tema[tema]]
+        else:
+            f = fechas
+        g_lo, g_a, g_b, g_hi = bordes(f, inicio[idx], fin[idx], antes, despues)
+        n_antes[idx] = g_a - g_lo
+        n_durante[idx] = g_b - g_a
+        n_despues[idx] = g_hi - g_b
+        hay = g_a < g_hi
+        if hay.any():
+            primer[idx[hay]] = f[g_a[hay]] - inicio[idx][hay]
+
+    n_articulos = n_antes + n_durante + n_despues
+    return eventos.assign(
+        n_articulos=n_articulos,
+        n_antes=n_antes,
+        n_durante=n_durante,
+        n_despues=n_despues,
+        n_ventana=n_ventana,
+        cuota=np.divide(n_articulos, n_ventana, out=np.full(n, np.nan), where=n_ventana > 0),
+        dias_primer_articulo=primer,
+    )
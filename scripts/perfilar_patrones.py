@@ -0,0 +1,93 @@
+"""
+perfilar_patrones.py
+Perfil de costo de cada patrón de los diccionarios (temas, regiones,
+cultivos, cifras) sobre los cuerpos normalizados por 03a.
+Reporta hits, tiempo, % del tiempo total, peores textos y riesgo de
+backtracking (revisión estática + prueba de escalado con entrada adversaria).
+Herramienta de ajuste de diccionarios; no forma parte del pipeline.
+"""
+
+import pyarrow.parquet as pq
+from pathlib import Path
+from itertools import islice
+
+from comun.artefactos import ruta
+from comun.diccionarios import temas, regiones, cultivos, cifras_patrones
+from comun.normalizar import plegar_patron, plegar_temas
+from comun.perfil_regex import perfilar, revisar_patrones, medir_escalado
+
+# ── Configuración ──────────────────────────────────────────────
+OUTPUT_DIR = Path("outputs/tables")
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+INPUT_FILE = ruta("cuerpos_normalizados")
+OUTPUT_FILE = OUTPUT_DIR / "perfil_patrones.csv"
+MAX_ARTICULOS = None   # None = todo el corpus
+TOP_PEORES = 3
+UMBRAL_ESCALADO = 3.0  # t(2n)/t(n) por encima de esto = crecimiento superlineal
+
+def patrones_diccionarios():
+    """[(grupo, patron)] plegados, tal como se usan sobre texto normalizado."""
+    patrones = []
+    for tema, ps in plegar_temas(temas).items():
+        patrones += [(f"tema:{tema}", p) for p in ps]
+    # Los cuerpos normalizados están en minúsculas: las regiones se perfilan
+    # plegadas (02 las aplica sin tildes pero con mayúsculas, sobre títulos)
+    patrones += [(f"region:{r}", plegar_patron(p)) for r, p in regiones.items()]
+    patrones += [(f"cultivo:{c}", plegar_patron(p)) for c, p in cultivos.items()]
+    for tipo, ps in cifras_patrones.items():
+        patrones += [(f"cifra:{tipo}", plegar_patron(p)) for p in ps]
+    return patrones
+
+def leer_textos(path):
+    for batch in pq.ParquetFile(path).iter_batches(columns=['url', 'texto_norm']):
+        for fila in batch.to_pylist():
+            yield fila['url'], fila['texto_norm']
+
+def main():
+    patrones = patrones_diccionarios()
+
+    print("=" * 70)
+    print(f"  PERFIL DE PATRONES — {len(patrones)} patrones")
+    print("=" * 70)
+
+    # ── Riesgo antes de correr ────────────────────────────────
+    print("\n── Revisión estática de backtracking ──")
+    hallazgos = revisar_patrones(patrones)
+    for grupo, patron, nivel, motivo in hallazgos:
+        print(f"  [{nivel:5s}] {grupo:30s} {patron!r}")
+    if not hallazgos:
+        print("  Sin patrones de riesgo.")
+
+    print("\n── Prueba de escalado (entrada adversaria) ──")
+    escalado = {}
+    for grupo, patron in patrones:
+        escalado[patron] = medir_escalado(patron)
+        if escalado[patron] > UMBRAL_ESCALADO:
+            print(f"  {grupo:30s} {patron!r}: t(2n)/t(n) = {escalado[patron]:.1f}")
+
+    # ── Perfil sobre el corpus ────────────────────────────────
+    print("\n── Perfil sobre el corpus ──")
+    textos = leer_textos(INPUT_FILE)
+    if MAX_ARTICULOS:
+        textos = islice(textos, MAX_ARTICULOS)
+    perfil = perfilar(patrones, textos, top=TOP_PEORES)
+    perfil["escalado"] = perfil["patron"].map(escalado)
+
+    print(f"\nTiempo total: {perfil['tiempo_s'].sum():.2f}s")
+    print("\nTop 15 patrones por tiempo:")
+    for _, row in perfil.head(15).iterrows():
+        print(f"  {row['pct_tiempo']:5.1f}%  {row['grupo']:28s} {row['patron'][:40]:40s} "
+              f"hits: {row['hits']:6,}  peor: {row['peor_ms']:.1f} ms")
+
+    sin_hits = perfil[perfil['hits'] == 0]
+    if len(sin_hits) > 0:
+        print(f"\nPatrones sin ningún hit ({len(sin_hits)}):")
+        for _, row in sin_hits.iterrows():
+            print(f"  {row['grupo']:28s} {row['patron']}")
+
+    perfil.to_csv(OUTPUT_FILE, index=False, encoding="utf-8-sig")
+    print(f"\nGuardado: {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
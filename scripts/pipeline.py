@@ -0,0 +1,96 @@
+"""
+pipeline.py
+Ejecuta el pipeline completo como grafo de etapas (ver comun/pipeline.py):
+solo corren las etapas cuyo código o entradas cambiaron desde la última
+ejecución, y las etapas independientes corren en paralelo.
+
+Uso (desde la raíz del repo):
+    python scripts/pipeline.py                       # lo que esté desactualizado
+    python scripts/pipeline.py --en-seco             # qué se ejecutaría
+    python scripts/pipeline.py extraer_entidades     # una etapa y sus ancestros
+    python scripts/pipeline.py --forzar normalizar_cuerpos
+    python scripts/pipeline.py --red                 # incluye cosecha y descarga de cuerpos
+    python scripts/pipeline.py --perfilar            # perfila cada etapa (comun/perfilado.py)
+
+Los scripts siguen pudiendo ejecutarse sueltos como antes.
+"""
+
+import argparse
+import os
+import sys
+
+from comun import perfilado
+from comun.pipeline import ejecutar, dependencias
+
+# ── Etapas ────────────────────────────────────────────────────
+# entradas/salidas: nombres de comun/artefactos.py
+# red: consulta servicios externos; solo corre con --red
+ETAPAS = [
+    {"nombre": "cosechar", "script": "01_cosechar_gdelt", "funcion": "cosechar",
+     "entradas": [], "salidas": ["corpus", "cosecha_supervivencia"], "red": True},
+    {"nombre": "cosechar_timeline", "script": "01_cosechar_gdelt", "funcion": "cosechar_timeline",
+     "entradas": [], "salidas": ["timeline_volumen"], "red": True},
+    {"nombre": "ingerir_gkg", "script": "01b_ingerir_gkg", "funcion": "main",
+     "entradas": ["gkg_espejo"], "salidas": ["corpus_gkg"]},
+    {"nombre": "detectar_temas", "script": "02_explorar_y_detectar_temas", "funcion": "main",
+     "entradas": ["corpus", "corpus_gkg", "timeline_volumen"],
+     "salidas": ["corpus_temas", "serie_mensual_temas", "serie_cobertura_temas"]},
+    {"nombre": "enriquecer_cuerpos", "script": "03_enriquecer_cuerpos", "funcion": "main",
+     "entradas": ["corpus_temas"], "salidas": ["cuerpos"], "red": True},
+    {"nombre": "normalizar_cuerpos", "script": "03a_normalizar_cuerpos", "funcion": "main",
+     "entradas": ["cuerpos"], "salidas": ["cuerpos_normalizados"]},
+    {"nombre": "clasificar_cuerpos", "script": "03b_clasificar_cuerpos", "funcion": "main",
+     "entradas": ["cuerpos_normalizados"], "salidas": ["cuerpos_temas"]},
+    {"nombre": "extraer_entidades", "script": "04_extraer_entidades", "funcion": "main",
+     "entradas": ["cuerpos_normalizados", "distritos"],
+     "salidas": ["entidades", "entidades_csv", "cifras_spans", "menciones", "entidades_catalogo",
+                 "menciones_superficies", "coocurrencia_mensual", "resumen_entidades",
+                 "entidades_db"]},
+    {"nombre": "cargar_datos_duros", "script": "05_cargar_datos_duros", "funcion": "main",
+     "entradas": ["desinventar", "emdat", "indeci"], "salidas": ["eventos_duros"]},
+    {"nombre": "cruce_analisis", "script": "06_cruce_analisis", "funcion": "main",
+     "entradas": ["corpus_temas", "eventos_duros"], "salidas": ["cobertura_eventos", "correlacion_rezagos"]},
+    {"nombre": "indexar_texto", "script": "buscar_texto", "funcion": "indexar",
+     "entradas": ["corpus_temas", "cuerpos"], "salidas": ["indice_texto"]},
+]
+
+
+def main():
+    nombres = [e["nombre"] for e in ETAPAS]
+    parser = argparse.ArgumentParser(description="Pipeline con caché por huella de contenido")
+    parser.add_argument("objetivos", nargs="*", metavar="ETAPA",
+                        help=f"etapas objetivo (con sus ancestros); por defecto todas: {', '.join(nombres)}")
+    parser.add_argument("--forzar", nargs="*", metavar="ETAPA",
+                        help="ejecutar aunque estén al día (sin nombres: todas)")
+    parser.add_argument("--en-seco", action="store_true", help="solo mostrar qué se ejecutaría")
+    parser.add_argument("--red", action="store_true", help="permitir etapas que consultan la red")
+    parser.add_argument("--paralelo", type=int, default=2, help="etapas simultáneas")
+    parser.add_argument("--lista", action="store_true", help="mostrar las etapas y sus dependencias")
+    args = parser.parse_args()
+    for nombre in args.objetivos + (args.forzar or []):
+        if nombre not in nombres:
+            parser.error(f"etapa desconocida: {nombre} (opciones: {', '.join(nombres)})")
+
+    if args.lista:
+        for nombre, deps in dependencias(ETAPAS).items():
+            print(f"  {nombre:22s} ← {', '.join(deps) or '—'}")
+        return
+
+    forzar = nombres if args.forzar == [] else (args.forzar or [])
+    if perfilado.ACTIVO:
+        os.environ["PERFILAR"] = "1"   # --perfilar se hereda en los procesos de cada etapa
+
+    print("=" * 70)
+    print("  PIPELINE" + ("  (en seco)" if args.en_seco else ""))
+    print("=" * 70)
+    resultados = ejecutar(ETAPAS, objetivos=args.objetivos or None, forzar=forzar,
+                          en_seco=args.en_seco, red=args.red, paralelo=args.paralelo)
+
+    fallidas = [n for n, (estado, _) in resultados.items() if estado in ("falló", "bloqueada")]
+    if fallidas:
+        print(f"\nSin completar: {', '.join(fallidas)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
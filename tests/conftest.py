@@ -0,0 +1,10 @@
+"""
+conftest.py
+Los scripts importan `comun` desde scripts/ (se corren desde la raíz del
+repo con scripts/ en sys.path); los tests hacen lo mismo.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
@@ -0,0 +1,52 @@
+"""Almacén de entidades: upsert por URL con huella de contenido y borrados por trozos."""
+
+from comun import almacen_entidades
+from comun.almacen_entidades import abrir, consultar, guardar_lote
+
+TIPOS_CIFRA = ["fallecidos", "damnificados"]
+
+
+def _registro(i, **cambios):
+    return {"url": f"u{i}", "url_id": i, "fecha": "2022-06-01", "domain": "medio.pe",
+            "title": f"Heladas {i}", "regiones": ["Puno"], "provincias": ["Azángaro (Puno)"],
+            "distritos": [], "cultivos": ["papa"], "temas": ["heladas_friaje"],
+            "fallecidos": None, "damnificados": 120, **cambios}
+
+
+def _span(i, valor=120):
+    return {"url": f"u{i}", "tipo": "damnificados", "valor": valor, "unidad": "personas",
+            "evidencia": f"{valor} damnificados", "inicio": 0, "fin": 10}
+
+
+def _filas(con, tabla, url):
+    return sorted(con.execute(
+        f"SELECT t.* FROM {tabla} t JOIN articulos a ON a.id = t.articulo_id WHERE a.url = ?", (url,)
+    ).fetchall())
+
+
+def test_upsert_por_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(almacen_entidades, "MAX_PARAMETROS", 2)   # fuerza varios trozos
+    con = abrir(tmp_path / "entidades.sqlite", TIPOS_CIFRA)
+    registros = [_registro(i) for i in range(5)]
+    spans = [_span(i) for i in range(5)]
+    assert guardar_lote(con, registros, spans, TIPOS_CIFRA) == (5, 0, 0)
+
+    # Sin cambios (url_id distinto no cuenta): nada se reescribe
+    antes = con.execute("SELECT count(*), max(rowid) FROM menciones").fetchone()
+    sin_cambio = [{**r, "url_id": r["url_id"] + 100} for r in registros]
+    assert guardar_lote(con, sin_cambio, spans, TIPOS_CIFRA) == (0, 0, 5)
+    assert con.execute("SELECT count(*), max(rowid) FROM menciones").fetchone() == antes
+
+    # Un artículo cambia de región y de cifra: se reemplazan, no se duplican
+    otros = _filas(con, "menciones", "u1")
+    registros[3] = _registro(3, regiones=["Cusco"], provincias=["Espinar (Cusco)"], damnificados=300)
+    spans[3] = _span(3, 300)
+    assert guardar_lote(con, registros, spans, TIPOS_CIFRA) == (0, 1, 4)
+    menciones = {(tipo, valor, region) for _, tipo, valor, region in _filas(con, "menciones", "u3")}
+    assert menciones == {("region", "Cusco", "Cusco"), ("provincia", "Espinar", "Cusco"),
+                         ("cultivo", "papa", None), ("tema", "heladas_friaje", None)}
+    assert [c[2] for c in _filas(con, "cifras", "u3")] == [300]
+    assert _filas(con, "menciones", "u1") == otros
+    assert con.execute("SELECT count(*) FROM menciones").fetchone()[0] == antes[0]
+    assert list(consultar(con, region="Puno")["url"]) == ["u0", "u1", "u2", "u4"]
+    assert list(consultar(con, region="Cusco", con_cifra="damnificados")["damnificados"]) == [300]
@@ -0,0 +1,50 @@
+"""Cifras de afectación: interpretación de números y spans con offsets."""
+
+import pytest
+
+from comun.cifras import compilar_cifras, extraer_cifras, valor_numerico
+from comun.diccionarios import cifras_patrones, cifras_unidades
+from comun.normalizar import normalizar
+
+
+@pytest.mark.parametrize("numero, mil, esperado", [
+    ("1.200", False, 1200),
+    ("1.200.000", False, 1_200_000),
+    ("1,5", False, 1.5),
+    ("12,50", False, 12.5),
+    ("1,5", True, 1500),
+    ("3", True, 3000),
+    ("2.500,", False, 2500),
+    (".,", False, None),
+])
+def test_valor_numerico(numero, mil, esperado):
+    assert valor_numerico(numero, mil) == esperado
+
+
+def test_extraer_cifras_con_mil_y_offsets():
+    regex, tipos = compilar_cifras(cifras_patrones)
+    original = "La helada  afectó 1,5 mil hectáreas de papa."
+    texto, seg_norm, seg_orig = normalizar(original)
+    spans = extraer_cifras(regex, tipos, cifras_unidades, texto, seg_norm, seg_orig)
+    assert len(spans) == 1
+    span = spans[0]
+    assert (span["tipo"], span["valor"], span["mil"], span["numero"]) == ("hectareas_afectadas", 1500, True, "1,5")
+    assert span["unidad"] == cifras_unidades["hectareas_afectadas"]
+    assert original[span["inicio"]:span["fin"]] == "afectó 1,5 mil hectáreas"
+    assert texto[span["inicio_norm"]:span["fin_norm"]] == span["evidencia"]
+
+
+def test_extraer_cifras_descarta_fuera_de_rango():
+    regex, tipos = compilar_cifras(cifras_patrones)
+    texto, _, _ = normalizar("dejo 0 muertos y 20.000.000 fallecidos")
+    assert extraer_cifras(regex, tipos, cifras_unidades, texto) == []
+
+
+def test_patrones_solapados_no_se_tapan():
+    regex, tipos = compilar_cifras(cifras_patrones)
+    texto, _, _ = normalizar("El huaico dejó 2 muertos y 10 fallecidos en Chosica.")
+    spans = extraer_cifras(regex, tipos, cifras_unidades, texto)
+    assert max(s["valor"] for s in spans if s["tipo"] == "fallecidos") == 10
+    # Cada número una vez por tipo, aunque lo hallen varios patrones
+    assert sorted((s["tipo"], s["valor"]) for s in spans) == [("fallecidos", 2), ("fallecidos", 10)]
+    assert [s["inicio_norm"] for s in spans] == sorted(s["inicio_norm"] for s in spans)
@@ -0,0 +1,47 @@
+"""Correlación cruzada por FFT: signo del rezago, normalización y series constantes."""
+
+import numpy as np
+
+from comun.correlacion import correlacion_cruzada, estandarizar, matriz_rezagos
+
+
+def _directa(x, y, k):
+    """r(k) = Σ x[t + k] · y[t] / (T - |k|) sobre los periodos que se solapan."""
+    t = len(x)
+    if k >= 0:
+        return np.dot(x[k:], y[:t - k]) / (t - k)
+    return np.dot(x[:t + k], y[-k:]) / (t + k)
+
+
+def test_igual_a_la_suma_directa():
+    rng = np.random.default_rng(1)
+    zx, _ = estandarizar(rng.normal(size=(3, 40)))
+    zy, _ = estandarizar(rng.normal(size=(2, 40)))
+    r = correlacion_cruzada(zx, zy, 5)
+    assert r.shape == (3, 2, 11)
+    for i in range(3):
+        for j in range(2):
+            for k in range(-5, 6):
+                assert np.isclose(r[i, j, k + 5], _directa(zx[i], zy[j], k))
+
+
+def test_rezago_positivo_si_x_va_detras():
+    rng = np.random.default_rng(2)
+    eventos = rng.normal(size=80)
+    cobertura = np.roll(eventos, 3)    # cobertura[t] = eventos[t - 3]
+    tabla = matriz_rezagos(cobertura[None, 3:], eventos[None, 3:], ["x"], ["y"],
+                           max_rezago=6, replicas=49)
+    fila = tabla.loc[tabla["r"].idxmax()]
+    assert fila["rezago"] == 3 and fila["n_periodos"] == 77 - 3
+    assert fila["r"] > 0.9 and fila["p_max"] <= 0.05
+    assert list(tabla["rezago"]) == list(range(-6, 7))
+
+
+def test_series_constantes_se_descartan():
+    rng = np.random.default_rng(3)
+    x = np.vstack([rng.normal(size=30), np.zeros(30)])
+    y = np.vstack([np.full(30, 2.0), rng.normal(size=30)])
+    tabla = matriz_rezagos(x, y, [("heladas", "Puno"), ("heladas", "Cusco")], ["sin_eventos", "emdat"],
+                           max_rezago=2, replicas=0)
+    assert set(tabla["x"]) == {("heladas", "Puno")} and set(tabla["y"]) == {"emdat"}
+    assert len(tabla) == 5 and tabla["p"].isna().all()
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from comun.datos_duros import _fecha, _numero, _ubigeo, normalizar_eventos
+from comun.diccionarios import regiones
+
+
+def test_fecha_iso_no_se_invierte():
+    df = pd.DataFrame({"fecha": ["2023-05-01", "2023-05-01 00:00:00", "2023-12-11"]})
+    assert _fecha(df).tolist() == [pd.Timestamp("2023-05-01")] * 2 + [pd.Timestamp("2023-12-11")]
+
+
+def test_fecha_dia_primero_en_formatos_con_barra():
+    df = pd.DataFrame({"fecha": ["15/03/2022", "01/02/2021", "05-06-2020"]})
+    assert _fecha(df).tolist() == [pd.Timestamp("2022-03-15"), pd.Timestamp("2021-02-01"),
+                                   pd.Timestamp("2020-06-05")]
+
+
+def test_fecha_mezclada_y_nulos():
+    df = pd.DataFrame({"fecha": ["2019-01-07", "07/01/2019", None, "sin fecha"]})
+    fechas = _fecha(df)
+    assert fechas[0] == fechas[1] == pd.Timestamp("2019-01-07")
+    assert fechas[2:].isna().all()
+
+
+def test_fecha_desde_anio_mes_dia():
+    df = pd.DataFrame({"anio": ["2018", "2018"], "mes": ["3", None]})
+    assert _fecha(df).tolist() == [pd.Timestamp("2018-03-01"), pd.Timestamp("2018-01-01")]
+
+
+def test_numero_separadores():
+    assert _numero(pd.Series(["1.234", "1,234", "10,5", "", "n/d"])).tolist()[:3] == [1234, 1234, 10.5]
+
+
+def test_ubigeo_recupera_cero_inicial():
+    assert _ubigeo(pd.Series(["10101", "150101", "1234"])).tolist()[:2] == ["010101", "150101"]
+
+
+def test_callao_se_cruza_con_lima():
+    indeci = pd.DataFrame({"fecha": ["2023-03-01"] * 3, "ubigeo": ["070101", None, "150101"],
+                           "departamento": [None, "CALLAO", "LIMA"], "amenaza": ["inundacion"] * 3})
+    emdat = pd.DataFrame({"iso": ["PER"] * 2, "anio": ["2023"] * 2, "lugar": ["Callao, Lima", "Callao"],
+                          "amenaza": ["Flood"] * 2})
+    assert normalizar_eventos(indeci, "indeci", "x.csv")["region"].to_pylist() == ["Lima"] * 3
+    regiones_emdat = normalizar_eventos(emdat.rename(columns={"iso": "filtro"}), "emdat", "x.csv")["region"]
+    assert regiones_emdat.to_pylist() == ["Lima", "Lima"]
+    assert set(regiones_emdat.to_pylist()) <= set(regiones)
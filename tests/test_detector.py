@@ -0,0 +1,26 @@
+"""Detector de una pasada: conteo por tema, tramos y presupuesto de tiempo."""
+
+from comun.detector import compilar_temas, contar_temas, clasificar, tramos
+
+PATRON = compilar_temas({"heladas": [r"\bhelad\w*"], "sequias": [r"\bsequia\w*"]})
+
+
+def test_cuenta_por_tema():
+    hits, truncado = contar_temas(PATRON, "heladas y sequia\notra helada")
+    assert hits == {"heladas": 2, "sequias": 1} and not truncado
+    assert clasificar(hits, umbral=2) == ["heladas"]
+
+
+def test_tramos_cortan_parrafos_largos_en_espacios():
+    texto = " ".join(["helada"] * 3000)
+    partes = list(tramos(texto, largo=100))
+    assert max(len(p) for p in partes) <= 100
+    assert "".join(partes) == texto
+    assert contar_temas(PATRON, texto)[0]["heladas"] == 3000
+
+
+def test_presupuesto_se_revisa_dentro_de_un_parrafo_largo():
+    texto = " ".join(["helada"] * 200_000)     # un solo párrafo, sin saltos de línea
+    hits, truncado = contar_temas(PATRON, texto, limite_s=0)
+    assert truncado
+    assert hits["heladas"] < 200_000
@@ -0,0 +1,44 @@
+"""Gazetteer como trie de tokens: nombres de varias palabras y límites de token."""
+
+from comun.gazetteer import buscar, construir_gazetteer
+from comun.normalizar import normalizar
+
+REGIONES = {
+    "Madre de Dios": ["Tambopata", "Manu"],
+    "Lima": ["Lima", "Cañete", "Ica"],
+    "San Martín": ["Moyobamba"],
+}
+DISTRITOS = [("San Martín de Porres", "Lima", "Lima"), ("Ate", "Lima", "Lima")]
+
+
+def _menciones(texto, trie):
+    texto, _, _ = normalizar(texto)
+    return [(entrada, texto[inicio:fin]) for entrada, inicio, fin in buscar(trie, texto)]
+
+
+def test_nombres_de_varias_palabras():
+    trie = construir_gazetteer(REGIONES)
+    assert _menciones("Huaico en Madre de Dios y Cañete", trie) == [
+        (("region", "Madre de Dios", "Madre de Dios"), "madre de dios"),
+        (("provincia", "Cañete", "Lima"), "canete"),
+    ]
+    assert _menciones("la madre de un niño", trie) == []
+
+
+def test_reporta_todos_los_nombres_del_camino():
+    trie = construir_gazetteer(REGIONES, DISTRITOS)
+    menciones = _menciones("Lluvias en San Martín de Porres", trie)
+    assert menciones == [
+        (("region", "San Martín", "San Martín"), "san martin"),
+        (("distrito", "San Martín de Porres", "Lima"), "san martin de porres"),
+    ]
+    # Región y provincia homónimas comparten nodo
+    assert {e for e, _ in _menciones("Lima", trie)} == {("region", "Lima", "Lima"), ("provincia", "Lima", "Lima")}
+
+
+def test_sin_matches_parciales_ni_nombres_cortos():
+    trie = construir_gazetteer(REGIONES, DISTRITOS)
+    assert _menciones("Limatambo y Tambopatas", trie) == []
+    # Ica y Ate quedan fuera por min_chars; Manu (4) entra
+    assert [e[1] for e, _ in _menciones("Ica, Ate y Manu", trie)] == ["Manu"]
+    assert [e[1] for e, _ in _menciones("Ica", construir_gazetteer(REGIONES, min_chars=3))] == ["Ica"]
@@ -0,0 +1,161 @@
+"""Cliente de GDELT: caché por parámetros, ventanas alineadas y ritmo compartido, sin red."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from comun import gdelt
+
+
+class Respuesta:
+    status_code = 200
+
+    def __init__(self, params):
+        self.params = params
+
+    def json(self):
+        dia = self.params["startdatetime"][:8]
+        if self.params["mode"] == "artlist":
+            return {"articles": [{"url": f"{dia}-{i}", "seendate": f"{dia}T120000Z"} for i in range(3)]}
+        return {"timeline": [{"data": [{"date": f"{dia}T000000Z", "value": 5, "norm": 200}]}]}
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    """gdelt con caché y ritmo en tmp_path, sin pausas y con una API falsa."""
+    monkeypatch.setattr(gdelt, "CACHE_PATH", tmp_path / "cache.sqlite")
+    monkeypatch.setattr(gdelt, "RITMO_PATH", tmp_path / "ritmo.sqlite")
+    monkeypatch.setattr(gdelt, "_local", threading.local())
+    monkeypatch.setattr(gdelt, "PAUSA", 0)
+    llamadas = []
+
+    def get(url, params, timeout):
+        llamadas.append(dict(params))
+        return Respuesta(params)
+
+    monkeypatch.setattr(gdelt.requests, "get", get)
+    return llamadas
+
+
+def test_clave_no_depende_del_orden():
+    assert gdelt.clave({"a": 1, "b": "x"}) == gdelt.clave({"b": "x", "a": 1})
+    assert gdelt.clave({"a": 1}) != gdelt.clave({"a": 2})
+
+
+def test_ttl_ventana_cerrada_y_abierta():
+    cerrada = gdelt.parametros("q", "artlist", datetime(2018, 1, 1), datetime(2018, 3, 31))
+    abierta = gdelt.parametros("q", "artlist", datetime(2018, 1, 1), gdelt.ahora())
+    assert gdelt.ttl(cerrada) == gdelt.TTL_CERRADA
+    assert gdelt.ttl(abierta) == gdelt.TTL_ABIERTA
+
+
+def test_ventana_abierta_una_fila_por_periodo(cliente, monkeypatch):
+    inicio = datetime(2026, 10, 1)
+    hora = gdelt.ahora()
+    gdelt.guardar_cache(gdelt.parametros("q", "artlist", inicio, hora), {"articles": [{"url": "a"}]})
+    # Una hora después la ventana termina en otra hora en punto: misma clave
+    monkeypatch.setattr(gdelt, "ahora", lambda: hora.replace(hour=0) + timedelta(days=1))
+    abierta = gdelt.parametros("q", "artlist", inicio, gdelt.ahora())
+    assert gdelt.leer_cache(abierta) == {"articles": [{"url": "a"}]}
+    gdelt.guardar_cache(abierta, {"articles": [{"url": "b"}]})
+    assert gdelt._conexion().execute("SELECT count(*) FROM respuestas").fetchone()[0] == 1
+    # Un fin anterior a ahora() es una ventana cerrada, con su propia clave
+    cerrada = gdelt.parametros("q", "artlist", inicio, hora - timedelta(days=1))
+    assert gdelt.clave(cerrada) != gdelt.clave(abierta)
+
+
+def test_guardar_borra_las_vencidas(cliente, monkeypatch):
+    params = gdelt.parametros("q", "artlist", datetime(2018, 1, 1), datetime(2018, 3, 31))
+    gdelt.guardar_cache(params, {"articles": []})
+    monkeypatch.setattr(gdelt.time, "time", lambda: 4e9)
+    gdelt.guardar_cache({**params, "query": "otra"}, {"articles": []})
+    assert gdelt._conexion().execute("SELECT count(*) FROM respuestas").fetchone()[0] == 1
+
+
+def test_leer_cache_recorta_artlist_mayor(cliente):
+    params = gdelt.parametros("q", "artlist", datetime(2018, 1, 1), datetime(2018, 3, 31),
+                              maxrecords=gdelt.MAX_RECORDS)
+    gdelt.guardar_cache(params, {"articles": [{"url": str(i)} for i in range(10)]})
+    menor = {**params, "maxrecords": 4}
+    assert [a["url"] for a in gdelt.leer_cache(menor)["articles"]] == ["0", "1", "2", "3"]
+    assert gdelt.leer_cache({**params, "query": "otra"}) is None
+
+
+def test_consultar_guarda_y_responde_desde_cache(cliente):
+    params = gdelt.parametros("q", "artlist", datetime(2018, 1, 1), datetime(2018, 3, 31), maxrecords=250)
+    primera = gdelt.consultar(params, log=lambda m: None)
+    assert gdelt.consultar(params, log=lambda m: None) == primera
+    assert len(cliente) == 1
+
+
+def test_trimestres_como_la_cosecha():
+    ventanas = gdelt.trimestres(datetime(2017, 1, 1), datetime(2017, 12, 31))
+    assert [n for n, _, _ in ventanas] == ["2017Q1", "2017Q2", "2017Q3", "2017Q4"]
+    assert ventanas[0][1:] == (datetime(2017, 1, 1), datetime(2017, 3, 31))
+    assert ventanas[3][2] == datetime(2017, 12, 31)
+    # Un rango dentro de dos trimestres pide solo esos dos; el último día cuenta
+    assert [n for n, _, _ in gdelt.trimestres(datetime(2018, 3, 31, 18), datetime(2018, 4, 2))] == ["2018Q1", "2018Q2"]
+    # Nada más allá de ahora()
+    assert gdelt.trimestres(datetime(2017, 1, 1), datetime(2100, 1, 1))[-1][2] <= gdelt.ahora()
+
+
+def test_articulos_alineados_comparten_clave_con_la_cosecha(cliente):
+    arts = gdelt.articulos_alineados("q", datetime(2018, 2, 1), datetime(2018, 5, 1), log=lambda m: None)
+    # Cada trimestre devuelve artículos de su primer día: solo entra el de 2018Q2
+    assert {a["seendate"][:8] for a in arts} == {"20180401"}
+    assert len(cliente) == 2
+    params_cosecha = gdelt.parametros("q", "artlist", datetime(2018, 1, 1), datetime(2018, 3, 31),
+                                      maxrecords=gdelt.MAX_RECORDS)
+    assert gdelt.leer_cache(params_cosecha) is not None
+
+
+def test_timeline_alineado_calcula_timelinevol(cliente):
+    puntos = gdelt.timeline_alineado("q", datetime(2018, 1, 1), datetime(2019, 6, 30), log=lambda m: None)
+    assert [p["value"] for p in puntos] == [2.5, 2.5]
+    assert {p["mode"] for p in cliente} == {gdelt.TIMELINE_RAW}
+    crudo = gdelt.timeline_alineado("q", datetime(2018, 1, 1), datetime(2018, 12, 31),
+                                    modo=gdelt.TIMELINE_RAW, log=lambda m: None)
+    assert crudo[0]["value"] == 5 and len(cliente) == 2
+
+
+# ── Ritmo compartido ──────────────────────────────────────────
+def _ritmo():
+    return gdelt._conexion_ritmo().execute("SELECT proximo, espera_429, racha_429 FROM ritmo").fetchone()
+
+
+def test_turnos_separados_por_pausa(cliente, monkeypatch):
+    monkeypatch.setattr(gdelt, "PAUSA", 0.05)
+    inicio = gdelt.time.time()
+    for _ in range(3):
+        gdelt._esperar_turno()
+    assert gdelt.time.time() - inicio >= 0.1
+    assert _ritmo()[0] >= inicio + 0.15
+
+
+def test_429_retrasa_a_todos_y_crece_con_la_racha(cliente, monkeypatch):
+    monkeypatch.setattr(gdelt, "RETRY_WAIT", 0.05)
+    assert gdelt._registrar_429() == pytest.approx(0.05, abs=0.02)
+    assert gdelt._registrar_429() == pytest.approx(0.10, abs=0.02)
+    espera_429 = _ritmo()[1]
+    gdelt._esperar_turno()
+    assert gdelt.time.time() >= espera_429
+    gdelt._registrar_exito()
+    assert _ritmo()[2] == 0
+
+
+def test_consultar_reintenta_tras_429(cliente, monkeypatch):
+    monkeypatch.setattr(gdelt, "RETRY_WAIT", 0.01)
+    respuestas = iter([429, 200])
+
+    class Limitada(Respuesta):
+        def __init__(self, params):
+            super().__init__(params)
+            self.status_code = next(respuestas)
+
+    monkeypatch.setattr(gdelt.requests, "get", lambda url, params, timeout: Limitada(params))
+    avisos = []
+    params = gdelt.parametros("q", "artlist", datetime(2018, 1, 1), datetime(2018, 3, 31), maxrecords=250)
+    assert len(gdelt.consultar(params, log=avisos.append)["articles"]) == 3
+    assert len(avisos) == 1 and "429" in avisos[0]
+    assert _ritmo()[2] == 0
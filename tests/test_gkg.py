@@ -0,0 +1,69 @@
+"""Ingesta GKG/mentions: filtros sobre los zips y origen del título."""
+
+import re
+import zipfile
+
+from comun import gkg
+
+PATRON = re.compile(r"huaico|inundacion")
+
+
+def _zip(path, filas):
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr(path.stem, "".join("\t".join(f) + "\n" for f in filas))
+    return path
+
+
+def _gkg(url, dominio, extras, lugares="1#Lima#PE#"):
+    campos = [""] * gkg.GKG_N_COLUMNAS
+    campos[gkg.GKG_FECHA] = "20230315101500"
+    campos[gkg.GKG_DOMINIO], campos[gkg.GKG_URL] = dominio, url
+    campos[gkg.GKG_LUGARES], campos[gkg.GKG_TRADUCCION] = lugares, "srclc:spa;eng:GT-SPA 1.0"
+    campos[gkg.GKG_EXTRAS] = extras
+    return campos
+
+
+def test_gkg_titulo_de_pagina_o_slug(tmp_path):
+    path = _zip(tmp_path / "20230315101500.gkg.csv", [
+        _gkg("https://rpp.pe/peru/huaico-en-chosica", "rpp.pe",
+             "<PAGE_TITLE>Huaico en Chosica deja damnificados</PAGE_TITLE>"),
+        _gkg("https://andina.pe/inundacion-en-piura", "andina.pe", ""),
+        _gkg("https://ejemplo.com/otra-cosa", "ejemplo.com", "", lugares="1#Quito#EC#"),
+    ])
+    filas = {f["url"]: f for f in gkg.filtrar_gkg(path, PATRON)}
+    assert len(filas) == 2
+    pagina = filas["https://rpp.pe/peru/huaico-en-chosica"]
+    assert (pagina["title"], pagina["title_origen"]) == ("Huaico en Chosica deja damnificados", gkg.ORIGEN_PAGINA)
+    slug = filas["https://andina.pe/inundacion-en-piura"]
+    assert (slug["title"], slug["title_origen"]) == ("inundacion en piura", gkg.ORIGEN_SLUG)
+    assert slug["language"] == "Spanish" and slug["sourcecountry"] == "Peru"
+    assert slug["_trimestre"] == "2023Q1"
+    assert {f["_plan"] for f in filas.values()} == {"pe"}
+
+
+def test_plan_equivalente_por_dominio(tmp_path):
+    path = _zip(tmp_path / "20230315101500.gkg.csv", [
+        _gkg("https://rpp.pe/huaico-en-chosica", "rpp.pe", ""),
+        _gkg("https://emol.cl/huaico-en-peru", "emol.cl", ""),
+        _gkg("https://medio.com/huaico-en-lima", "medio.com", ""),
+    ])
+    planes = {f["domain"]: f["_plan"] for f in gkg.filtrar_gkg(path, PATRON)}
+    assert planes == {"rpp.pe": "pe", "emol.cl": "es_ext", "medio.com": "es_ext"}
+    assert gkg.plan_equivalente("Peru", "English") == "todo"
+
+
+def test_menciones_usan_el_slug(tmp_path):
+    evento = [""] * 60
+    evento[gkg.EV_ID], evento[gkg.EV_PAISES[2]] = "42", "PE"
+    export = _zip(tmp_path / "20230315101500.export.CSV", [evento])
+    mencion = [""] * (gkg.MEN_TRADUCCION + 1)
+    mencion[gkg.MEN_EVENTO], mencion[gkg.MEN_FECHA], mencion[gkg.MEN_TIPO] = "42", "20230315101500", "1"
+    mencion[gkg.MEN_DOMINIO], mencion[gkg.MEN_URL] = "rpp.pe", "https://rpp.pe/huaico-en-cusco"
+    otra = list(mencion)
+    otra[gkg.MEN_EVENTO] = "7"
+    menciones = _zip(tmp_path / "20230315101500.mentions.CSV", [mencion, otra])
+
+    eventos = gkg.eventos_pais(export)
+    assert eventos == {b"42"}
+    filas = gkg.filtrar_menciones(menciones, eventos, PATRON)
+    assert [(f["title"], f["title_origen"]) for f in filas] == [("huaico en cusco", gkg.ORIGEN_SLUG)]
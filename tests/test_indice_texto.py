@@ -0,0 +1,58 @@
+"""Índice FTS: títulos sin tema, filtro sin_tema y carga incremental de cuerpos."""
+
+import json
+
+from comun.indice_texto import abrir, agregar_titulos, agregar_cuerpos, contar, hits_por_tema
+
+
+def _linea(url, cuerpo):
+    return json.dumps({"url": url, "fecha": "2023-05-01", "cuerpo": cuerpo}) + "\n"
+
+
+def test_titulos_sin_tema_se_indexan_y_filtran(tmp_path):
+    con = abrir(tmp_path / "indice.sqlite")
+    agregar_titulos(con, [
+        {"url": "a", "title": "Heladas en Puno", "temas": ["heladas"], "temas_bits": 1},
+        {"url": "b", "title": "Granizada y heladas", "temas": [], "temas_bits": 0},
+    ])
+    assert contar(con, "heladas") == 2
+    assert contar(con, "heladas", sin_tema=True) == 1
+    assert dict(hits_por_tema(con, "heladas")) == {"heladas": 1, "(sin tema)": 1}
+
+
+def test_titulos_ya_indexados_se_reclasifican(tmp_path):
+    con = abrir(tmp_path / "indice.sqlite")
+    filas = [
+        {"url": "a", "title": "Heladas en Puno", "temas": ["heladas"], "temas_bits": 1},
+        {"url": "b", "title": "Granizada en Cusco", "temas": [], "temas_bits": 0},
+    ]
+    agregar_titulos(con, filas)
+    assert agregar_titulos(con, filas) == 0
+    # 02 re-corrió con un diccionario que ahora clasifica la granizada
+    filas[1] = {**filas[1], "temas": ["heladas", "granizo"], "temas_bits": 3}
+    assert agregar_titulos(con, filas) == 1
+    assert contar(con, "granizada", sin_tema=True) == 0
+    assert dict(hits_por_tema(con, "granizada")) == {"heladas": 1, "granizo": 1}
+
+
+def test_cuerpos_incremental(tmp_path):
+    con = abrir(tmp_path / "indice.sqlite")
+    jsonl = tmp_path / "cuerpos.jsonl"
+    jsonl.write_text(_linea("a", "friaje en Cusco"))
+    assert agregar_cuerpos(con, jsonl) == 1
+    assert agregar_cuerpos(con, jsonl) == 0
+    with open(jsonl, "a") as f:
+        f.write(_linea("b", "huaico en Chosica") + '{"url": "c"')   # última línea a medio escribir
+    assert agregar_cuerpos(con, jsonl) == 1
+    assert contar(con, "huaico") == 1
+
+
+def test_cuerpos_regenerado_se_relee(tmp_path):
+    con = abrir(tmp_path / "indice.sqlite")
+    jsonl = tmp_path / "cuerpos.jsonl"
+    jsonl.write_text(_linea("a", "friaje en Cusco") + _linea("b", "huaico en Chosica"))
+    agregar_cuerpos(con, jsonl)
+    # Regenerado con otro contenido y más largo: el offset viejo no sirve
+    jsonl.write_text(_linea("c", "sequia en Piura") + _linea("d", "sismo en Ica") + _linea("e", "lluvias en Tumbes"))
+    assert agregar_cuerpos(con, jsonl) == 3
+    assert contar(con, "sequia") == 1
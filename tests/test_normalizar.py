@@ -0,0 +1,65 @@
+import re
+
+import pandas as pd
+import pytest
+
+from comun.deteccion import detectar
+from comun.diccionarios import regiones, temas
+from comun.normalizar import (a_original, normalizar, normalizar_serie, plegar, plegar_patron,
+                              plegar_temas, quitar_tildes_serie)
+
+
+def test_plegar_conserva_largo():
+    texto = "Heladas en PUNO: Ñuñoa y Áncash"
+    assert plegar(texto) == "heladas en puno: nunoa y ancash"
+    assert len(plegar(texto)) == len(texto)
+
+
+@pytest.mark.parametrize("texto", [
+    "  Heladas   en\tPuno ",
+    "Friaje\n\n  afecta   a  Cusco",
+    "sin espacios extra",
+    "",
+])
+def test_mapa_de_offsets_vuelve_al_original(texto):
+    norm, seg_norm, seg_orig = normalizar(texto)
+    for m in re.finditer(r"\S+", norm):
+        inicio = a_original(seg_norm, seg_orig, m.start())
+        assert plegar(texto[inicio:inicio + len(m.group())]) == m.group()
+
+
+def test_normalizar_conserva_parrafos():
+    assert normalizar("uno \n  dos   tres")[0] == "uno\ndos tres"
+
+
+def test_plegar_patron_simplifica_clases():
+    assert plegar_patron(r"\bJun[ií]n\b") == r"\bjunin\b"
+    assert plegar_patron(r"sequ[ií]a\s+\w+") == r"sequia\s+\w+"
+    assert plegar_patron(r"\b[AÁ]ncash\b", minusculas=False) == r"\bAncash\b"
+
+
+def test_quitar_tildes_conserva_mayusculas_y_enie():
+    assert quitar_tildes_serie(pd.Series(["Junín y el Puño", None])).tolist() == ["Junin y el Puño", ""]
+
+
+@pytest.mark.parametrize("backend", ["pandas", "arrow"])
+def test_regiones_distinguen_mayusculas(backend):
+    titulos = pd.Series([
+        "Defienden la libertad de prensa",     # no es La Libertad
+        "Puño en alto en Lima",                # Lima sí, Puno no
+        "Heladas en Puno y La Libertad",
+        "Un jugo de lima",                     # no es Lima
+    ])
+    nombres = list(regiones)
+    _, _, bits = detectar(
+        normalizar_serie(titulos), plegar_temas(temas),
+        {r: plegar_patron(p, minusculas=False) for r, p in regiones.items()},
+        backend=backend, titulos_regiones=quitar_tildes_serie(titulos))
+    encontradas = [[n for i, n in enumerate(nombres) if int(b) >> i & 1] for b in bits]
+    assert encontradas == [[], ["Lima"], ["Puno", "La Libertad"], []]
+
+
+def test_siglas_con_limite_de_palabra():
+    patron = "|".join(plegar_temas(temas)["emergencias_institucional"])
+    assert re.search(patron, normalizar_serie(pd.Series(["Alerta del INDECI"]))[0])
+    assert not re.search(patron, normalizar_serie(pd.Series(["Votante indeciso"]))[0])
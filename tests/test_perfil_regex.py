@@ -0,0 +1,65 @@
+"""Guarda de backtracking: revisión estática (re._parser) y prueba empírica."""
+
+import sys
+
+import pytest
+
+from comun import perfil_regex
+from comun.diccionarios import temas
+from comun.normalizar import plegar_temas
+from comun.perfil_regex import riesgo_backtracking, exigir_patrones_seguros
+
+PATRONES_TEMAS = [(f"tema:{t}", p) for t, ps in plegar_temas(temas).items() for p in ps]
+
+
+def niveles(patron):
+    return {nivel for nivel, _ in riesgo_backtracking(patron)}
+
+
+def test_revision_estatica_disponible_en_versiones_soportadas():
+    # README: Python 3.11+; re._parser existe desde 3.11
+    assert sys.version_info >= (3, 11)
+    assert perfil_regex.REVISION_ESTATICA
+
+
+def test_revision_estatica():
+    assert niveles(r"(a+)+$") == {"alto"}
+    assert niveles(r"sequia.*agricola") == {"medio"}
+    assert niveles(r"\bhelad\w*") == set()
+
+
+def test_diccionarios_pasan_la_guarda():
+    assert all(nivel != "alto" for *_, nivel, _ in perfil_regex.revisar_patrones(PATRONES_TEMAS))
+
+
+@pytest.fixture
+def sin_parser(monkeypatch):
+    monkeypatch.setattr(perfil_regex, "REVISION_ESTATICA", False)
+
+
+def test_prueba_empirica_sin_parser(sin_parser):
+    assert niveles(r"(a+)+$") == {"alto"}
+    assert niveles(r"(\w+\s?)+$") == {"alto"}
+    assert niveles(r"\bhelad\w*") == set()
+    avisos = []
+    with pytest.raises(ValueError):
+        exigir_patrones_seguros([("x", r"(a+)+$")], log=avisos.append)
+    assert "empírica" in avisos[0]
+
+
+def test_arbol_con_otra_forma_cae_a_la_prueba_empirica(monkeypatch):
+    def roto(patron):
+        raise AttributeError("re._parser cambió")
+    monkeypatch.setattr(perfil_regex, "_revision_estatica", roto)
+    assert niveles(r"(a+)+$") == {"alto"}
+    assert niveles(r"\bsequia\b") == set()
+
+
+def test_perfil_de_regiones_sobre_texto_normalizado():
+    from comun.normalizar import normalizar
+    from perfilar_patrones import patrones_diccionarios
+
+    regiones = [(g, p) for g, p in patrones_diccionarios() if g.startswith("region:")]
+    texto, _, _ = normalizar("Heladas en PUNO y Cusco; alerta en La Libertad")
+    hits = dict(zip(*perfil_regex.perfilar(regiones, [("a", texto)])[["grupo", "hits"]].to_numpy().T))
+    assert hits["region:Puno"] > 0 and hits["region:Cusco"] > 0 and hits["region:La Libertad"] > 0
@@ -0,0 +1,21 @@
+"""Series de cobertura: artículos que cuentan para la cobertura peruana y con título."""
+
+import pandas as pd
+
+from comun.series import cobertura_peruana, con_titulo
+
+
+def test_cobertura_peruana_excluye_es_ext():
+    df = pd.DataFrame({"_plan": pd.Categorical(["pe", "es_ext", "medios", "todo", None])})
+    assert cobertura_peruana(df).tolist() == [True, False, True, True, True]
+
+
+def test_cobertura_peruana_sin_plan_cuenta_todo():
+    df = pd.DataFrame({"url": ["a", "b"]})
+    assert cobertura_peruana(df).all()
+
+
+def test_con_titulo_excluye_slugs():
+    df = pd.DataFrame({"title_origen": pd.Categorical(["pagina", "slug", None])})
+    assert con_titulo(df).tolist() == [True, False, True]
+    assert con_titulo(pd.DataFrame({"url": ["a"]})).all()
@@ -0,0 +1,17 @@
+"""Datasets particionados de data/staging: reescritura completa."""
+
+import pandas as pd
+
+from comun import staging
+
+
+def test_reescritura_borra_particiones_que_desaparecen(tmp_path, monkeypatch):
+    monkeypatch.setattr(staging, "STAGING_DIR", tmp_path)
+    viejo = pd.DataFrame({"url": ["a", "b", "c"], "language": ["Spanish", "English", "Spanish"],
+                          "fecha": pd.to_datetime(["2022-03-01", "2022-04-01", "2023-05-01"])})
+    staging.escribir_particionado(viejo, "corpus")
+    nuevo = viejo.iloc[[2]].assign(url="c2")
+    staging.escribir_particionado(nuevo, "corpus")
+    leido = staging.leer_staging("corpus", columnas=["url", "language", "year"])
+    assert leido["url"].tolist() == ["c2"]
+    assert staging.contar_filas("corpus", staging.filtro_idioma("English")) == 0
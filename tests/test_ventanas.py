@@ -0,0 +1,80 @@
+"""Cruce evento × artículos con searchsorted, contra un recorrido directo."""
+
+import numpy as np
+import pandas as pd
+
+from comun.ventanas import bordes, cobertura_eventos
+
+REGIONES = ["Puno", "Junín", "Cusco"]
+TEMAS = ["heladas", "sequias"]
+
+
+def test_bordes_incluyen_extremos():
+    f = np.array([0, 3, 5, 5, 10, 12, 20])
+    lo, a, b, hi = bordes(f, np.array([5]), np.array([10]), 2, 10)
+    assert (lo[0], a[0], b[0], hi[0]) == (1, 2, 5, 7)
+
+
+def _directo(evento, articulos, antes, despues):
+    """Una pasada por artículo: la definición que searchsorted debe reproducir."""
+    inicio = pd.Timestamp(evento["inicio"])
+    fin = max(pd.Timestamp(evento["fin"]) if pd.notna(evento["fin"]) else inicio, inicio)
+    desde, hasta = inicio - pd.Timedelta(days=antes), fin + pd.Timedelta(days=despues)
+    n = {"n_antes": 0, "n_durante": 0, "n_despues": 0, "n_ventana": 0}
+    primer = np.nan
+    for fecha, rb, tb in articulos[["fecha", "regiones_bits", "temas_bits"]].itertuples(index=False):
+        if pd.isna(fecha) or not desde <= fecha <= hasta:
+            continue
+        n["n_ventana"] += 1
+        region, tema = evento["region"], evento["tema"]
+        if pd.notna(region) and (region not in REGIONES or not rb >> REGIONES.index(region) & 1):
+            continue
+        if pd.notna(tema) and (tema not in TEMAS or not tb >> TEMAS.index(tema) & 1):
+            continue
+        if fecha < inicio:
+            n["n_antes"] += 1
+        else:
+            n["n_durante" if fecha <= fin else "n_despues"] += 1
+            dias = (fecha - inicio).days
+            primer = dias if np.isnan(primer) else min(primer, dias)
+    return n, primer
+
+
+def test_cobertura_igual_al_recorrido_directo():
+    rng = np.random.default_rng(7)
+    fechas = pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 365, 400), unit="D")
+    articulos = pd.DataFrame({
+        "fecha": pd.Series(fechas).mask(rng.random(400) < 0.05),
+        "regiones_bits": rng.integers(0, 8, 400).astype(np.uint8),
+        "temas_bits": rng.integers(0, 4, 400).astype(np.uint8),
+    })
+    inicios = pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 365, 30), unit="D")
+    eventos = pd.DataFrame({
+        "inicio": inicios,
+        "fin": pd.Series(inicios + pd.to_timedelta(rng.integers(-2, 20, 30), unit="D")).mask(rng.random(30) < 0.2),
+        "region": rng.choice(np.array(REGIONES + [None, "Atlántida"], dtype=object), 30),
+        "tema": rng.choice(np.array(TEMAS + [None], dtype=object), 30),
+    })
+
+    res = cobertura_eventos(eventos, articulos, REGIONES, TEMAS, antes=7, despues=30)
+    for i, evento in eventos.iterrows():
+        n, primer = _directo(evento, articulos, 7, 30)
+        fila = res.loc[i]
+        assert {k: fila[k] for k in n} == n, evento.to_dict()
+        assert fila["n_articulos"] == n["n_antes"] + n["n_durante"] + n["n_despues"]
+        assert (np.isnan(primer) and np.isnan(fila["dias_primer_articulo"])) or fila["dias_primer_articulo"] == primer
+    assert (res.loc[eventos["region"] == "Atlántida", "n_articulos"] == 0).all()
+
+
+def test_nombres_plegados_y_cuota():
+    articulos = pd.DataFrame({
+        "fecha": pd.to_datetime(["2022-06-01", "2022-06-03", "2022-06-20"]),
+        "regiones_bits": np.array([0b010, 0b001, 0b010], dtype=np.uint8),
+        "temas_bits": np.array([0b01, 0b01, 0b00], dtype=np.uint8),
+    })
+    eventos = pd.DataFrame({"inicio": pd.to_datetime(["2022-06-02"]), "fin": [pd.NaT],
+                            "region": ["JUNIN"], "tema": ["Heladas"]})
+    fila = cobertura_eventos(eventos, articulos, REGIONES, TEMAS).iloc[0]
+    assert (fila["n_antes"], fila["n_durante"], fila["n_despues"], fila["n_ventana"]) == (1, 0, 0, 3)
+    assert fila["cuota"] == 1 / 3
+    assert np.isnan(fila["dias_primer_articulo"])